@@ -0,0 +1,432 @@
+"""
+Shared launcher for the agent A2A servers.
+Every agent uses the same bootstrap (env check, AgentCard, A2AServer), so the
+per-agent details live in one table and each __main__.py only names its entry.
+Agent packages are imported only when the agent is actually started.
+
+  python _launcher.py run --agent outreach
+  python _launcher.py run-all --agents apply,compliance
+"""
+
+import asyncio
+import importlib
+import logging
+import os
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+import click
+
+try:
+  import uvloop
+except ImportError:
+  uvloop = None
+
+from common.server import A2AServer
+from common.types import AgentCard, AgentCapabilities, AgentSkill, MissingAPIKeyError
+from common.utils.agent_card_cache import get_card
+from common.utils.env import ensure_env_loaded
+
+logging.basicConfig(level=logging.INFO)
+# Records don't use thread/process fields, so skip collecting them per record
+logging.logThreads = False
+logging.logProcesses = False
+logging.logMultiprocessing = False
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class AgentSpec:
+  package: str
+  agent_class: str
+  port: int
+  name: str
+  description: str
+  skill: Dict[str, Any]
+
+
+AGENTS: Dict[str, AgentSpec] = {
+  "orchestrator": AgentSpec(
+    package="orchestrator",
+    agent_class="OrchestratorAgent",
+    port=11001,
+    name="Orchestrator Agent",
+    description="Top-level planner for the career copilot.",
+    skill=dict(
+      id="plan_day",
+      name="Plan Day",
+      description="Creates a daily plan for job search and orchestrates downstream agents.",
+      tags=["planning", "orchestration"],
+      examples=["Plan my job search today"],
+    ),
+  ),
+  "job_ingestor": AgentSpec(
+    package="job_ingestor",
+    agent_class="JobIngestorAgent",
+    port=11002,
+    name="Job Ingestor Agent",
+    description="Normalizes job postings.",
+    skill=dict(
+      id="ingest_jobs",
+      name="Ingest Jobs",
+      description="Normalizes job postings from various sources (URLs/text).",
+      tags=["ingest", "jobs"],
+      examples=["Ingest jobs from these URLs: ..."],
+    ),
+  ),
+  "matcher": AgentSpec(
+    package="matcher",
+    agent_class="MatcherAgent",
+    port=11003,
+    name="Matcher Agent",
+    description="Ranks jobs and emits rationales.",
+    skill=dict(
+      id="rank_jobs",
+      name="Rank Jobs",
+      description="Ranks normalized jobs against a profile with rationale.",
+      tags=["match", "rank"],
+      examples=["Rank these jobs for this profile graph"],
+    ),
+  ),
+  "onboarding": AgentSpec(
+    package="onboarding",
+    agent_class="OnboardingAgent",
+    port=11005,
+    name="Onboarding Agent",
+    description="Parses resumes/LinkedIn profile text and emits a Profile Graph.",
+    skill=dict(
+      id="build_profile_graph",
+      name="Build Profile Graph",
+      description="Parses resume/profile to build a Profile Graph JSON.",
+      tags=["onboarding", "profile"],
+      examples=["Parse this resume and build my profile graph"],
+    ),
+  ),
+  "profile_graph": AgentSpec(
+    package="profile_graph",
+    agent_class="ProfileGraphAgent",
+    port=11006,
+    name="Profile Graph Agent",
+    description="Canonical profile graph management and retrieval.",
+    skill=dict(
+      id="profile_graph",
+      name="Profile Graph",
+      description="Maintains canonical profile graph and serves retrieval.",
+      tags=["profile", "graph"],
+      examples=["Upsert this graph", "Get profile graph"],
+    ),
+  ),
+  "apply": AgentSpec(
+    package="apply",
+    agent_class="ApplyAgent",
+    port=11009,
+    name="Apply Agent",
+    description="Guided apply and packets.",
+    skill=dict(
+      id="apply",
+      name="Apply",
+      description="Generates application packet and checklist.",
+      tags=["apply", "checklist"],
+      examples=["Apply to this job with tailored docs"],
+    ),
+  ),
+  "referral": AgentSpec(
+    package="referral",
+    agent_class="ReferralAgent",
+    port=11010,
+    name="Referral Planner Agent",
+    description="Targets insiders and drafts outreach.",
+    skill=dict(
+      id="plan_referrals",
+      name="Plan Referrals",
+      description="Finds insiders and drafts outreach variants.",
+      tags=["referral", "planner"],
+      examples=["Find alumni at X and draft messages"],
+    ),
+  ),
+  "outreach": AgentSpec(
+    package="outreach",
+    agent_class="OutreachAgent",
+    port=11011,
+    name="Outreach Agent",
+    description="Sends and tracks outreach messages.",
+    skill=dict(
+      id="send_outreach",
+      name="Send Outreach",
+      description="Sends outreach messages and records outcomes.",
+      tags=["outreach", "comms"],
+      examples=["Send these messages to insiders"],
+    ),
+  ),
+  "compliance": AgentSpec(
+    package="compliance",
+    agent_class="ComplianceAgent",
+    port=11012,
+    name="Compliance & Safety Agent",
+    description="Checks artifacts and emits signed compliance results.",
+    skill=dict(
+      id="compliance_safety",
+      name="Compliance & Safety",
+      description="Performs ToS, PII redaction, and content safety; emits compliance artifact.",
+      tags=["compliance", "safety"],
+      examples=["Check this apply packet for ToS and PII"],
+    ),
+  ),
+  "interview": AgentSpec(
+    package="interview",
+    agent_class="InterviewAgent",
+    port=11013,
+    name="Interview Coach Agent",
+    description="Mock interviews with rubric scoring.",
+    skill=dict(
+      id="interview_coach",
+      name="Interview Coach",
+      description="Conducts mock interviews and emits scored reports.",
+      tags=["interview", "coach"],
+      examples=["Start mock for Amazon SDE2"],
+    ),
+  ),
+  "negotiation": AgentSpec(
+    package="negotiation",
+    agent_class="NegotiationAgent",
+    port=11014,
+    name="Negotiation Coach Agent",
+    description="Offer comparison and counter strategies.",
+    skill=dict(
+      id="negotiation_coach",
+      name="Negotiation Coach",
+      description="Compares offers and generates counter strategies.",
+      tags=["negotiation", "coach"],
+      examples=["Compare these offers and suggest counters"],
+    ),
+  ),
+  "prompt_library": AgentSpec(
+    package="prompt_library",
+    agent_class="PromptLibraryAgent",
+    port=11015,
+    name="Prompt Library Agent",
+    description="Centralized prompt management with versioning and AB testing.",
+    skill=dict(
+      id="prompt_management",
+      name="Prompt Management",
+      description="Centralized prompt versioning and AB testing.",
+      tags=["prompt", "library"],
+      examples=["Create new prompt version", "Get AB test prompts"],
+    ),
+  ),
+  "voice": AgentSpec(
+    package="voice",
+    agent_class="VoiceAgent",
+    port=11016,
+    name="Voice Agent",
+    description="Real-time voice interactions with STT/TTS.",
+    skill=dict(
+      id="voice_interaction",
+      name="Voice Interaction",
+      description="Real-time voice using Twilio Media Streams and Azure STT/TTS.",
+      tags=["voice", "realtime"],
+      examples=["Start voice session", "Process audio input"],
+    ),
+  ),
+  "partner_apis": AgentSpec(
+    package="partner_apis",
+    agent_class="PartnerAPIAgent",
+    port=11017,
+    name="Partner APIs Agent",
+    description="Integration with external job platforms and APIs.",
+    skill=dict(
+      id="partner_integration",
+      name="Partner Integration",
+      description="Integrates with LinkedIn, Indeed, and other job platforms.",
+      tags=["partner", "api"],
+      examples=["Search LinkedIn jobs", "Check Indeed status"],
+    ),
+  ),
+  "multilingual": AgentSpec(
+    package="multilingual",
+    agent_class="MultilingualAgent",
+    port=11018,
+    name="Multilingual Agent",
+    description="Handles translation and localization for global users.",
+    skill=dict(
+      id="multilingual_support",
+      name="Multilingual Support",
+      description="Translation, localization, and multilingual support.",
+      tags=["multilingual", "translation"],
+      examples=["Translate to Spanish", "Localize for German market"],
+    ),
+  ),
+}
+
+
+def load_agent_classes(spec: AgentSpec) -> tuple[type, type]:
+  """Import an agent's class and its AgentTaskManager"""
+  agent_module = importlib.import_module(f"{spec.package}.agent")
+  task_manager_module = importlib.import_module(f"{spec.package}.task_manager")
+  return getattr(agent_module, spec.agent_class), task_manager_module.AgentTaskManager
+
+
+def build_server(
+  agent_cls: type,
+  task_manager_cls: type,
+  host: str,
+  port: int,
+  skill: Dict[str, Any],
+  name: str,
+  description: str,
+) -> A2AServer:
+  version = "1.0.0"
+  url = f"http://{host}:{port}/"
+  agent_card = get_card(
+    name,
+    lambda: AgentCard(
+      name=name,
+      description=description,
+      url=url,
+      version=version,
+      defaultInputModes=agent_cls.SUPPORTED_CONTENT_TYPES,
+      defaultOutputModes=agent_cls.SUPPORTED_CONTENT_TYPES,
+      capabilities=AgentCapabilities(streaming=True),
+      skills=[AgentSkill(**skill)],
+    ),
+    fingerprint=repr((version, url, description, agent_cls.SUPPORTED_CONTENT_TYPES, sorted(skill.items()))),
+  )
+  agent = agent_cls()
+  return A2AServer(
+    agent_card=agent_card,
+    task_manager=task_manager_cls(agent=agent),
+    host=host,
+    port=port,
+    startup_hooks=[agent.warmup] if hasattr(agent, "warmup") else None,
+  )
+
+
+def install_uvloop():
+  """Make uvloop the default event loop for every loop this process creates"""
+  if uvloop is not None:
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+
+
+def _require_api_key():
+  if not os.getenv("GOOGLE_API_KEY"):
+    raise MissingAPIKeyError("GOOGLE_API_KEY environment variable not set.")
+
+
+def _command(
+  default_port: int,
+  load_classes: Callable[[], tuple[type, type]],
+  skill: Dict[str, Any],
+  name: str,
+  description: str,
+) -> click.Command:
+  @click.command()
+  @click.option("--host", default="localhost")
+  @click.option("--port", default=default_port)
+  @click.option("--workers", default=1, help="Worker processes sharing the port via SO_REUSEPORT.")
+  @click.option("--pin-cpus", is_flag=True, help="Pin each worker to its own CPU.")
+  def command(host, port, workers, pin_cpus):
+    _serve(load_classes, host, port, workers, pin_cpus, skill, name, description)
+
+  return command
+
+
+def _serve(
+  load_classes: Callable[[], tuple[type, type]],
+  host: str,
+  port: int,
+  workers: int,
+  pin_cpus: bool,
+  skill: Dict[str, Any],
+  name: str,
+  description: str,
+):
+  ensure_env_loaded()
+  install_uvloop()
+  try:
+    _require_api_key()
+    agent_cls, task_manager_cls = load_classes()
+    server = build_server(agent_cls, task_manager_cls, host, port, skill, name, description)
+    server.start(workers=workers, pin_cpus=pin_cpus)
+  except MissingAPIKeyError as e:
+    logger.error(f"Error: {e}")
+    exit(1)
+  except Exception as e:
+    logger.error(f"An error occurred during server startup: {e}")
+    exit(1)
+
+
+def main(agent_name: Optional[str] = None):
+  """Run the agent registered in AGENTS under agent_name, or the one picked with --agent"""
+  if agent_name is None:
+    run()
+    return
+  spec = AGENTS[agent_name]
+  _command(spec.port, lambda: load_agent_classes(spec), spec.skill, spec.name, spec.description)()
+
+
+@click.command()
+@click.option("--agent", "agent_name", required=True, type=click.Choice(list(AGENTS)))
+@click.option("--host", default="localhost")
+@click.option("--port", type=int, default=None, help="Defaults to the agent's registered port.")
+@click.option("--workers", default=1, help="Worker processes sharing the port via SO_REUSEPORT.")
+@click.option("--pin-cpus", is_flag=True, help="Pin each worker to its own CPU.")
+def run(agent_name, host, port, workers, pin_cpus):
+  """Run one agent picked by name; only that agent's package is imported"""
+  spec = AGENTS[agent_name]
+  _serve(
+    lambda: load_agent_classes(spec),
+    host,
+    port or spec.port,
+    workers,
+    pin_cpus,
+    spec.skill,
+    spec.name,
+    spec.description,
+  )
+
+
+async def serve_all(host: str, agent_names: List[str]):
+  """Serve several agents, each on its own port, from one event loop"""
+  servers = []
+  for agent_name in agent_names:
+    spec = AGENTS[agent_name]
+    agent_cls, task_manager_cls = load_agent_classes(spec)
+    servers.append(
+      build_server(agent_cls, task_manager_cls, host, spec.port, spec.skill, spec.name, spec.description)
+    )
+  await asyncio.gather(*(server.serve() for server in servers))
+
+
+@click.command()
+@click.option("--host", default="localhost")
+@click.option("--agents", "agent_names", default=",".join(AGENTS), help="Comma-separated agent names to co-host.")
+def run_all(host, agent_names):
+  """Run several agents in a single process instead of one interpreter each"""
+  ensure_env_loaded()
+  try:
+    _require_api_key()
+    names = [n.strip() for n in agent_names.split(",") if n.strip()]
+    unknown = [n for n in names if n not in AGENTS]
+    if unknown:
+      raise ValueError(f"Unknown agents: {', '.join(unknown)}")
+    run = uvloop.run if uvloop is not None else asyncio.run
+    run(serve_all(host, names))
+  except MissingAPIKeyError as e:
+    logger.error(f"Error: {e}")
+    exit(1)
+  except Exception as e:
+    logger.error(f"An error occurred during server startup: {e}")
+    exit(1)
+
+
+@click.group()
+def cli():
+  """Agent server launcher"""
+
+
+cli.add_command(run)
+cli.add_command(run_all, name="run-all")
+
+
+if __name__ == "__main__":
+  cli()
@@ -1,29 +1,300 @@
-from typing import Any, AsyncIterable, Dict
-from google.adk.agents.llm_agent import LlmAgent
-from google.adk.runners import Runner
-from google.adk.sessions import InMemorySessionService
-from google.adk.memory.in_memory_memory_service import InMemoryMemoryService
-from google.adk.artifacts import InMemoryArtifactService
-from google.genai import types
-import json
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, AsyncIterable, Awaitable, Callable, Dict
+from common.utils.response_cache import BaseCache, create_response_cache, make_cache_key
+from common.utils import serialization
+import asyncio
+import functools
+import logging
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+# Google ADK / genai are imported where they are used so CLI startup and port binding
+# do not pay for them; after the first call they are plain sys.modules lookups.
+if TYPE_CHECKING:
+  from google.adk.agents.llm_agent import LlmAgent
+  from google.adk.agents.run_config import RunConfig
+  from google.adk.runners import Runner
+  from google.adk.sessions import Session
+
+logger = logging.getLogger(__name__)
+
+MODEL_NAME = "gemini-2.0-flash-001"
+MAX_BATCH = 8
+BATCH_TIMEOUT_MS = 25
+# Batches in flight at once per model; further requests queue and coalesce
+MAX_CONCURRENT_BATCHES = 8
+# Resolved ADK sessions memoized per agent. Entries expire well before the session
+# store's own TTL, so a memo never outlives the session it points at.
+SESSION_MEMO_SIZE = 1024
+SESSION_MEMO_TTL = 300
+
+EMPTY_VERDICT = "{}"
+
+def _is_json(text: str) -> bool:
+  """Cheap validity check for a model response that should be a JSON object or array"""
+  stripped = text.strip()
+  if not stripped.startswith(("{", "[")):
+    return False
+  try:
+    serialization.loads(stripped)
+  except serialization.JSONDecodeError:
+    return False
+  return True
+
+def _event_text(event, separator: str = "\n") -> str:
+  """Join an ADK event's text parts, walking the content/parts chain once"""
+  content = event.content
+  parts = content.parts if content else None
+  if not parts:
+    return ""
+  return separator.join([p.text for p in parts if p.text])
+
+_stream_run_config: RunConfig | None = None
+
+def _get_stream_run_config() -> RunConfig:
+  """Ask ADK for partial events so stream() can forward Gemini's output as it is generated"""
+  global _stream_run_config
+  if _stream_run_config is None:
+    from google.adk.agents.run_config import RunConfig, StreamingMode
+    _stream_run_config = RunConfig(streaming_mode=StreamingMode.SSE)
+  return _stream_run_config
+
+BATCH_INSTRUCTION = (
+  "Batch mode: the input is a JSON array of {index, session_id, input} items, each input being a "
+  "separate compliance request. Return ONLY a JSON array with one {index, session_id, output} item "
+  "per input, where output is the JSON verdict for that input."
+)
+
+# Verdicts are keyed by (model, query) so identical {artifact, context} payloads skip Gemini.
+# Built on first use so settings loaded from .env in main() are honoured. Construction may
+# connect to Redis, so it runs on a worker thread; a concurrent first caller keeps the winner.
+_response_cache: BaseCache | None = None
+
+async def _get_response_cache() -> BaseCache:
+  global _response_cache
+  if _response_cache is None:
+    cache = await asyncio.to_thread(
+      create_response_cache,
+      os.getenv("COMPLIANCE_CACHE_URL"),
+      namespace="compliance",
+      ttl=int(os.getenv("COMPLIANCE_CACHE_TTL", "3600")),
+    )
+    if _response_cache is None:
+      _response_cache = cache
+  return _response_cache
+
+class BatchingComplianceRunner:
+  """Coalesces concurrent compliance checks into a single Gemini call.
+
+  Requests arriving within BATCH_TIMEOUT_MS of each other (up to MAX_BATCH) are sent as one
+  multi-artifact prompt and the returned JSON array is demuxed back onto each caller.
+  Up to MAX_CONCURRENT_BATCHES batches run at once. When none is in flight a request
+  is sent straight away rather than waiting out the batching window.
+  """
+
+  def __init__(self, runner: Runner, user_id: str, get_session: Callable[[str], Awaitable[Session]]):
+    self._runner = runner
+    self._user_id = user_id
+    self._get_session = get_session
+    self._queue: asyncio.Queue | None = None
+    self._worker: asyncio.Task | None = None
+    self._loop: asyncio.AbstractEventLoop | None = None
+    self._slots: asyncio.Semaphore | None = None
+    # Strong references so running batches are not garbage collected
+    self._inflight: set[asyncio.Task] = set()
+
+  async def submit(self, query: str, session_id: str) -> str:
+    loop = asyncio.get_running_loop()
+    if self._loop is not loop or self._worker is None or self._worker.done():
+      self._loop = loop
+      self._queue = asyncio.Queue()
+      self._slots = asyncio.Semaphore(MAX_CONCURRENT_BATCHES)
+      self._inflight = set()
+      self._worker = loop.create_task(self._drain())
+    future = loop.create_future()
+    await self._queue.put((query, session_id, future))
+    return await future
+
+  async def _drain(self):
+    loop = asyncio.get_running_loop()
+    # Bound to this worker's loop; submit() replaces them along with the worker
+    queue, slots, inflight = self._queue, self._slots, self._inflight
+
+    def batch_done(task: asyncio.Task):
+      inflight.discard(task)
+      slots.release()
+
+    while True:
+      batch = [await queue.get()]
+      while len(batch) < MAX_BATCH and not queue.empty():
+        batch.append(queue.get_nowait())
+      # Only hold a request back to coalesce while other batches are busy
+      if inflight:
+        deadline = loop.time() + BATCH_TIMEOUT_MS / 1000
+        while len(batch) < MAX_BATCH:
+          timeout = deadline - loop.time()
+          if timeout <= 0:
+            break
+          try:
+            batch.append(await asyncio.wait_for(queue.get(), timeout))
+          except asyncio.TimeoutError:
+            break
+      await slots.acquire()
+      task = loop.create_task(self._run_batch(batch))
+      inflight.add(task)
+      task.add_done_callback(batch_done)
+
+  async def _run_batch(self, batch: list[tuple[str, str, asyncio.Future]]):
+    try:
+      if len(batch) == 1:
+        query, session_id, _ = batch[0]
+        outputs = [await self._run_single(query, session_id)]
+      else:
+        payload = serialization.dumps([
+          {"index": i, "session_id": session_id, "input": query}
+          for i, (query, session_id, _) in enumerate(batch)
+        ])
+        # Session services may do blocking (Redis) I/O, so keep them off the event loop
+        session_service = self._runner.session_service
+        batch_session = await asyncio.to_thread(
+          session_service.create_session,
+          app_name=self._runner.app_name, user_id=self._user_id, state={}, session_id=f"batch-{uuid.uuid4().hex}",
+        )
+        try:
+          text = await self._run(f"{BATCH_INSTRUCTION}\n{payload}", batch_session.id)
+        finally:
+          await asyncio.to_thread(
+            session_service.delete_session,
+            app_name=self._runner.app_name, user_id=self._user_id, session_id=batch_session.id,
+          )
+        outputs = self._split(text, len(batch))
+        missed = [i for i, output in enumerate(outputs) if output is None]
+        if missed:
+          retried = await asyncio.gather(*(self._run_single(*batch[i][:2]) for i in missed))
+          for i, output in zip(missed, retried):
+            outputs[i] = output
+    except Exception as e:
+      logger.error(f"Compliance batch failed: {e}")
+      for _, _, future in batch:
+        if not future.done():
+          future.set_exception(e)
+      return
+    for (_, _, future), output in zip(batch, outputs):
+      if not future.done():
+        future.set_result(output)
+
+  async def _run_single(self, query: str, session_id: str) -> str:
+    """Run one request on its caller's own session"""
+    return await self._run(query, (await self._get_session(session_id)).id)
+
+  async def _run(self, query: str, session_id: str) -> str:
+    from google.genai import types
+    content = types.Content(role="user", parts=[types.Part.from_text(text=query)])
+    response = EMPTY_VERDICT
+    async for event in self._runner.run_async(user_id=self._user_id, session_id=session_id, new_message=content):
+      if event.is_final_response():
+        response = _event_text(event) or EMPTY_VERDICT
+    return response
+
+  @staticmethod
+  def _split(text: str, size: int) -> list[str | None]:
+    """Map a batched JSON array response back to per-request outputs; None marks a miss"""
+    outputs: list[str | None] = [None] * size
+    try:
+      items = serialization.loads(text)
+    except serialization.JSONDecodeError:
+      return outputs
+    if not isinstance(items, list):
+      return outputs
+    for item in items:
+      if not isinstance(item, dict):
+        continue
+      index = item.get("index")
+      if isinstance(index, int) and 0 <= index < size and "output" in item:
+        output = item["output"]
+        outputs[index] = output if isinstance(output, str) else serialization.dumps(output)
+    return outputs
 
 class ComplianceAgent:
   SUPPORTED_CONTENT_TYPES = ["text", "application/json"]
 
+  # (model, context budget in tokens), cheapest first. Short artifacts go to the small
+  # model and are escalated when its verdict is unusable.
+  MODEL_TIERS = (
+    ("gemini-1.5-flash-8b", 2048),
+    (MODEL_NAME, 32768),
+  )
+
+  # Runners (and their ADK service pools) are shared by every instance in the process
+  _runner_cache: Dict[tuple[str, str], Runner] = {}
+  _runner_lock = threading.Lock()
+
   def __init__(self):
-    self._agent = self._build_agent()
-    self._runner = Runner(
-      app_name=self._agent.name,
-      agent=self._agent,
-      artifact_service=InMemoryArtifactService(),
-      session_service=InMemorySessionService(),
-      memory_service=InMemoryMemoryService(),
-    )
     self._user_id = "compliance"
+    self._runners = {model: self._get_runner(model, self._user_id) for model, _ in self.MODEL_TIERS}
+    self._runner = self._runners[MODEL_NAME]
+    self._agent = self._runner.agent
+    # (model, session_id) -> (expiry on the monotonic clock, session), least recently used first
+    self._sessions: OrderedDict[tuple[str, str], tuple[float, Session]] = OrderedDict()
+    self._session_ttl = min(SESSION_MEMO_TTL, self._adk_session_ttl() // 2)
+    self._batchers = {
+      model: BatchingComplianceRunner(runner, self._user_id, functools.partial(self._get_session, model=model))
+      for model, runner in self._runners.items()
+    }
+
+  def _get_runner(self, model_name: str, user_id: str) -> Runner:
+    key = (model_name, user_id)
+    with self._runner_lock:
+      runner = self._runner_cache.get(key)
+      if runner is None:
+        from google.adk.runners import Runner
+        from common.utils.adk_services import create_adk_services
+        agent = self._build_agent(model_name)
+        runner = Runner(
+          app_name=agent.name,
+          agent=agent,
+          **create_adk_services(os.getenv("REDIS_URL"), ttl=self._adk_session_ttl()),
+        )
+        self._runner_cache[key] = runner
+      return runner
+
+  @staticmethod
+  def _adk_session_ttl() -> int:
+    from common.utils.adk_services import DEFAULT_TTL
+    return int(os.getenv("ADK_SESSION_TTL", DEFAULT_TTL))
 
-  def _build_agent(self) -> LlmAgent:
+  async def _get_session(self, session_id: str, model: str = MODEL_NAME) -> Session:
+    """Resolve the ADK session for (model, session_id), reusing it for a bounded time"""
+    key = (model, session_id)
+    entry = self._sessions.get(key)
+    if entry is not None and entry[0] > time.monotonic():
+      self._sessions.move_to_end(key)
+      return entry[1]
+    # The memo stays on the loop thread; only the session store round-trips move off it
+    session = await asyncio.to_thread(self._load_session, self._runners[model], session_id)
+    self._sessions[key] = (time.monotonic() + self._session_ttl, session)
+    self._sessions.move_to_end(key)
+    while len(self._sessions) > SESSION_MEMO_SIZE:
+      self._sessions.popitem(last=False)
+    return session
+
+  def _load_session(self, runner: Runner, session_id: str) -> Session:
+    session_service = runner.session_service
+    session = session_service.get_session(app_name=runner.app_name, user_id=self._user_id, session_id=session_id)
+    if session is None:
+      session = session_service.create_session(
+        app_name=runner.app_name, user_id=self._user_id, state={}, session_id=session_id
+      )
+    return session
+
+  def _build_agent(self, model_name: str = MODEL_NAME) -> LlmAgent:
+    from google.adk.agents.llm_agent import LlmAgent
     return LlmAgent(
-      model="gemini-2.0-flash-001",
+      model=model_name,
       name="compliance",
       description="Performs ToS checks, PII redaction, and content safety on artifacts.",
       instruction=(
@@ -32,23 +303,104 @@ class ComplianceAgent:
       tools=[],
     )
 
-  def invoke(self, query: str, session_id: str) -> str:
-    content = types.Content(role="user", parts=[types.Part.from_text(text=query)])
-    events = self._runner.run(user_id=self._user_id, session_id=session_id, new_message=content)
-    if not events or not events[-1].content or not events[-1].content.parts:
-      return json.dumps({})
-    text = "\n".join([p.text for p in events[-1].content.parts if p.text])
-    try:
-      json.loads(text)
-      return text
-    except:
-      return json.dumps({})
+  async def warmup(self):
+    """Issue a throwaway request per model tier so Gemini's HTTP pools are open before real traffic"""
+    from google.genai import types
+    content = types.Content(role="user", parts=[types.Part.from_text(text="ping")])
+
+    async def ping(runner: Runner):
+      session_service = runner.session_service
+      session = await asyncio.to_thread(
+        session_service.create_session,
+        app_name=runner.app_name, user_id=self._user_id, state={}, session_id=f"warmup-{uuid.uuid4().hex}",
+      )
+      try:
+        async for _ in runner.run_async(user_id=self._user_id, session_id=session.id, new_message=content):
+          pass
+      finally:
+        await asyncio.to_thread(
+          session_service.delete_session, app_name=runner.app_name, user_id=self._user_id, session_id=session.id
+        )
+
+    await asyncio.gather(*(ping(runner) for runner in self._runners.values()))
+
+  def _select_models(self, query: str) -> list[str]:
+    """Models to try in order: the smallest whose budget fits the query, then larger ones"""
+    approx_tokens = len(query) // 4
+    for i, (_, budget) in enumerate(self.MODEL_TIERS):
+      if budget >= approx_tokens:
+        return [model for model, _ in self.MODEL_TIERS[i:]]
+    return [self.MODEL_TIERS[-1][0]]
+
+  @staticmethod
+  def _should_escalate(text: str) -> bool:
+    """A failing verdict without reasons (or no valid verdict) is treated as low confidence"""
+    if not _is_json(text):
+      return True
+    verdict = serialization.loads(text)
+    return isinstance(verdict, dict) and verdict.get("pass") is False and not verdict.get("reasons")
+
+  async def invoke(self, query: str, session_id: str) -> str:
+    cache = await _get_response_cache()
+    cache_key = make_cache_key(MODEL_NAME, query)
+    cached = await cache.alookup(cache_key)
+    if cached is not None:
+      return cached
+    models = self._select_models(query)
+    for model in models:
+      text = await self._batchers[model].submit(query, session_id)
+      if model == models[-1] or not self._should_escalate(text):
+        break
+      logger.info(f"Escalating compliance check from {model}")
+    if not _is_json(text):
+      return EMPTY_VERDICT
+    await cache.aupdate(cache_key, text)
+    return text
 
   async def stream(self, query: str, session_id: str):
+    cache = await _get_response_cache()
+    cache_key = make_cache_key(MODEL_NAME, query)
+    cached = await cache.alookup(cache_key)
+    if cached is not None:
+      yield {"is_task_complete": True, "content": cached}
+      return
+    models = self._select_models(query)
+    for model in models:
+      response = EMPTY_VERDICT
+      # Only the last tier streams live; earlier tiers hold their deltas until the
+      # verdict is accepted so an escalated draft never reaches the caller
+      is_last = model == models[-1]
+      held = []
+      async for item in self._stream_model(model, query, session_id):
+        if item["is_task_complete"]:
+          response = item["content"]
+        elif is_last:
+          yield item
+        else:
+          held.append(item)
+      if is_last or not self._should_escalate(response):
+        for item in held:
+          yield item
+        break
+      yield {"is_task_complete": False, "updates": "Re-checking with a larger model..."}
+    if _is_json(response):
+      await cache.aupdate(cache_key, response)
+    yield {"is_task_complete": True, "content": response}
+
+  async def _stream_model(self, model: str, query: str, session_id: str):
+    # Streamed checks bypass the batcher: coalescing would hold back the first token
+    from google.genai import types
     content = types.Content(role="user", parts=[types.Part.from_text(text=query)])
-    async for event in self._runner.run_async(user_id=self._user_id, session_id=session_id, new_message=content):
+    session = await self._get_session(session_id, model=model)
+    deltas = []
+    async for event in self._runners[model].run_async(
+      user_id=self._user_id, session_id=session.id, new_message=content, run_config=_get_stream_run_config()
+    ):
       if event.is_final_response():
-        response = "\n".join([p.text for p in event.content.parts if p.text]) if event.content and event.content.parts else "{}"
+        response = _event_text(event) or "".join(deltas) or EMPTY_VERDICT
         yield {"is_task_complete": True, "content": response}
       else:
-        yield {"is_task_complete": False, "updates": "Running safety checks..."}
+        delta = _event_text(event, separator="")
+        if delta:
+          deltas.append(delta)
+          yield {"is_task_complete": False, "content_delta": delta}
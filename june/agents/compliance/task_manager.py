@@ -27,7 +27,8 @@ class AgentTaskManager(InMemoryTaskManager):
         artifacts = None
         if not is_task_complete:
           task_state = TaskState.WORKING
-          parts = [{"type": "text", "text": item["updates"]}]
+          text = item["content_delta"] if "content_delta" in item else item["updates"]
+          parts = [{"type": "text", "text": text}]
         else:
           content = item["content"]
           try:
@@ -89,7 +90,7 @@ class AgentTaskManager(InMemoryTaskManager):
     task_send_params: TaskSendParams = request.params
     query = self._get_user_query(task_send_params)
     try:
-      result = self.agent.invoke(query, task_send_params.sessionId)
+      result = await self.agent.invoke(query, task_send_params.sessionId)
     except Exception as e:
       logger.error(f"Error invoking agent: {e}")
       raise ValueError(f"Error invoking agent: {e}")
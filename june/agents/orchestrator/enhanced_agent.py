@@ -3,21 +3,103 @@ Enhanced Orchestrator Agent with RAG and Hallucination Detection
 Demonstrates how to reduce hallucinations using the enhanced agent framework.
 """
 
+from __future__ import annotations
+
+import hashlib
 import logging
-import json
-from typing import Any, AsyncIterable, Dict, List
-from google.adk.agents.llm_agent import LlmAgent
-from google.adk.runners import Runner
-from google.adk.sessions import InMemorySessionService
-from google.adk.memory.in_memory_memory_service import InMemoryMemoryService
-from google.adk.artifacts import InMemoryArtifactService
-from google.genai import types
+import os
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, AsyncIterable, Dict, List, Optional, Set, Tuple
 
+from common.utils import serialization
+from common.utils.response_cache import LRUCache, make_cache_key
 # Fix import path to use correct relative imports
 from common.utils.enhanced_agent_base import EnhancedAgentBase, EnhancedAgentConfig, EnhancedResponse
 
+# Google ADK is imported where it is used so that importing this module
+# (status endpoints, CLI --help) doesn't pay for google.genai and gRPC
+if TYPE_CHECKING:
+    from google.adk.agents.llm_agent import LlmAgent
+
 logger = logging.getLogger(__name__)
 
+# Yielded for every non-final streaming event; shared, so consumers must not mutate it
+_PROGRESS_EVENT = {"is_task_complete": False, "updates": "Planning your enhanced workflow..."}
+
+# Bump to force the initial knowledge to be re-ingested
+_KNOWLEDGE_VERSION = 1
+
+
+def _content_id(content: str) -> str:
+    """Stable document ID derived from the knowledge content"""
+    digest = hashlib.blake2b(f"{_KNOWLEDGE_VERSION}:{content}".encode(), digest_size=16).hexdigest()
+    return f"career_{digest}"
+
+
+# Sample career planning knowledge
+_CAREER_KNOWLEDGE_SOURCE = [
+    {
+        "title": "Job Search Best Practices",
+        "content": "Effective job searching involves multiple strategies: networking (70% of jobs are found through connections), online applications (20%), and direct outreach (10%). The average job search takes 3-6 months. Key success factors include having a targeted resume, practicing interview skills, and maintaining a consistent daily routine.",
+        "document_type": "career_guidance",
+        "tags": ["job_search", "best_practices", "statistics"]
+    },
+    {
+        "title": "LinkedIn Optimization",
+        "content": "LinkedIn profiles with professional photos receive 21x more profile views. Complete profiles get 40x more opportunities. Key optimization areas include: compelling headline, detailed experience descriptions, relevant skills, and active engagement with industry content.",
+        "document_type": "career_guidance",
+        "tags": ["linkedin", "optimization", "social_media"]
+    },
+    {
+        "title": "Resume Writing Guidelines",
+        "content": "ATS-friendly resumes should use standard section headers, include relevant keywords, and avoid graphics. The average recruiter spends 6-7 seconds reviewing a resume. Quantify achievements with specific numbers and metrics. Keep to 1-2 pages maximum.",
+        "document_type": "career_guidance",
+        "tags": ["resume", "ats", "writing"]
+    },
+    {
+        "title": "Interview Preparation",
+        "content": "Successful interview preparation includes researching the company, practicing common questions, preparing STAR method responses, and having thoughtful questions ready. Mock interviews can improve performance by 30%. Follow up within 24 hours after interviews.",
+        "document_type": "career_guidance",
+        "tags": ["interview", "preparation", "follow_up"]
+    },
+    {
+        "title": "Salary Negotiation",
+        "content": "Salary negotiation can increase initial offers by 5-15%. Research market rates using tools like Glassdoor and Payscale. Focus on value and achievements rather than personal needs. Consider total compensation including benefits, equity, and growth opportunities.",
+        "document_type": "career_guidance",
+        "tags": ["salary", "negotiation", "compensation"]
+    }
+]
+
+
+def _knowledge_metadata(knowledge: Dict[str, Any]) -> Dict[str, Any]:
+    """Ingestion metadata for one knowledge entry"""
+    return {
+        "document_id": _content_id(knowledge["content"]),
+        "title": knowledge["title"],
+        "document_type": knowledge["document_type"],
+        "tags": knowledge["tags"],
+        "agent_name": "enhanced_orchestrator",
+        "user_id": "system",
+        "created_at": "2024-12-19T00:00:00Z"
+    }
+
+
+# (content, metadata) pairs built once at import rather than on every load
+_CAREER_KNOWLEDGE: Tuple[Tuple[str, Dict[str, Any]], ...] = tuple(
+    (knowledge["content"], _knowledge_metadata(knowledge)) for knowledge in _CAREER_KNOWLEDGE_SOURCE
+)
+
+
+@lru_cache(maxsize=None)
+def _shared_services(app_name: str) -> Dict[str, Any]:
+    """ADK artifact/session/memory services shared by every agent instance of an app"""
+    from common.utils.adk_services import DEFAULT_TTL, create_adk_services
+    return create_adk_services(
+        os.getenv("REDIS_URL"),
+        ttl=int(os.getenv("ADK_SESSION_TTL", DEFAULT_TTL)),
+        memory_budget_mb=int(os.getenv("ADK_MEMORY_BUDGET_MB", 256)),
+    )
+
 class EnhancedOrchestratorAgent(EnhancedAgentBase):
     """Enhanced Orchestrator Agent with RAG and hallucination detection"""
     
@@ -28,15 +110,15 @@ class EnhancedOrchestratorAgent(EnhancedAgentBase):
         super().__init__(config)
         
         # Initialize Google ADK components
+        from google.adk.runners import Runner
         self._agent = self._build_agent()
         self._runner = Runner(
             app_name=self._agent.name,
             agent=self._agent,
-            artifact_service=InMemoryArtifactService(),
-            session_service=InMemorySessionService(),
-            memory_service=InMemoryMemoryService(),
+            **_shared_services(self._agent.name),
         )
         self._user_id = "enhanced_orchestrator"
+        self._validation_cache = LRUCache(maxsize=1024)
         
         # Note: _load_initial_knowledge is now called separately since it's async
     
@@ -46,6 +128,7 @@ class EnhancedOrchestratorAgent(EnhancedAgentBase):
     
     def _build_agent(self) -> LlmAgent:
         """Build the LLM agent with enhanced instructions"""
+        from google.adk.agents.llm_agent import LlmAgent
         return LlmAgent(
             model="gemini-2.0-flash-001",
             name="enhanced_orchestrator",
@@ -67,90 +150,75 @@ class EnhancedOrchestratorAgent(EnhancedAgentBase):
             if not self.config.enable_rag:
                 return
             
-            # Sample career planning knowledge
-            career_knowledge = [
-                {
-                    "title": "Job Search Best Practices",
-                    "content": "Effective job searching involves multiple strategies: networking (70% of jobs are found through connections), online applications (20%), and direct outreach (10%). The average job search takes 3-6 months. Key success factors include having a targeted resume, practicing interview skills, and maintaining a consistent daily routine.",
-                    "document_type": "career_guidance",
-                    "tags": ["job_search", "best_practices", "statistics"]
-                },
-                {
-                    "title": "LinkedIn Optimization",
-                    "content": "LinkedIn profiles with professional photos receive 21x more profile views. Complete profiles get 40x more opportunities. Key optimization areas include: compelling headline, detailed experience descriptions, relevant skills, and active engagement with industry content.",
-                    "document_type": "career_guidance",
-                    "tags": ["linkedin", "optimization", "social_media"]
-                },
-                {
-                    "title": "Resume Writing Guidelines",
-                    "content": "ATS-friendly resumes should use standard section headers, include relevant keywords, and avoid graphics. The average recruiter spends 6-7 seconds reviewing a resume. Quantify achievements with specific numbers and metrics. Keep to 1-2 pages maximum.",
-                    "document_type": "career_guidance",
-                    "tags": ["resume", "ats", "writing"]
-                },
-                {
-                    "title": "Interview Preparation",
-                    "content": "Successful interview preparation includes researching the company, practicing common questions, preparing STAR method responses, and having thoughtful questions ready. Mock interviews can improve performance by 30%. Follow up within 24 hours after interviews.",
-                    "document_type": "career_guidance",
-                    "tags": ["interview", "preparation", "follow_up"]
-                },
-                {
-                    "title": "Salary Negotiation",
-                    "content": "Salary negotiation can increase initial offers by 5-15%. Research market rates using tools like Glassdoor and Payscale. Focus on value and achievements rather than personal needs. Consider total compensation including benefits, equity, and growth opportunities.",
-                    "document_type": "career_guidance",
-                    "tags": ["salary", "negotiation", "compensation"]
-                }
+            # Skip content already indexed, then embed and ingest the rest in one batch
+            existing = await self._ingested_ids()
+            # ingest_documents annotates the metadata it is given, so hand it copies
+            pending = [
+                (content, dict(metadata))
+                for content, metadata in _CAREER_KNOWLEDGE
+                if metadata["document_id"] not in existing
             ]
-            
-            # Ingest knowledge into RAG system
-            for knowledge in career_knowledge:
-                await self.ingest_knowledge(
-                    content=knowledge["content"],
-                    metadata={
-                        "title": knowledge["title"],
-                        "document_type": knowledge["document_type"],
-                        "tags": knowledge["tags"],
-                        "agent_name": "enhanced_orchestrator",
-                        "user_id": "system",
-                        "created_at": "2024-12-19T00:00:00Z"
-                    }
-                )
+            if pending:
+                results = await self.batch_ingest_knowledge(pending)
+                for (_, metadata), success in zip(pending, results):
+                    if not success:
+                        logger.warning("Failed to ingest %s", metadata['title'])
             
             logger.info("Initial career knowledge loaded successfully")
             
         except Exception as e:
-            logger.warning(f"Failed to load initial knowledge: {e}")
+            logger.warning("Failed to load initial knowledge: %s", e)
+    
+    async def _ingested_ids(self) -> Set[str]:
+        """Document IDs of the knowledge entries already indexed"""
+        if not self.rag_manager:
+            return set()
+        existing = await self.rag_manager.existing_documents(
+            [metadata["document_id"] for _, metadata in _CAREER_KNOWLEDGE]
+        )
+        for _, metadata in _CAREER_KNOWLEDGE:
+            if metadata["document_id"] in existing:
+                logger.info("Knowledge already ingested: %s", metadata['title'])
+        return existing
     
     async def _invoke_base(self, query: str, session_id: str) -> str:
         """Base invoke method using Google ADK"""
+        from google.genai import types
         try:
             content = types.Content(role="user", parts=[types.Part.from_text(text=query)])
-            events = self._runner.run(user_id=self._user_id, session_id=session_id, new_message=content)
+            # Keep only the last event rather than buffering the whole run
+            last_event = None
+            for event in self._runner.run(user_id=self._user_id, session_id=session_id, new_message=content):
+                last_event = event
             
-            if not events or not events[-1].content or not events[-1].content.parts:
+            if last_event is None or not last_event.content or not last_event.content.parts:
                 return ""
             
-            return "\n".join([p.text for p in events[-1].content.parts if p.text])
+            return "\n".join(p.text for p in last_event.content.parts if p.text)
             
         except Exception as e:
-            logger.error(f"Error in base invoke: {e}")
+            logger.error("Error in base invoke: %s", e)
             return f"Error processing request: {str(e)}"
     
     async def _stream_base(self, query: str, session_id: str) -> AsyncIterable[Dict[str, Any]]:
         """Base streaming method using Google ADK"""
+        from google.genai import types
         try:
             content = types.Content(role="user", parts=[types.Part.from_text(text=query)])
             
             async for event in self._runner.run_async(user_id=self._user_id, session_id=session_id, new_message=content):
                 if event.is_final_response():
                     response = ""
-                    if event.content and event.content.parts and event.content.parts[0].text:
-                        response = "\n".join([p.text for p in event.content.parts if p.text])
+                    if event.content and event.content.parts:
+                        parts = event.content.parts
+                        if parts[0].text:
+                            response = "\n".join(p.text for p in parts if p.text)
                     yield {"is_task_complete": True, "content": response}
                 else:
-                    yield {"is_task_complete": False, "updates": "Planning your enhanced workflow..."}
+                    yield _PROGRESS_EVENT
                     
         except Exception as e:
-            logger.error(f"Error in base streaming: {e}")
+            logger.error("Error in base streaming: %s", e)
             yield {"is_task_complete": True, "content": f"Error: {str(e)}"}
     
     async def plan_workflow_enhanced(
@@ -161,15 +229,18 @@ class EnhancedOrchestratorAgent(EnhancedAgentBase):
     ) -> EnhancedResponse:
         """Enhanced workflow planning with RAG and hallucination detection"""
         try:
+            # Serialize the profile once for both the query and the additional context
+            profile_json = serialization.dumps(user_profile, default=str) if user_profile else None
+            
             # Create context-specific query
-            context_query = self._create_context_query(query, user_profile)
+            context_query = self._create_context_query(query, profile_json)
             
             # Use enhanced invoke
             enhanced_response = await self.invoke_enhanced(
                 query=context_query,
                 session_id=session_id,
                 context_type="career_guidance",
-                additional_context=json.dumps(user_profile) if user_profile else None
+                additional_context=profile_json
             )
             
             # Add workflow-specific metadata
@@ -182,15 +253,15 @@ class EnhancedOrchestratorAgent(EnhancedAgentBase):
             return enhanced_response
             
         except Exception as e:
-            logger.error(f"Error in enhanced workflow planning: {e}")
+            logger.error("Error in enhanced workflow planning: %s", e)
             return self._create_error_response(query, str(e))
     
-    def _create_context_query(self, query: str, user_profile: Dict[str, Any] = None) -> str:
+    def _create_context_query(self, query: str, profile_json: Optional[str] = None) -> str:
         """Create a context-rich query for better RAG retrieval"""
         base_query = query
         
-        if user_profile:
-            profile_context = f"User Profile: {json.dumps(user_profile, default=str)}"
+        if profile_json:
+            profile_context = f"User Profile: {profile_json}"
             base_query = f"{query}\n\nContext: {profile_context}"
         
         return base_query
@@ -215,7 +286,7 @@ class EnhancedOrchestratorAgent(EnhancedAgentBase):
             return enhanced_response
             
         except Exception as e:
-            logger.error(f"Error getting career insights: {e}")
+            logger.error("Error getting career insights: %s", e)
             return self._create_error_response(query, str(e))
     
     async def validate_career_advice(
@@ -224,6 +295,11 @@ class EnhancedOrchestratorAgent(EnhancedAgentBase):
         session_id: str
     ) -> Dict[str, Any]:
         """Validate career advice against knowledge base"""
+        cache_key = make_cache_key(session_id, advice)
+        cached = self._validation_cache.lookup(cache_key)
+        if cached is not None:
+            return serialization.loads(cached)
+        
         try:
             # Search knowledge base for relevant information
             search_results = await self.search_knowledge(advice, filters="document_type eq 'career_guidance'")
@@ -236,7 +312,7 @@ class EnhancedOrchestratorAgent(EnhancedAgentBase):
                     sources=search_results.get('documents', [])
                 )
                 
-                return {
+                result = {
                     "advice": advice,
                     "validation_results": {
                         "risk_level": analysis.overall_risk,
@@ -248,15 +324,20 @@ class EnhancedOrchestratorAgent(EnhancedAgentBase):
                     "confidence": "high" if analysis.overall_risk == "low" else "medium" if analysis.overall_risk == "medium" else "low"
                 }
             else:
-                return {
+                result = {
                     "advice": advice,
                     "validation_results": "Hallucination detection not available",
                     "supporting_sources": len(search_results.get('documents', [])),
                     "confidence": "unknown"
                 }
+            
+            # Cache a serialized copy so callers can't mutate it; skip failed searches so they get retried
+            if 'error' not in search_results:
+                self._validation_cache.update(cache_key, serialization.dumps(result))
+            return result
                 
         except Exception as e:
-            logger.error(f"Error validating career advice: {e}")
+            logger.error("Error validating career advice: %s", e)
             return {
                 "advice": advice,
                 "error": str(e),
@@ -273,7 +354,6 @@ class EnhancedOrchestratorAgent(EnhancedAgentBase):
         }
         
         # Add enhanced capabilities status
-        enhanced_capabilities = self.get_enhanced_capabilities()
         base_status["enhanced_capabilities"] = self.get_enhanced_capabilities()
         
         # Add knowledge base stats if available
@@ -303,12 +383,12 @@ class EnhancedOrchestratorAgent(EnhancedAgentBase):
             success = await self.ingest_knowledge(content, metadata)
             
             if success:
-                logger.info(f"Successfully updated knowledge base with: {metadata.get('title', 'Unknown')}")
+                logger.info("Successfully updated knowledge base with: %s", metadata.get('title', 'Unknown'))
             
             return success
             
         except Exception as e:
-            logger.error(f"Error updating knowledge base: {e}")
+            logger.error("Error updating knowledge base: %s", e)
             return False
     
     def get_enhancement_recommendations(self) -> List[str]:
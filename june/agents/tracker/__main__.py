@@ -5,9 +5,8 @@ from tracker.agent import TrackerAgent
 import click
 import os
 import logging
-from dotenv import load_dotenv
+from common.utils.env import ensure_env_loaded
 
-load_dotenv()
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
@@ -15,6 +14,7 @@ logger = logging.getLogger(__name__)
 @click.option("--host", default="localhost")
 @click.option("--port", default=11008)
 def main(host, port):
+  ensure_env_loaded()
   try:
     if not os.getenv("GOOGLE_API_KEY"):
       raise MissingAPIKeyError("GOOGLE_API_KEY environment variable not set.")
@@ -1,52 +1,93 @@
-import json
+from datetime import datetime
 from typing import AsyncIterable, Union, Any
 from common.types import (
   SendTaskRequest, TaskSendParams, Message, TaskStatus, Artifact,
-  TaskStatusUpdateEvent, TaskArtifactUpdateEvent, TextPart, TaskState,
+  TextPart, DataPart, TaskState,
   Task, SendTaskResponse, InternalError, JSONRPCResponse, SendTaskStreamingRequest,
   SendTaskStreamingResponse,
 )
 from common.server.task_manager import InMemoryTaskManager
 from .agent import VoiceAgent
 import common.server.utils as utils
+from common.utils import serialization
 import logging
 from common.server.repositories import save_voice_session
 logger = logging.getLogger(__name__)
 
+def _parse_json(content: Any) -> dict | None:
+  """Return the decoded payload when content is a JSON object, else None"""
+  if not isinstance(content, (str, bytes)) or content.lstrip()[:1] not in ("{", b"{"):
+    return None
+  try:
+    data = serialization.loads(content)
+  except ValueError:
+    return None
+  # DataPart only carries objects
+  return data if isinstance(data, dict) else None
+
+def _stream_response(request_id: Any, result: dict) -> dict:
+  """SendTaskStreamingResponse payload as a plain dict, serialized as-is by the server"""
+  return {"jsonrpc": "2.0", "id": request_id, "result": result}
+
 class AgentTaskManager(InMemoryTaskManager):
   def __init__(self, agent: VoiceAgent):
     super().__init__()
     self.agent = agent
 
-  async def _stream_generator(self, request: SendTaskStreamingRequest) -> AsyncIterable[SendTaskStreamingResponse] | JSONRPCResponse:
+  async def _stream_generator(self, request: SendTaskStreamingRequest) -> AsyncIterable[dict | JSONRPCResponse]:
     task_send_params: TaskSendParams = request.params
     query = self._get_user_query(task_send_params)
+    # Loop invariants bound once as locals for the per-token path
+    task_id = task_send_params.id
+    request_id = request.id
+    update_store = self._update_store
+    text_part = TextPart.model_construct
+    new_message = Message.model_construct
+    new_status = TaskStatus.model_construct
     try:
       async for item in self.agent.stream(query, task_send_params.sessionId):
         is_task_complete = item["is_task_complete"]
-        artifacts = None
+        artifact = None
+        # The store keeps models (built without validation, since the server produced
+        # them); the wire gets plain dicts that the server serializes directly
         if not is_task_complete:
           task_state = TaskState.WORKING
-          parts = [{"type": "text", "text": item["updates"]}]
+          text = item["updates"]
+          wire_parts = [{"type": "text", "text": text}]
+          parts = [text_part(text=text)]
         else:
           content = item["content"]
-          try:
-            data = json.loads(content)
-            parts = [{"type": "data", "data": data}]
-          except:
-            parts = [{"type": "text", "text": content}]
+          data = _parse_json(content)
+          if data is not None:
+            wire_parts = [{"type": "data", "data": data}]
+            parts = [DataPart.model_construct(data=data)]
+          else:
+            wire_parts = [{"type": "text", "text": content}]
+            parts = [text_part(text=content)]
           task_state = TaskState.COMPLETED
-          artifacts = [Artifact(parts=parts, index=0, append=False)]
-        message = Message(role="agent", parts=parts)
-        task_status = TaskStatus(state=task_state, message=message)
-        await self._update_store(task_send_params.id, task_status, artifacts)
-        task_update_event = TaskStatusUpdateEvent(id=task_send_params.id, status=task_status, final=False)
-        yield SendTaskStreamingResponse(id=request.id, result=task_update_event)
-        if artifacts:
-          for artifact in artifacts:
-            yield SendTaskStreamingResponse(id=request.id, result=TaskArtifactUpdateEvent(id=task_send_params.id, artifact=artifact))
+          artifact = Artifact.model_construct(parts=parts, index=0, append=False)
+        task_status = new_status(state=task_state, message=new_message(role="agent", parts=parts))
+        await update_store(task_id, task_status, [artifact] if artifact is not None else None)
+        yield _stream_response(request_id, {
+          "id": task_id,
+          "status": {
+            "state": task_state.value,
+            "message": {"role": "agent", "parts": wire_parts},
+            "timestamp": task_status.timestamp.isoformat(),
+          },
+          "final": False,
+        })
+        if artifact is not None:
+          yield _stream_response(request_id, {
+            "id": task_id,
+            "artifact": {"parts": wire_parts, "index": 0, "append": False},
+          })
         if is_task_complete:
-          yield SendTaskStreamingResponse(id=request.id, result=TaskStatusUpdateEvent(id=task_send_params.id, status=TaskStatus(state=task_status.state), final=True))
+          yield _stream_response(request_id, {
+            "id": task_id,
+            "status": {"state": task_state.value, "timestamp": datetime.now().isoformat()},
+            "final": True,
+          })
     except Exception as e:
       logger.error(f"An error occurred while streaming the response: {e}")
       yield JSONRPCResponse(id=request.id, error=InternalError(message="An error occurred while streaming the response"))
@@ -72,7 +113,7 @@ class AgentTaskManager(InMemoryTaskManager):
     return self._stream_generator(request)
 
   async def _update_store(self, task_id: str, status: TaskStatus, artifacts: list[Artifact] | None = None) -> Task:
-    async with self.lock:
+    async with self._get_task_lock(task_id):
       try:
         task = self.tasks[task_id]
       except KeyError:
@@ -83,7 +124,8 @@ class AgentTaskManager(InMemoryTaskManager):
         if task.artifacts is None:
           task.artifacts = []
         task.artifacts.extend(artifacts)
-      return task
+    self._release_task_lock(task_id, status)
+    return task
 
   async def _invoke(self, request: SendTaskRequest) -> SendTaskResponse:
     task_send_params: TaskSendParams = request.params
@@ -93,12 +135,10 @@ class AgentTaskManager(InMemoryTaskManager):
     except Exception as e:
       logger.error(f"Error invoking agent: {e}")
       raise ValueError(f"Error invoking agent: {e}")
-    parts = []
-    voice_data = {}
-    try:
-      voice_data = json.loads(result)
+    voice_data = _parse_json(result)
+    if voice_data is not None:
       parts = [{"type": "data", "data": voice_data}]
-    except:
+    else:
       parts = [{"type": "text", "text": result}]
     task_state = TaskState.COMPLETED
     task = await self._update_store(task_send_params.id, TaskStatus(state=task_state, message=Message(role="agent", parts=parts)), [Artifact(parts=parts)])
@@ -1,47 +1,186 @@
-from typing import List, Dict, Any, Optional
-from motor.motor_asyncio import AsyncIOMotorClient
+from typing import List, Dict, Any, Optional, Tuple
+from pymongo.errors import BulkWriteError
 from common.utils.config import load_config
 from common.utils.security import (
     security_validator,
     audit_logger,
     sanitize_user_input
 )
+import asyncio
 import logging
+import os
 import re
+import time
+from collections import OrderedDict
+
+try:
+  # PyMongo 4.9+ ships a native asyncio client; Motor runs each call on a thread pool
+  from pymongo import AsyncMongoClient
+except ImportError:
+  from motor.motor_asyncio import AsyncIOMotorClient as AsyncMongoClient
 
 logger = logging.getLogger(__name__)
 
-_client: Optional[AsyncIOMotorClient] = None
+_client: Optional[AsyncMongoClient] = None
 _db = None
+_init_lock = asyncio.Lock()
+
+# Keep warm connections around so bursts of saves don't pay for new sockets
+_MONGO_MAX_POOL_SIZE = int(os.getenv("MONGODB_MAX_POOL_SIZE", "100"))
+_MONGO_MIN_POOL_SIZE = int(os.getenv("MONGODB_MIN_POOL_SIZE", "10"))
+
+# Opt-in write coalescing: single-document saves on append-only collections are
+# queued per collection and flushed with one insert_many
+_BULK_WRITES = os.getenv("BULK_WRITES", "0") == "1"
+_BULK_MAX_BATCH = 500
+_BULK_FLUSH_DELAY = 0.05
+_queues: Dict[str, List[Tuple[Dict[str, Any], asyncio.Future]]] = {}
+_flush_tasks: Dict[str, asyncio.Task] = {}
+
+# Success-path audit events are sampled: 1 in AUDIT_SAMPLE per collection is logged.
+# Failures are always logged.
+_AUDIT_SAMPLE = max(1, int(os.getenv("AUDIT_SAMPLE", "100")))
+_audit_counts: Dict[str, int] = {}
+
+# Prompt versions change rarely but are read on every prompt library call
+_PROMPT_CACHE_TTL = float(os.getenv("PROMPT_CACHE_TTL", "60"))
+_PROMPT_CACHE_MAXSIZE = 256
+_prompt_cache: "OrderedDict[Tuple[Any, ...], Tuple[float, Dict[str, Any]]]" = OrderedDict()
+
+_USER_ID_RE = re.compile(r'[A-Za-z0-9_]+')
 
 async def get_db():
   global _client, _db
   if _db is not None:
     return _db
-  cfg = load_config()
-  _client = AsyncIOMotorClient(cfg.mongo.uri)
-  _db = _client[cfg.mongo.database]
+  async with _init_lock:
+    if _db is None:
+      cfg = load_config()
+      _client = AsyncMongoClient(
+        cfg.mongo.uri,
+        maxPoolSize=_MONGO_MAX_POOL_SIZE,
+        minPoolSize=_MONGO_MIN_POOL_SIZE
+      )
+      db = _client[cfg.mongo.database]
+      await ensure_indexes(db)
+      _db = db
   return _db
 
-def _validate_and_sanitize_input(data: Any, operation: str) -> Any:
+async def ensure_indexes(db) -> None:
+  """Create the indexes backing repository lookups (idempotent)"""
+  indexes = [
+    ("prompt_versions", [("agent", 1), ("skill", 1), ("version", -1)], {}),
+    ("prompt_versions", [("agent", 1), ("skill", 1), ("ab_test_id", 1)], {}),
+    ("profiles", [("user_id", 1)], {"unique": True}),
+    ("profile_graphs", [("user_id", 1)], {"unique": True}),
+  ]
+  for collection, keys, options in indexes:
+    try:
+      await db[collection].create_index(keys, **options)
+    except Exception as e:
+      # Existing data (e.g. duplicate user_ids) can block an index; keep serving
+      logger.warning(f"Could not create index {keys} on {collection}: {e}")
+
+async def _flush(collection: str) -> None:
+  """Drain the write queue of a collection in insert_many batches"""
+  await asyncio.sleep(_BULK_FLUSH_DELAY)
+  queue = _queues.get(collection)
+  while queue:
+    batch = queue[:_BULK_MAX_BATCH]
+    del queue[:_BULK_MAX_BATCH]
+    docs = [doc for doc, _ in batch]
+    failed: Dict[int, Exception] = {}
+    try:
+      db = await get_db()
+      await db[collection].insert_many(docs, ordered=False)
+    except BulkWriteError as e:
+      for err in e.details.get("writeErrors", []):
+        failed[err["index"]] = e
+    except Exception as e:
+      failed = dict.fromkeys(range(len(batch)), e)
+    # insert_many assigns _id on each document before sending it
+    for i, (doc, future) in enumerate(batch):
+      if future.done():
+        continue
+      if i in failed:
+        future.set_exception(failed[i])
+      else:
+        future.set_result(doc["_id"])
+
+async def _insert_one(collection: str, doc: Dict[str, Any]) -> str:
+  """Insert one document, coalescing with concurrent saves when BULK_WRITES=1"""
+  if not _BULK_WRITES:
+    db = await get_db()
+    res = await db[collection].insert_one(doc)
+    return str(res.inserted_id)
+  future = asyncio.get_running_loop().create_future()
+  _queues.setdefault(collection, []).append((doc, future))
+  task = _flush_tasks.get(collection)
+  if task is None or task.done():
+    _flush_tasks[collection] = asyncio.create_task(_flush(collection))
+  return str(await future)
+
+def _should_audit(key: str) -> bool:
+  """Whether this success event for key falls on the audit sample"""
+  count = _audit_counts.get(key, 0)
+  _audit_counts[key] = count + 1
+  return count % _AUDIT_SAMPLE == 0
+
+def _validate_and_sanitize_input(data: Any, operation: str, trusted: bool = False) -> Any:
     """Validate and sanitize input data before database operations"""
+    if trusted:
+        # Built entirely by server code; copy so the caller's dict is not mutated
+        return dict(data) if isinstance(data, dict) else data
     try:
         # Sanitize the input
         sanitized_data = sanitize_user_input(data)
         
         # Log the operation for audit
+        if _should_audit(operation):
+            audit_logger.log_security_event(
+                "DB_OPERATION",
+                "system",
+                {
+                    "operation": operation,
+                    "data_type": type(data).__name__,
+                    "sanitized": True
+                },
+                "INFO"
+            )
+        
+        return sanitized_data
+    except Exception as e:
+        logger.error(f"Input validation failed for {operation}: {e}")
         audit_logger.log_security_event(
-            "DB_OPERATION",
+            "INPUT_VALIDATION_FAILED",
             "system",
             {
                 "operation": operation,
-                "data_type": type(data).__name__,
-                "sanitized": True
+                "error": str(e),
+                "data": str(data)[:100]  # Truncate for logging
             },
-            "INFO"
+            "ERROR"
         )
+        raise ValueError(f"Input validation failed: {e}")
+
+def _validate_and_sanitize_batch(items: List[Any], operation: str) -> List[Any]:
+    """Sanitize a list of records, emitting one audit event for the whole batch"""
+    try:
+        sanitized_items = [sanitize_user_input(item) for item in items]
         
-        return sanitized_data
+        if _should_audit(operation):
+            audit_logger.log_security_event(
+                "DB_OPERATION",
+                "system",
+                {
+                    "operation": operation,
+                    "count": len(items),
+                    "sanitized": True
+                },
+                "INFO"
+            )
+        
+        return sanitized_items
     except Exception as e:
         logger.error(f"Input validation failed for {operation}: {e}")
         audit_logger.log_security_event(
@@ -50,7 +189,7 @@ def _validate_and_sanitize_input(data: Any, operation: str) -> Any:
             {
                 "operation": operation,
                 "error": str(e),
-                "data": str(data)[:100]  # Truncate for logging
+                "count": len(items)
             },
             "ERROR"
         )
@@ -65,7 +204,7 @@ def _validate_user_id(user_id: str) -> str:
     sanitized_id = security_validator.sanitize_string(user_id, max_length=100)
     
     # Validate format (alphanumeric and underscore only)
-    if not re.match(r'^[a-zA-Z0-9_]+$', sanitized_id):
+    if not _USER_ID_RE.fullmatch(sanitized_id):
         raise ValueError("User ID contains invalid characters")
     
     return sanitized_id
@@ -77,21 +216,19 @@ async def save_jobs(jobs: List[Dict[str, Any]]) -> int:
     if not jobs:
       return 0
     
-    # Validate and sanitize each job
-    sanitized_jobs = []
-    for job in jobs:
-      sanitized_job = _validate_and_sanitize_input(job, "save_jobs")
+    sanitized_jobs = _validate_and_sanitize_batch(jobs, "save_jobs")
+    for sanitized_job in sanitized_jobs:
       sanitized_job.setdefault("_type", "job")
-      sanitized_jobs.append(sanitized_job)
     
-    res = await db["jobs"].insert_many(sanitized_jobs)
+    res = await db["jobs"].insert_many(sanitized_jobs, ordered=False)
     
-    audit_logger.log_security_event(
-        "DB_INSERT_SUCCESS",
-        "system",
-        {"collection": "jobs", "count": len(res.inserted_ids)},
-        "INFO"
-    )
+    if _should_audit("jobs"):
+      audit_logger.log_security_event(
+          "DB_INSERT_SUCCESS",
+          "system",
+          {"collection": "jobs", "count": len(res.inserted_ids)},
+          "INFO"
+      )
     
     return len(res.inserted_ids)
   except Exception as e:
@@ -111,21 +248,19 @@ async def save_matches(matches: List[Dict[str, Any]]) -> int:
     if not matches:
       return 0
     
-    # Validate and sanitize each match
-    sanitized_matches = []
-    for match in matches:
-      sanitized_match = _validate_and_sanitize_input(match, "save_matches")
+    sanitized_matches = _validate_and_sanitize_batch(matches, "save_matches")
+    for sanitized_match in sanitized_matches:
       sanitized_match.setdefault("_type", "match")
-      sanitized_matches.append(sanitized_match)
     
-    res = await db["matches"].insert_many(sanitized_matches)
+    res = await db["matches"].insert_many(sanitized_matches, ordered=False)
     
-    audit_logger.log_security_event(
-        "DB_INSERT_SUCCESS",
-        "system",
-        {"collection": "matches", "count": len(res.inserted_ids)},
-        "INFO"
-    )
+    if _should_audit("matches"):
+      audit_logger.log_security_event(
+          "DB_INSERT_SUCCESS",
+          "system",
+          {"collection": "matches", "count": len(res.inserted_ids)},
+          "INFO"
+      )
     
     return len(res.inserted_ids)
   except Exception as e:
@@ -138,36 +273,6 @@ async def save_matches(matches: List[Dict[str, Any]]) -> int:
     )
     raise
 
-async def save_tailor_result(result: Dict[str, Any]) -> str:
-  """Save tailor result with input validation and sanitization"""
-  try:
-    db = await get_db()
-    if not result:
-      return ""
-    
-    sanitized_result = _validate_and_sanitize_input(result, "save_tailor_result")
-    sanitized_result.setdefault("_type", "tailor_result")
-    
-    res = await db["tailor_results"].insert_one(sanitized_result)
-    
-    audit_logger.log_security_event(
-        "DB_INSERT_SUCCESS",
-        "system",
-        {"collection": "tailor_results", "id": str(res.inserted_id)},
-        "INFO"
-    )
-    
-    return str(res.inserted_id)
-  except Exception as e:
-    logger.error(f"Error saving tailor result: {e}")
-    audit_logger.log_security_event(
-        "DB_INSERT_FAILED",
-        "system",
-        {"collection": "tailor_results", "error": str(e)},
-        "ERROR"
-    )
-    raise
-
 async def save_profile(user_id: str, profile: Dict[str, Any]) -> str:
   """Save profile with input validation and sanitization"""
   try:
@@ -186,12 +291,13 @@ async def save_profile(user_id: str, profile: Dict[str, Any]) -> str:
       upsert=True
     )
     
-    audit_logger.log_security_event(
-        "DB_UPDATE_SUCCESS",
-        "system",
-        {"collection": "profiles", "user_id": validated_user_id},
-        "INFO"
-    )
+    if _should_audit("profiles"):
+      audit_logger.log_security_event(
+          "DB_UPDATE_SUCCESS",
+          "system",
+          {"collection": "profiles", "user_id": validated_user_id},
+          "INFO"
+      )
     
     return validated_user_id
   except Exception as e:
@@ -222,12 +328,13 @@ async def save_profile_graph(user_id: str, graph: Dict[str, Any]) -> str:
       upsert=True
     )
     
-    audit_logger.log_security_event(
-        "DB_UPDATE_SUCCESS",
-        "system",
-        {"collection": "profile_graphs", "user_id": validated_user_id},
-        "INFO"
-    )
+    if _should_audit("profile_graphs"):
+      audit_logger.log_security_event(
+          "DB_UPDATE_SUCCESS",
+          "system",
+          {"collection": "profile_graphs", "user_id": validated_user_id},
+          "INFO"
+      )
     
     return validated_user_id
   except Exception as e:
@@ -240,33 +347,6 @@ async def save_profile_graph(user_id: str, graph: Dict[str, Any]) -> str:
     )
     raise
 
-async def save_application(app: Dict[str, Any]) -> str:
-  """Save application with input validation and sanitization"""
-  try:
-    db = await get_db()
-    sanitized_app = _validate_and_sanitize_input(app, "save_application")
-    sanitized_app.setdefault("_type", "application")
-    
-    res = await db["applications"].insert_one(sanitized_app)
-    
-    audit_logger.log_security_event(
-        "DB_INSERT_SUCCESS",
-        "system",
-        {"collection": "applications", "id": str(res.inserted_id)},
-        "INFO"
-    )
-    
-    return str(res.inserted_id)
-  except Exception as e:
-    logger.error(f"Error saving application: {e}")
-    audit_logger.log_security_event(
-        "DB_INSERT_FAILED",
-        "system",
-        {"collection": "applications", "error": str(e)},
-        "ERROR"
-    )
-    raise
-
 async def save_referrals(referrals: List[Dict[str, Any]]) -> int:
   """Save referrals with input validation and sanitization"""
   try:
@@ -274,21 +354,19 @@ async def save_referrals(referrals: List[Dict[str, Any]]) -> int:
     if not referrals:
       return 0
     
-    # Validate and sanitize each referral
-    sanitized_referrals = []
-    for referral in referrals:
-      sanitized_referral = _validate_and_sanitize_input(referral, "save_referrals")
+    sanitized_referrals = _validate_and_sanitize_batch(referrals, "save_referrals")
+    for sanitized_referral in sanitized_referrals:
       sanitized_referral.setdefault("_type", "referral")
-      sanitized_referrals.append(sanitized_referral)
     
-    res = await db["referrals"].insert_many(sanitized_referrals)
+    res = await db["referrals"].insert_many(sanitized_referrals, ordered=False)
     
-    audit_logger.log_security_event(
-        "DB_INSERT_SUCCESS",
-        "system",
-        {"collection": "referrals", "count": len(res.inserted_ids)},
-        "INFO"
-    )
+    if _should_audit("referrals"):
+      audit_logger.log_security_event(
+          "DB_INSERT_SUCCESS",
+          "system",
+          {"collection": "referrals", "count": len(res.inserted_ids)},
+          "INFO"
+      )
     
     return len(res.inserted_ids)
   except Exception as e:
@@ -301,223 +379,91 @@ async def save_referrals(referrals: List[Dict[str, Any]]) -> int:
     )
     raise
 
-async def save_outreach_message(msg: Dict[str, Any]) -> str:
-  """Save outreach message with input validation and sanitization"""
-  try:
-    db = await get_db()
-    sanitized_msg = _validate_and_sanitize_input(msg, "save_outreach_message")
-    sanitized_msg.setdefault("_type", "outreach_message")
-    
-    res = await db["outreach_messages"].insert_one(sanitized_msg)
-    
-    audit_logger.log_security_event(
-        "DB_INSERT_SUCCESS",
-        "system",
-        {"collection": "outreach_messages", "id": str(res.inserted_id)},
-        "INFO"
-    )
-    
-    return str(res.inserted_id)
-  except Exception as e:
-    logger.error(f"Error saving outreach message: {e}")
-    audit_logger.log_security_event(
-        "DB_INSERT_FAILED",
-        "system",
-        {"collection": "outreach_messages", "error": str(e)},
-        "ERROR"
-    )
-    raise
-
-async def save_event(event: Dict[str, Any]) -> str:
-  """Save event with input validation and sanitization"""
-  try:
-    db = await get_db()
-    sanitized_event = _validate_and_sanitize_input(event, "save_event")
-    sanitized_event.setdefault("_type", "event")
-    
-    res = await db["audit_logs"].insert_one(sanitized_event)
-    
-    audit_logger.log_security_event(
-        "DB_INSERT_SUCCESS",
-        "system",
-        {"collection": "audit_logs", "id": str(res.inserted_id)},
-        "INFO"
-    )
-    
-    return str(res.inserted_id)
-  except Exception as e:
-    logger.error(f"Error saving event: {e}")
-    audit_logger.log_security_event(
-        "DB_INSERT_FAILED",
-        "system",
-        {"collection": "audit_logs", "error": str(e)},
-        "ERROR"
-    )
-    raise
+def _make_saver(collection: str, doc_type: str, label: str, skip_empty: bool = False):
+  """Build a save_* coroutine for single documents of one collection and type"""
+  operation = f"save_{doc_type}"
+  failed_log = f"Error saving {label}: %s"
 
-async def save_compliance_artifact(artifact: Dict[str, Any]) -> str:
-  """Save compliance artifact with input validation and sanitization"""
-  try:
-    db = await get_db()
-    sanitized_artifact = _validate_and_sanitize_input(artifact, "save_compliance_artifact")
-    sanitized_artifact.setdefault("_type", "compliance_artifact")
-    
-    res = await db["compliance_artifacts"].insert_one(sanitized_artifact)
-    
-    audit_logger.log_security_event(
-        "DB_INSERT_SUCCESS",
-        "system",
-        {"collection": "compliance_artifacts", "id": str(res.inserted_id)},
-        "INFO"
-    )
-    
-    return str(res.inserted_id)
-  except Exception as e:
-    logger.error(f"Error saving compliance artifact: {e}")
-    audit_logger.log_security_event(
-        "DB_INSERT_FAILED",
-        "system",
-        {"collection": "compliance_artifacts", "error": str(e)},
-        "ERROR"
-    )
-    raise
+  # trusted=True skips sanitization; only for documents with no user or model text
+  async def saver(doc: Dict[str, Any], trusted: bool = False) -> str:
+    try:
+      if skip_empty and not doc:
+        return ""
+      sanitized_doc = _validate_and_sanitize_input(doc, operation, trusted)
+      sanitized_doc.setdefault("_type", doc_type)
+      
+      inserted_id = await _insert_one(collection, sanitized_doc)
+      
+      if _should_audit(collection):
+        audit_logger.log_security_event(
+            "DB_INSERT_SUCCESS",
+            "system",
+            {"collection": collection, "id": inserted_id},
+            "INFO"
+        )
+      
+      return inserted_id
+    except Exception as e:
+      logger.error(failed_log, e)
+      audit_logger.log_security_event(
+          "DB_INSERT_FAILED",
+          "system",
+          {"collection": collection, "error": str(e)},
+          "ERROR"
+      )
+      raise
 
-async def save_interview_report(report: Dict[str, Any]) -> str:
-  """Save interview report with input validation and sanitization"""
-  try:
-    db = await get_db()
-    sanitized_report = _validate_and_sanitize_input(report, "save_interview_report")
-    sanitized_report.setdefault("_type", "interview_report")
-    
-    res = await db["interview_reports"].insert_one(sanitized_report)
-    
-    audit_logger.log_security_event(
-        "DB_INSERT_SUCCESS",
-        "system",
-        {"collection": "interview_reports", "id": str(res.inserted_id)},
-        "INFO"
-    )
-    
-    return str(res.inserted_id)
-  except Exception as e:
-    logger.error(f"Error saving interview report: {e}")
-    audit_logger.log_security_event(
-        "DB_INSERT_FAILED",
-        "system",
-        {"collection": "interview_reports", "error": str(e)},
-        "ERROR"
-    )
-    raise
+  saver.__name__ = saver.__qualname__ = operation
+  saver.__doc__ = f"Save {label} with input validation and sanitization"
+  return saver
 
-async def save_offer_comparison(comp: Dict[str, Any]) -> str:
-  """Save offer comparison with input validation and sanitization"""
-  try:
-    db = await get_db()
-    sanitized_comp = _validate_and_sanitize_input(comp, "save_offer_comparison")
-    sanitized_comp.setdefault("_type", "offer_comparison")
-    
-    res = await db["offer_comparisons"].insert_one(sanitized_comp)
-    
-    audit_logger.log_security_event(
-        "DB_INSERT_SUCCESS",
-        "system",
-        {"collection": "offer_comparisons", "id": str(res.inserted_id)},
-        "INFO"
-    )
-    
-    return str(res.inserted_id)
-  except Exception as e:
-    logger.error(f"Error saving offer comparison: {e}")
-    audit_logger.log_security_event(
-        "DB_INSERT_FAILED",
-        "system",
-        {"collection": "offer_comparisons", "error": str(e)},
-        "ERROR"
-    )
-    raise
+save_tailor_result = _make_saver("tailor_results", "tailor_result", "tailor result", skip_empty=True)
+save_application = _make_saver("applications", "application", "application")
+save_outreach_message = _make_saver("outreach_messages", "outreach_message", "outreach message")
+save_event = _make_saver("audit_logs", "event", "event")
+save_compliance_artifact = _make_saver("compliance_artifacts", "compliance_artifact", "compliance artifact")
+save_interview_report = _make_saver("interview_reports", "interview_report", "interview report")
+save_offer_comparison = _make_saver("offer_comparisons", "offer_comparison", "offer comparison")
+_save_prompt_version = _make_saver("prompt_versions", "prompt_version", "prompt version")
+save_voice_session = _make_saver("voice_sessions", "voice_session", "voice session")
+save_partner_api_call = _make_saver("partner_api_calls", "partner_api_call", "partner API call")
 
-async def save_prompt_version(prompt: Dict[str, Any]) -> str:
+async def save_prompt_version(prompt: Dict[str, Any], trusted: bool = False) -> str:
   """Save prompt version with input validation and sanitization"""
-  try:
-    db = await get_db()
-    sanitized_prompt = _validate_and_sanitize_input(prompt, "save_prompt_version")
-    sanitized_prompt.setdefault("_type", "prompt_version")
-    
-    res = await db["prompt_versions"].insert_one(sanitized_prompt)
-    
-    audit_logger.log_security_event(
-        "DB_INSERT_SUCCESS",
-        "system",
-        {"collection": "prompt_versions", "id": str(res.inserted_id)},
-        "INFO"
-    )
-    
-    return str(res.inserted_id)
-  except Exception as e:
-    logger.error(f"Error saving prompt version: {e}")
-    audit_logger.log_security_event(
-        "DB_INSERT_FAILED",
-        "system",
-        {"collection": "prompt_versions", "error": str(e)},
-        "ERROR"
-    )
-    raise
+  inserted_id = await _save_prompt_version(prompt, trusted)
+  # A new version can change what "latest" (or a cached miss) resolves to
+  _prompt_cache.clear()
+  return inserted_id
 
-async def save_voice_session(session: Dict[str, Any]) -> str:
-  """Save voice session with input validation and sanitization"""
-  try:
-    db = await get_db()
-    sanitized_session = _validate_and_sanitize_input(session, "save_voice_session")
-    sanitized_session.setdefault("_type", "voice_session")
-    
-    res = await db["voice_sessions"].insert_one(sanitized_session)
-    
-    audit_logger.log_security_event(
-        "DB_INSERT_SUCCESS",
-        "system",
-        {"collection": "voice_sessions", "id": str(res.inserted_id)},
-        "INFO"
-    )
-    
-    return str(res.inserted_id)
-  except Exception as e:
-    logger.error(f"Error saving voice session: {e}")
-    audit_logger.log_security_event(
-        "DB_INSERT_FAILED",
-        "system",
-        {"collection": "voice_sessions", "error": str(e)},
-        "ERROR"
-    )
-    raise
+def _cached_prompt(key: Tuple[Any, ...]) -> Optional[Dict[str, Any]]:
+  """Return a cached prompt version if it has not expired"""
+  entry = _prompt_cache.get(key)
+  if entry is None:
+    return None
+  expires_at, doc = entry
+  if expires_at < time.monotonic():
+    del _prompt_cache[key]
+    return None
+  _prompt_cache.move_to_end(key)
+  return dict(doc)
 
-async def save_partner_api_call(api_call: Dict[str, Any]) -> str:
-  """Save partner API call with input validation and sanitization"""
-  try:
-    db = await get_db()
-    sanitized_api_call = _validate_and_sanitize_input(api_call, "save_partner_api_call")
-    sanitized_api_call.setdefault("_type", "partner_api_call")
-    
-    res = await db["partner_api_calls"].insert_one(sanitized_api_call)
-    
-    audit_logger.log_security_event(
-        "DB_INSERT_SUCCESS",
-        "system",
-        {"collection": "partner_api_calls", "id": str(res.inserted_id)},
-        "INFO"
-    )
-    
-    return str(res.inserted_id)
-  except Exception as e:
-    logger.error(f"Error saving partner API call: {e}")
-    audit_logger.log_security_event(
-        "DB_INSERT_FAILED",
-        "system",
-        {"collection": "partner_api_calls", "error": str(e)},
-        "ERROR"
-    )
-    raise
+def _cache_prompt(key: Tuple[Any, ...], doc: Dict[str, Any]) -> None:
+  """Store a prompt version, evicting the least recently used entries"""
+  _prompt_cache[key] = (time.monotonic() + _PROMPT_CACHE_TTL, doc)
+  _prompt_cache.move_to_end(key)
+  while len(_prompt_cache) > _PROMPT_CACHE_MAXSIZE:
+    _prompt_cache.popitem(last=False)
 
-async def get_prompt_version(agent_name: str, skill_name: str, version: str = "latest") -> Dict[str, Any]:
+def _projection(fields: Optional[List[str]]) -> Optional[Dict[str, int]]:
+  """Translate a field list into a find() projection"""
+  return {field: 1 for field in fields} if fields else None
+
+async def get_prompt_version(
+  agent_name: str,
+  skill_name: str,
+  version: str = "latest",
+  fields: Optional[List[str]] = None
+) -> Dict[str, Any]:
   """Get prompt version with input validation and sanitization"""
   try:
     # Validate and sanitize input parameters
@@ -525,6 +471,11 @@ async def get_prompt_version(agent_name: str, skill_name: str, version: str = "l
     validated_skill_name = security_validator.sanitize_string(skill_name, max_length=100)
     validated_version = security_validator.sanitize_string(version, max_length=50)
     
+    cache_key = (validated_agent_name, validated_skill_name, validated_version, tuple(fields) if fields else None)
+    cached = _cached_prompt(cache_key)
+    if cached is not None:
+      return cached
+    
     db = await get_db()
     
     # Sanitize query parameters
@@ -533,20 +484,29 @@ async def get_prompt_version(agent_name: str, skill_name: str, version: str = "l
     if validated_version == "latest":
       doc = await db["prompt_versions"].find_one(
         query,
+        projection=_projection(fields),
         sort=[("version", -1)]
       )
     else:
       query["version"] = validated_version
-      doc = await db["prompt_versions"].find_one(query)
-    
-    audit_logger.log_security_event(
-        "DB_QUERY_SUCCESS",
-        "system",
-        {"collection": "prompt_versions", "query": str(query)},
-        "INFO"
-    )
+      doc = await db["prompt_versions"].find_one(query, projection=_projection(fields))
+    
+    if _should_audit("prompt_versions"):
+      audit_logger.log_security_event(
+          "DB_QUERY_SUCCESS",
+          "system",
+          {
+              "collection": "prompt_versions",
+              "query_agent": validated_agent_name,
+              "query_skill": validated_skill_name,
+              "query_version": validated_version
+          },
+          "INFO"
+      )
     
-    return doc or {}
+    doc = doc or {}
+    _cache_prompt(cache_key, doc)
+    return dict(doc)
   except Exception as e:
     logger.error(f"Error getting prompt version: {e}")
     audit_logger.log_security_event(
@@ -557,7 +517,13 @@ async def get_prompt_version(agent_name: str, skill_name: str, version: str = "l
     )
     raise
 
-async def get_ab_test_prompts(agent_name: str, skill_name: str, test_id: str) -> list[Dict[str, Any]]:
+async def get_ab_test_prompts(
+  agent_name: str,
+  skill_name: str,
+  test_id: str,
+  fields: Optional[List[str]] = None,
+  limit: int = 100
+) -> list[Dict[str, Any]]:
   """Get AB test prompts with input validation and sanitization"""
   try:
     # Validate and sanitize input parameters
@@ -574,15 +540,22 @@ async def get_ab_test_prompts(agent_name: str, skill_name: str, test_id: str) ->
       "ab_test_id": validated_test_id
     }
     
-    cursor = db["prompt_versions"].find(query)
-    result = await cursor.to_list(length=None)
-    
-    audit_logger.log_security_event(
-        "DB_QUERY_SUCCESS",
-        "system",
-        {"collection": "prompt_versions", "query": str(query), "result_count": len(result)},
-        "INFO"
-    )
+    cursor = db["prompt_versions"].find(query, projection=_projection(fields)).limit(limit)
+    result = await cursor.to_list(length=limit)
+    
+    if _should_audit("prompt_versions"):
+      audit_logger.log_security_event(
+          "DB_QUERY_SUCCESS",
+          "system",
+          {
+              "collection": "prompt_versions",
+              "query_agent": validated_agent_name,
+              "query_skill": validated_skill_name,
+              "query_ab_test_id": validated_test_id,
+              "result_count": len(result)
+          },
+          "INFO"
+      )
     
     return result
   except Exception as e:
@@ -1,6 +1,6 @@
 from starlette.applications import Starlette
-from starlette.responses import JSONResponse
-from sse_starlette.sse import EventSourceResponse
+from starlette.responses import JSONResponse, Response
+from sse_starlette.sse import EventSourceResponse, ServerSentEvent
 from starlette.requests import Request
 from starlette.middleware import Middleware
 from starlette.middleware.cors import CORSMiddleware
@@ -22,9 +22,14 @@ from common.types import (
     SendTaskStreamingRequest,
 )
 from pydantic import ValidationError
+import contextlib
+import importlib.util
 import json
-from typing import AsyncIterable, Any
+import os
+import socket
+from typing import AsyncIterable, Any, Awaitable, Callable
 from common.server.task_manager import TaskManager
+from common.utils import serialization
 from common.utils.security import (
     rate_limiter,
     auth_middleware,
@@ -33,6 +38,7 @@ from common.utils.security import (
     get_client_id,
     validate_request_size,
     sanitize_user_input,
+    start_audit_log_queue,
     SecurityHeaders
 )
 
@@ -41,6 +47,28 @@ import logging
 logger = logging.getLogger(__name__)
 
 
+def uvicorn_options() -> dict:
+    """Prefer uvloop and the httptools parser (both C) when they are installed"""
+    return {
+        "loop": "uvloop" if importlib.util.find_spec("uvloop") else "asyncio",
+        "http": "httptools" if importlib.util.find_spec("httptools") else "h11",
+        # An access log line is a log record per request; off unless asked for
+        "access_log": os.getenv("UVICORN_ACCESS_LOG", "false").lower() == "true",
+        "log_level": os.getenv("UVICORN_LOG_LEVEL", "info").lower(),
+    }
+
+
+async def _sse_events(result: AsyncIterable[Any]) -> AsyncIterable[ServerSentEvent]:
+    """Encode streamed task manager items as SSE events, one JSON-RPC message each"""
+    dumps = serialization.dumps
+    async for item in result:
+        if isinstance(item, dict):
+            # Pre-shaped payloads skip the pydantic round trip
+            yield ServerSentEvent(data=dumps(item))
+        else:
+            yield ServerSentEvent(data=item.model_dump_json(exclude_none=True))
+
+
 class A2AServer:
     def __init__(
         self,
@@ -52,6 +80,7 @@ class A2AServer:
         enable_security: bool = True,
         allowed_origins: list = None,
         trusted_hosts: list = None,
+        startup_hooks: list[Callable[[], Awaitable[Any]]] = None,
     ):
         self.host = host
         self.port = port
@@ -59,6 +88,9 @@ class A2AServer:
         self.task_manager = task_manager
         self.agent_card = agent_card
         self.enable_security = enable_security
+        self.startup_hooks = startup_hooks or []
+        self._agent_card_body: tuple[AgentCard, str] | None = None
+        self._dispatch = self._build_dispatch()
         
         # Security configuration
         if allowed_origins is None:
@@ -66,65 +98,146 @@ class A2AServer:
         if trusted_hosts is None:
             trusted_hosts = ["localhost", "127.0.0.1", "::1"]
         
-        # Create Starlette app with security middleware
-        self.app = Starlette()
-        
-        # Add security middleware
-        if self.enable_security:
-            self.app.add_middleware(
-                Middleware(
-                    TrustedHostMiddleware,
-                    allowed_hosts=trusted_hosts
-                )
+        # The middleware stack is fixed here, so requests never branch on
+        # enable_security for it; outermost first
+        middleware = [
+            Middleware(
+                SecurityHeadersMiddleware,
+                security_headers=SecurityHeaders.get_security_headers()
             )
-            
-            self.app.add_middleware(
+        ]
+        if self.enable_security:
+            middleware += [
+                Middleware(GZipMiddleware),
                 Middleware(
                     CORSMiddleware,
                     allow_origins=allowed_origins,
                     allow_credentials=True,
                     allow_methods=["GET", "POST", "PUT", "DELETE"],
                     allow_headers=["*"],
-                )
-            )
-            
-            self.app.add_middleware(GZipMiddleware)
+                ),
+                Middleware(
+                    TrustedHostMiddleware,
+                    allowed_hosts=trusted_hosts
+                ),
+            ]
+        
+        # Create Starlette app with security middleware
+        self.app = Starlette(middleware=middleware, lifespan=self._lifespan)
         
         # Add routes
         self.app.add_route(self.endpoint, self._process_request, methods=["POST"])
         self.app.add_route(
             "/.well-known/agent.json", self._get_agent_card, methods=["GET"]
         )
-        
-        # Add security headers middleware
-        self.app.add_middleware(
-            Middleware(
-                SecurityHeadersMiddleware,
-                security_headers=SecurityHeaders.get_security_headers()
-            )
-        )
 
-    def start(self):
+    @contextlib.asynccontextmanager
+    async def _lifespan(self, app):
+        """Run startup hooks (e.g. connection warm-up) on the serving loop before traffic"""
+        # Runs in each worker process, after any fork
+        start_audit_log_queue()
+        for hook in self.startup_hooks:
+            try:
+                await hook()
+            except Exception as e:
+                logger.warning(f"Startup hook {getattr(hook, '__name__', hook)} failed: {e}")
+        yield
+
+    def _check_configured(self):
         if self.agent_card is None:
             raise ValueError("agent_card is not defined")
 
         if self.task_manager is None:
             raise ValueError("request_handler is not defined")
 
+        self._dispatch = self._build_dispatch()
+
+    def _build_dispatch(self) -> dict[type, Callable[[Any], Awaitable[Any]]]:
+        """Map each concrete A2A request type to its task manager handler"""
+        task_manager = self.task_manager
+        if task_manager is None:
+            return {}
+        return {
+            GetTaskRequest: task_manager.on_get_task,
+            SendTaskRequest: task_manager.on_send_task,
+            SendTaskStreamingRequest: task_manager.on_send_task_subscribe,
+            CancelTaskRequest: task_manager.on_cancel_task,
+            SetTaskPushNotificationRequest: task_manager.on_set_task_push_notification,
+            GetTaskPushNotificationRequest: task_manager.on_get_task_push_notification,
+            TaskResubscriptionRequest: task_manager.on_resubscribe_to_task,
+        }
+
+    def start(self, workers: int = 1, pin_cpus: bool = False):
+        """Run the server, optionally as several forked workers sharing the port.
+
+        Workers each bind their own SO_REUSEPORT socket so the kernel balances
+        connections between them. Task state of in-memory task managers is
+        per-process, so more than one worker needs a shared task store.
+        """
+        self._check_configured()
+
+        if workers > 1 and hasattr(socket, "SO_REUSEPORT") and hasattr(os, "fork"):
+            self._start_workers(workers, pin_cpus)
+            return
+
         import uvicorn
 
-        uvicorn.run(self.app, host=self.host, port=self.port)
+        options = uvicorn_options()
+        logger.info(f"Serving on {self.host}:{self.port} (loop={options['loop']}, http={options['http']})")
+        uvicorn.run(self.app, host=self.host, port=self.port, **options)
+
+    def _start_workers(self, workers: int, pin_cpus: bool):
+        import multiprocessing
+
+        options = uvicorn_options()
+        logger.info(f"Serving on {self.host}:{self.port} (loop={options['loop']}, http={options['http']})")
+        context = multiprocessing.get_context("fork")
+        processes = [
+            context.Process(target=self._run_worker, args=(index, pin_cpus), daemon=False)
+            for index in range(workers)
+        ]
+        for process in processes:
+            process.start()
+        logger.info(f"Started {workers} workers on {self.host}:{self.port}")
+        for process in processes:
+            process.join()
+
+    def _run_worker(self, index: int, pin_cpus: bool):
+        import uvicorn
+
+        if pin_cpus and hasattr(os, "sched_setaffinity"):
+            cpus = sorted(os.sched_getaffinity(0))
+            os.sched_setaffinity(0, {cpus[index % len(cpus)]})
+
+        family, sock_type, proto, _, address = socket.getaddrinfo(
+            self.host, self.port, type=socket.SOCK_STREAM
+        )[0]
+        sock = socket.socket(family, sock_type, proto)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+        sock.bind(address)
+
+        config = uvicorn.Config(self.app, host=self.host, port=self.port, **uvicorn_options())
+        uvicorn.Server(config).run(sockets=[sock])
+
+    async def serve(self):
+        """Serve on the running event loop so several agents can share one process"""
+        self._check_configured()
 
-    def _get_agent_card(self, request: Request) -> JSONResponse:
+        import uvicorn
+
+        # The loop already exists here, so the loop option is left out
+        options = uvicorn_options()
+        del options["loop"]
+        config = uvicorn.Config(self.app, host=self.host, port=self.port, **options)
+        await uvicorn.Server(config).serve()
+
+    def _get_agent_card(self, request: Request) -> Response:
         """Get agent card with security headers"""
-        response = JSONResponse(self.agent_card.model_dump(exclude_none=True))
-        
-        # Add security headers
-        if self.enable_security:
-            for header, value in SecurityHeaders.get_security_headers().items():
-                response.headers[header] = value
-        
-        return response
+        # The card is static, so it is serialized once per card object
+        if self._agent_card_body is None or self._agent_card_body[0] is not self.agent_card:
+            self._agent_card_body = (self.agent_card, self.agent_card.model_dump_json(exclude_none=True))
+        return Response(self._agent_card_body[1], media_type="application/json")
 
     async def _process_request(self, request: Request):
         """Process A2A request with security measures"""
@@ -145,61 +258,42 @@ class A2AServer:
                     status_code=429
                 )
             
-            # Request size validation
+            # Request size validation, from the header before the body is read
             if not validate_request_size(request):
-                audit_logger.log_security_event(
-                    "REQUEST_SIZE_EXCEEDED",
-                    "anonymous",
-                    {"client_id": client_id, "endpoint": str(request.url)},
-                    "WARNING"
-                )
-                return JSONResponse(
-                    {"error": "Request too large"},
-                    status_code=413
-                )
+                return self._request_too_large(request, client_id)
         
         try:
-            body = await request.json()
+            raw_body = await request.body()
+            # The header is absent on chunked uploads; the buffered length is exact
+            if self.enable_security and not validate_request_size(request, len(raw_body)):
+                return self._request_too_large(request, client_id)
             
-            # Input sanitization
             if self.enable_security:
-                body = sanitize_user_input(body)
-            
-            json_rpc_request = A2ARequest.validate_python(body)
+                # Sanitization rewrites strings, so it runs on the decoded tree
+                body = sanitize_user_input(serialization.loads(raw_body))
+                json_rpc_request = A2ARequest.validate_python(body)
+            else:
+                # Decode and validate in one pass inside pydantic-core
+                json_rpc_request = A2ARequest.validate_json(raw_body)
 
             # Log request for audit
-            audit_logger.log_security_event(
-                "A2A_REQUEST",
-                "anonymous",
-                {
-                    "client_id": client_id,
-                    "request_type": type(json_rpc_request).__name__,
-                    "endpoint": str(request.url)
-                },
-                "INFO"
-            )
-
-            if isinstance(json_rpc_request, GetTaskRequest):
-                result = await self.task_manager.on_get_task(json_rpc_request)
-            elif isinstance(json_rpc_request, SendTaskRequest):
-                result = await self.task_manager.on_send_task(json_rpc_request)
-            elif isinstance(json_rpc_request, SendTaskStreamingRequest):
-                result = await self.task_manager.on_send_task_subscribe(
-                    json_rpc_request
-                )
-            elif isinstance(json_rpc_request, CancelTaskRequest):
-                result = await self.task_manager.on_cancel_task(json_rpc_request)
-            elif isinstance(json_rpc_request, SetTaskPushNotificationRequest):
-                result = await self.task_manager.on_set_task_push_notification(json_rpc_request)
-            elif isinstance(json_rpc_request, GetTaskPushNotificationRequest):
-                result = await self.task_manager.on_get_task_push_notification(json_rpc_request)
-            elif isinstance(json_rpc_request, TaskResubscriptionRequest):
-                result = await self.task_manager.on_resubscribe_to_task(
-                    json_rpc_request
+            if audit_logger.is_enabled("INFO"):
+                audit_logger.log_security_event(
+                    "A2A_REQUEST",
+                    "anonymous",
+                    {
+                        "client_id": client_id,
+                        "request_type": type(json_rpc_request).__name__,
+                        "endpoint": str(request.url)
+                    },
+                    "INFO"
                 )
-            else:
+
+            handler = self._dispatch.get(type(json_rpc_request))
+            if handler is None:
                 logger.warning(f"Unexpected request type: {type(json_rpc_request)}")
                 raise ValueError(f"Unexpected request type: {type(request)}")
+            result = await handler(json_rpc_request)
 
             return self._create_response(result)
 
@@ -217,48 +311,43 @@ class A2AServer:
             )
             return self._handle_exception(e)
 
-    def _handle_exception(self, e: Exception) -> JSONResponse:
+    def _request_too_large(self, request: Request, client_id: str) -> JSONResponse:
+        audit_logger.log_security_event(
+            "REQUEST_SIZE_EXCEEDED",
+            "anonymous",
+            {"client_id": client_id, "endpoint": str(request.url)},
+            "WARNING"
+        )
+        return JSONResponse(
+            {"error": "Request too large"},
+            status_code=413
+        )
+
+    def _handle_exception(self, e: Exception) -> Response:
         if isinstance(e, json.decoder.JSONDecodeError):
             json_rpc_error = JSONParseError()
+        elif isinstance(e, ValidationError) and e.errors()[0]["type"] == "json_invalid":
+            json_rpc_error = JSONParseError()
         elif isinstance(e, ValidationError):
-            json_rpc_error = InvalidRequestError(data=json.loads(e.json()))
+            json_rpc_error = InvalidRequestError(data=serialization.loads(e.json()))
         else:
             logger.error(f"Unhandled exception: {e}")
             json_rpc_error = InternalError()
 
-        response = JSONResponse(json_rpc_error.model_dump(exclude_none=True), status_code=400)
-        
-        # Add security headers to error responses
-        if self.enable_security:
-            for header, value in SecurityHeaders.get_security_headers().items():
-                response.headers[header] = value
-        
-        return response
-
-    def _create_response(self, result: Any) -> JSONResponse | EventSourceResponse:
-        if isinstance(result, AsyncIterable):
-
-            async def event_generator(result) -> AsyncIterable[dict[str, str]]:
-                async for item in result:
-                    yield {"data": item.model_dump_json(exclude_none=True)}
+        return Response(
+            json_rpc_error.model_dump_json(exclude_none=True),
+            status_code=400,
+            media_type="application/json",
+        )
 
-            response = EventSourceResponse(event_generator(result))
-            
-            # Add security headers to SSE responses
-            if self.enable_security:
-                for header, value in SecurityHeaders.get_security_headers().items():
-                    response.headers[header] = value
-            
-            return response
-        elif isinstance(result, JSONRPCResponse):
-            response = JSONResponse(result.model_dump(exclude_none=True))
-            
-            # Add security headers to JSON responses
-            if self.enable_security:
-                for header, value in SecurityHeaders.get_security_headers().items():
-                    response.headers[header] = value
-            
-            return response
+    def _create_response(self, result: Any) -> Response | EventSourceResponse:
+        # Concrete class first (the common case), then a plain attribute probe
+        # instead of the AsyncIterable ABC check
+        if isinstance(result, JSONRPCResponse):
+            # pydantic-core writes the JSON directly; no intermediate dict
+            return Response(result.model_dump_json(exclude_none=True), media_type="application/json")
+        elif hasattr(result, "__aiter__"):
+            return EventSourceResponse(_sse_events(result))
         else:
             logger.error(f"Unexpected result type: {type(result)}")
             raise ValueError(f"Unexpected result type: {type(result)}")
@@ -269,19 +358,16 @@ class SecurityHeadersMiddleware:
     
     def __init__(self, app, security_headers: dict):
         self.app = app
-        self.security_headers = security_headers
+        # Encoded once; every response just extends its header list
+        self.security_headers = [
+            (header.lower().encode(), value.encode())
+            for header, value in security_headers.items()
+        ]
     
     async def __call__(self, scope, receive, send):
         async def send_with_headers(message):
             if message["type"] == "http.response.start":
-                # Add security headers to response headers
-                if "headers" not in message:
-                    message["headers"] = []
-                
-                for header, value in self.security_headers.items():
-                    message["headers"].append(
-                        (header.lower().encode(), value.encode())
-                    )
+                message.setdefault("headers", []).extend(self.security_headers)
             
             await send(message)
         
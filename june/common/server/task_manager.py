@@ -38,6 +38,8 @@ from motor.motor_asyncio import AsyncIOMotorClient
 
 logger = logging.getLogger(__name__)
 
+_TERMINAL_STATES = frozenset({TaskState.COMPLETED, TaskState.CANCELED, TaskState.FAILED})
+
 class TaskManager(ABC):
     @abstractmethod
     async def on_get_task(self, request: GetTaskRequest) -> GetTaskResponse:
@@ -81,6 +83,8 @@ class InMemoryTaskManager(TaskManager):
         self.tasks: dict[str, Task] = {}
         self.push_notification_infos: dict[str, PushNotificationConfig] = {}
         self.lock = asyncio.Lock()
+        # Per-task locks so status updates for different tasks don't serialize
+        self.task_locks: dict[str, asyncio.Lock] = {}
         self.task_sse_subscribers: dict[str, List[asyncio.Queue]] = {}
         self.subscriber_lock = asyncio.Lock()
 
@@ -228,6 +232,16 @@ class InMemoryTaskManager(TaskManager):
 
             return task
 
+    def _get_task_lock(self, task_id: str) -> asyncio.Lock:
+        lock = self.task_locks.get(task_id)
+        if lock is None:
+            lock = self.task_locks[task_id] = asyncio.Lock()
+        return lock
+
+    def _release_task_lock(self, task_id: str, status: TaskStatus) -> None:
+        if status.state in _TERMINAL_STATES:
+            self.task_locks.pop(task_id, None)
+
     def append_task_history(self, task: Task, historyLength: int | None):
         new_task = task.model_copy()
         if historyLength is not None and historyLength > 0:
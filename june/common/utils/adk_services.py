@@ -0,0 +1,426 @@
+"""
+Google ADK service backends for the agents.
+Redis-backed session, memory and artifact services let sessions survive
+restarts and be shared between agent processes instead of each process
+holding its own in-memory copy. Without a Redis URL the stock ADK
+in-memory services are used.
+
+The ADK service interfaces are synchronous, so the Redis services block the
+calling thread. Every connection carries socket timeouts to bound that; async
+callers that touch a service directly should go through asyncio.to_thread.
+"""
+
+import atexit
+import logging
+import os
+import shutil
+import sqlite3
+import tempfile
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, List, Optional, Tuple
+
+from google.adk.artifacts import BaseArtifactService, InMemoryArtifactService
+from google.adk.events import Event
+from google.adk.memory.base_memory_service import BaseMemoryService, MemoryResult, SearchMemoryResponse
+from google.adk.memory.in_memory_memory_service import InMemoryMemoryService
+from google.adk.sessions import BaseSessionService, InMemorySessionService, Session
+from google.adk.sessions.base_session_service import GetSessionConfig, ListEventsResponse, ListSessionsResponse
+from google.genai import types
+
+from . import serialization
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL = 24 * 3600
+REDIS_SOCKET_TIMEOUT = 2.0
+REDIS_CONNECT_TIMEOUT = 2.0
+# Seconds a spill write waits for another connection's lock on a shared spill file
+SPILL_BUSY_TIMEOUT = 30.0
+
+# One connection pool per Redis URL, shared by every service in the process
+_pools: dict[str, Any] = {}
+_pools_lock = threading.Lock()
+
+
+def get_redis(url: str):
+    """Return a Redis client backed by the process-wide pool for url"""
+    import redis
+
+    with _pools_lock:
+        pool = _pools.get(url)
+        if pool is None:
+            pool = redis.ConnectionPool.from_url(
+                url,
+                socket_timeout=REDIS_SOCKET_TIMEOUT,
+                socket_connect_timeout=REDIS_CONNECT_TIMEOUT,
+            )
+            _pools[url] = pool
+    return redis.Redis(connection_pool=pool)
+
+
+class RedisSessionService(BaseSessionService):
+    """Session service storing each Session as JSON at session:{app}:{user}:{id}"""
+
+    def __init__(self, url: str, ttl: int = DEFAULT_TTL):
+        self._redis = get_redis(url)
+        self.ttl = ttl
+
+    @staticmethod
+    def _key(app_name: str, user_id: str, session_id: str) -> str:
+        return f"session:{app_name}:{user_id}:{session_id}"
+
+    def _save(self, session: Session) -> None:
+        self._redis.setex(
+            self._key(session.app_name, session.user_id, session.id),
+            self.ttl,
+            session.model_dump_json(),
+        )
+
+    def _load(self, key) -> Optional[Session]:
+        data = self._redis.get(key)
+        return Session.model_validate_json(data) if data is not None else None
+
+    def create_session(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        state: Optional[dict[str, Any]] = None,
+        session_id: Optional[str] = None,
+    ) -> Session:
+        session = Session(
+            id=session_id or str(uuid.uuid4()),
+            app_name=app_name,
+            user_id=user_id,
+            state=state or {},
+            last_update_time=time.time(),
+        )
+        self._save(session)
+        return session
+
+    def get_session(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        session_id: str,
+        config: Optional[GetSessionConfig] = None,
+    ) -> Optional[Session]:
+        session = self._load(self._key(app_name, user_id, session_id))
+        if session is None or config is None:
+            return session
+        if config.num_recent_events:
+            session.events = session.events[-config.num_recent_events:]
+        if config.after_timestamp:
+            session.events = [e for e in session.events if e.timestamp >= config.after_timestamp]
+        return session
+
+    def list_sessions(self, *, app_name: str, user_id: str) -> ListSessionsResponse:
+        sessions = []
+        for key in self._redis.scan_iter(match=self._key(app_name, user_id, "*")):
+            session = self._load(key)
+            if session is not None:
+                session.events = []
+                sessions.append(session)
+        return ListSessionsResponse(sessions=sessions)
+
+    def delete_session(self, *, app_name: str, user_id: str, session_id: str) -> None:
+        self._redis.delete(self._key(app_name, user_id, session_id))
+
+    def list_events(self, *, app_name: str, user_id: str, session_id: str) -> ListEventsResponse:
+        session = self._load(self._key(app_name, user_id, session_id))
+        return ListEventsResponse(events=session.events if session else [])
+
+    def append_event(self, session: Session, event: Event) -> Event:
+        event = super().append_event(session=session, event=event)
+        if event.partial:
+            return event
+        session.last_update_time = event.timestamp
+        self._save(session)
+        return event
+
+
+class RedisMemoryService(BaseMemoryService):
+    """Keyword-search memory storing session events at mem:{app}:{user}:{session_id}"""
+
+    def __init__(self, url: str, ttl: int = DEFAULT_TTL):
+        self._redis = get_redis(url)
+        self.ttl = ttl
+
+    @staticmethod
+    def _key(app_name: str, user_id: str, session_id: str) -> str:
+        return f"mem:{app_name}:{user_id}:{session_id}"
+
+    def add_session_to_memory(self, session: Session):
+        events = [event.model_dump_json() for event in session.events if event.content and event.content.parts]
+        key = self._key(session.app_name, session.user_id, session.id)
+        pipe = self._redis.pipeline()
+        pipe.delete(key)
+        if events:
+            pipe.rpush(key, *events)
+            pipe.expire(key, self.ttl)
+        pipe.execute()
+
+    def search_memory(self, *, app_name: str, user_id: str, query: str) -> SearchMemoryResponse:
+        keywords = set(query.lower().split())
+        response = SearchMemoryResponse()
+        prefix = self._key(app_name, user_id, "")
+        for key in self._redis.scan_iter(match=f"{prefix}*"):
+            matched_events = []
+            for raw in self._redis.lrange(key, 0, -1):
+                event = Event.model_validate_json(raw)
+                text = "\n".join([part.text for part in event.content.parts if part.text]).lower()
+                if any(keyword in text for keyword in keywords):
+                    matched_events.append(event)
+            if matched_events:
+                key = key.decode("utf-8") if isinstance(key, bytes) else key
+                response.memories.append(MemoryResult(session_id=key[len(prefix):], events=matched_events))
+        return response
+
+
+class RedisArtifactService(BaseArtifactService):
+    """Versioned artifacts kept as a Redis list per art:{app}:{user}:{session}:{filename}"""
+
+    def __init__(self, url: str, ttl: int = DEFAULT_TTL):
+        self._redis = get_redis(url)
+        self.ttl = ttl
+
+    @staticmethod
+    def _key(app_name: str, user_id: str, session_id: str, filename: str) -> str:
+        # "user:" artifacts are scoped to the user rather than a single session
+        if filename.startswith("user:"):
+            session_id = "user"
+        return f"art:{app_name}:{user_id}:{session_id}:{filename}"
+
+    def save_artifact(
+        self, *, app_name: str, user_id: str, session_id: str, filename: str, artifact: types.Part
+    ) -> int:
+        key = self._key(app_name, user_id, session_id, filename)
+        pipe = self._redis.pipeline()
+        pipe.rpush(key, artifact.model_dump_json())
+        pipe.expire(key, self.ttl)
+        length, _ = pipe.execute()
+        return length - 1
+
+    def load_artifact(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        session_id: str,
+        filename: str,
+        version: Optional[int] = None,
+    ) -> Optional[types.Part]:
+        key = self._key(app_name, user_id, session_id, filename)
+        data = self._redis.lindex(key, -1 if version is None else version)
+        return types.Part.model_validate_json(data) if data is not None else None
+
+    def list_artifact_keys(self, *, app_name: str, user_id: str, session_id: str) -> list[str]:
+        filenames = set()
+        for scope in (session_id, "user"):
+            prefix = f"art:{app_name}:{user_id}:{scope}:"
+            for key in self._redis.scan_iter(match=f"{prefix}*"):
+                key = key.decode("utf-8") if isinstance(key, bytes) else key
+                filenames.add(key[len(prefix):])
+        return sorted(filenames)
+
+    def delete_artifact(self, *, app_name: str, user_id: str, session_id: str, filename: str) -> None:
+        self._redis.delete(self._key(app_name, user_id, session_id, filename))
+
+    def list_versions(self, *, app_name: str, user_id: str, session_id: str, filename: str) -> list[int]:
+        return list(range(self._redis.llen(self._key(app_name, user_id, session_id, filename))))
+
+
+# (author, role, text) of one remembered message
+_Message = Tuple[str, Optional[str], str]
+
+
+class _TrieNode:
+    """One message in the memory trie; sessions with the same history prefix share nodes"""
+
+    __slots__ = ("parent", "message", "children", "refs")
+
+    def __init__(self, parent: Optional["_TrieNode"], message: Optional[_Message]):
+        self.parent = parent
+        self.message = message
+        self.children: dict[_Message, "_TrieNode"] = {}
+        self.refs = 0
+
+
+class TrieMemoryService(BaseMemoryService):
+    """In-process memory service storing session histories in a message-level prefix trie.
+
+    Sessions that open with the same messages share those trie nodes instead of
+    each holding its own copy. Once stored text passes 80% of budget_mb the least
+    recently added sessions are spilled to SQLite, where they remain searchable.
+    Only the author, role and text of each event are kept.
+
+    Without spill_path the spill file lives in a private (0o700) temp directory
+    owned by this instance and removed on close() or at exit, so no other process
+    or later run can read it. An explicit spill_path is used as given.
+    """
+
+    def __init__(self, budget_mb: int = 256, spill_path: Optional[str] = None):
+        self.budget_bytes = budget_mb * 1024 * 1024
+        self.spill_path = spill_path
+        self._spill_dir: Optional[str] = None
+        self._root = _TrieNode(None, None)
+        self._sessions: "OrderedDict[Tuple[str, str, str], _TrieNode]" = OrderedDict()
+        self._size = 0
+        self._db: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _message(event: Event) -> Optional[_Message]:
+        if not event.content or not event.content.parts:
+            return None
+        text = "\n".join(part.text for part in event.content.parts if part.text)
+        return (event.author, event.content.role, text) if text else None
+
+    @staticmethod
+    def _event(message: _Message) -> Event:
+        author, role, text = message
+        return Event(author=author, content=types.Content(role=role, parts=[types.Part(text=text)]))
+
+    def _path(self, leaf: _TrieNode) -> List[_Message]:
+        messages = []
+        node = leaf
+        while node is not self._root:
+            messages.append(node.message)
+            node = node.parent
+        messages.reverse()
+        return messages
+
+    def _release(self, leaf: Optional[_TrieNode]) -> None:
+        node = leaf
+        while node is not None and node is not self._root:
+            node.refs -= 1
+            if node.refs == 0:
+                del node.parent.children[node.message]
+                self._size -= len(node.message[2])
+            node = node.parent
+
+    def _spill_db(self) -> sqlite3.Connection:
+        if self._db is None:
+            if self.spill_path is None:
+                self._spill_dir = tempfile.mkdtemp(prefix="june_memory_")
+                self.spill_path = os.path.join(self._spill_dir, "memory.sqlite3")
+                atexit.register(self.close)
+            # A configured path may be shared; wait out other writers instead of failing
+            self._db = sqlite3.connect(self.spill_path, timeout=SPILL_BUSY_TIMEOUT, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS memory ("
+                "app_name TEXT, user_id TEXT, session_id TEXT, messages TEXT, "
+                "PRIMARY KEY (app_name, user_id, session_id))"
+            )
+        return self._db
+
+    def close(self) -> None:
+        """Close the spill database, deleting it if this instance created it"""
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+            if self._spill_dir is not None:
+                shutil.rmtree(self._spill_dir, ignore_errors=True)
+                self._spill_dir = None
+                self.spill_path = None
+
+    def _evict(self) -> None:
+        """Spill least recently added sessions until back under 80% of the budget"""
+        limit = 0.8 * self.budget_bytes
+        db = None
+        while self._size > limit and self._sessions:
+            key, leaf = self._sessions.popitem(last=False)
+            db = db or self._spill_db()
+            db.execute(
+                "INSERT OR REPLACE INTO memory VALUES (?, ?, ?, ?)",
+                (*key, serialization.dumps(self._path(leaf))),
+            )
+            self._release(leaf)
+        if db is not None:
+            db.commit()
+            logger.info(f"Spilled cold memory sessions to {self.spill_path}")
+
+    def add_session_to_memory(self, session: Session):
+        messages = [message for message in map(self._message, session.events) if message]
+        key = (session.app_name, session.user_id, session.id)
+        with self._lock:
+            self._release(self._sessions.pop(key, None))
+            if self._db is not None:
+                self._db.execute(
+                    "DELETE FROM memory WHERE app_name = ? AND user_id = ? AND session_id = ?", key
+                )
+                self._db.commit()
+            node = self._root
+            for message in messages:
+                child = node.children.get(message)
+                if child is None:
+                    child = _TrieNode(node, message)
+                    node.children[message] = child
+                    self._size += len(message[2])
+                child.refs += 1
+                node = child
+            self._sessions[key] = node
+            if self._size > 0.8 * self.budget_bytes:
+                self._evict()
+
+    def search_memory(self, *, app_name: str, user_id: str, query: str) -> SearchMemoryResponse:
+        keywords = set(query.lower().split())
+        with self._lock:
+            histories = [
+                (session_id, self._path(leaf))
+                for (app, user, session_id), leaf in self._sessions.items()
+                if app == app_name and user == user_id
+            ]
+            if self._db is not None:
+                rows = self._db.execute(
+                    "SELECT session_id, messages FROM memory WHERE app_name = ? AND user_id = ?",
+                    (app_name, user_id),
+                ).fetchall()
+                histories.extend(
+                    (session_id, [tuple(message) for message in serialization.loads(messages)])
+                    for session_id, messages in rows
+                )
+
+        response = SearchMemoryResponse()
+        for session_id, messages in histories:
+            matched_events = [
+                self._event(message)
+                for message in messages
+                if any(keyword in message[2].lower() for keyword in keywords)
+            ]
+            if matched_events:
+                response.memories.append(MemoryResult(session_id=session_id, events=matched_events))
+        return response
+
+
+def create_adk_services(
+    redis_url: Optional[str] = None,
+    ttl: int = DEFAULT_TTL,
+    memory_budget_mb: Optional[int] = None,
+) -> dict[str, Any]:
+    """Build Runner service kwargs: Redis-backed when redis_url is set, else in-memory.
+
+    With memory_budget_mb the in-memory fallback uses a budgeted TrieMemoryService.
+    """
+    if redis_url:
+        try:
+            return {
+                "artifact_service": RedisArtifactService(redis_url, ttl),
+                "session_service": RedisSessionService(redis_url, ttl),
+                "memory_service": RedisMemoryService(redis_url, ttl),
+            }
+        except Exception as e:
+            logger.warning(f"Redis ADK services unavailable, using in-memory services: {e}")
+    return {
+        "artifact_service": InMemoryArtifactService(),
+        "session_service": InMemorySessionService(),
+        "memory_service": (
+            TrieMemoryService(budget_mb=memory_budget_mb) if memory_budget_mb else InMemoryMemoryService()
+        ),
+    }
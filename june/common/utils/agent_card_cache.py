@@ -0,0 +1,83 @@
+"""
+Disk cache for agent cards.
+A restarted agent reloads its AgentCard from the JSON written on a previous
+boot instead of rebuilding it. Entries live in a per-user directory that only
+its owner can write, and are validated on load like any other input.
+"""
+
+import hashlib
+import logging
+import os
+import stat
+from pathlib import Path
+from typing import Callable, Optional
+
+from common.types import AgentCard
+from . import serialization
+
+logger = logging.getLogger(__name__)
+
+CACHE_DIR = Path(
+    os.getenv("AGENT_CARD_CACHE_DIR")
+    or os.path.join(os.getenv("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"), "june", "cards")
+)
+
+
+def _cache_path(name: str, fingerprint: str) -> Path:
+    key = hashlib.blake2b(f"{name}\x00{fingerprint}".encode("utf-8"), digest_size=16).hexdigest()
+    return CACHE_DIR / f"{key}.json"
+
+
+def _private_dir() -> Optional[Path]:
+    """Create CACHE_DIR as 0o700 and return it, or None if another user could write to it"""
+    CACHE_DIR.mkdir(mode=0o700, parents=True, exist_ok=True)
+    st = os.lstat(CACHE_DIR)
+    owner_ok = not hasattr(os, "getuid") or st.st_uid == os.getuid()
+    if not stat.S_ISDIR(st.st_mode) or not owner_ok or st.st_mode & 0o077:
+        logger.warning(f"Agent card cache {CACHE_DIR} is not a private directory; not caching")
+        return None
+    return CACHE_DIR
+
+
+def _write_private(path: Path, text: str) -> None:
+    """Write text to path via a fresh 0o600 temp file that never follows a symlink"""
+    tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+    flags = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_NOFOLLOW", 0)
+    try:
+        tmp_path.unlink()
+    except FileNotFoundError:
+        pass
+    fd = os.open(tmp_path, flags, 0o600)
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+
+
+def get_card(name: str, builder: Callable[[], AgentCard], fingerprint: str = "") -> AgentCard:
+    """Return the cached card for (name, fingerprint), building and caching it on a miss.
+
+    The fingerprint must change whenever the builder's output would (e.g. host, port,
+    version or skill text), since it is the only thing the cache entry is keyed on.
+    """
+    try:
+        cache_dir = _private_dir()
+    except OSError as e:
+        logger.warning(f"Agent card cache unavailable: {e}")
+        cache_dir = None
+    if cache_dir is None:
+        return builder()
+
+    path = _cache_path(name, fingerprint)
+    try:
+        return AgentCard.model_validate(serialization.loads(path.read_bytes()))
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable agent card cache {path}: {e}")
+
+    card = builder()
+    try:
+        _write_private(path, card.model_dump_json())
+    except OSError as e:
+        logger.warning(f"Could not write agent card cache {path}: {e}")
+    return card
@@ -1,17 +1,24 @@
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Set
 import logging
+from itertools import islice
 from azure.core.credentials import AzureKeyCredential
+from azure.core.exceptions import ResourceNotFoundError
 from azure.search.documents import SearchClient
 from azure.search.documents.indexes import SearchIndexClient
 from azure.search.documents.indexes.models import (
     SearchIndex, SearchField, SearchFieldDataType, SimpleField, SearchableField
 )
-from azure.search.documents.indexes.models import VectorSearchProfile, HnswAlgorithmConfiguration
+from azure.search.documents.indexes.models import (
+    VectorSearch, VectorSearchProfile, HnswAlgorithmConfiguration, HnswParameters,
+    ScalarQuantizationCompression, ScalarQuantizationParameters, RescoringOptions
+)
+from .azure_http import client_kwargs
 
 logger = logging.getLogger(__name__)
 
 class AzureAISearchClient:
-    """Client for Azure AI Search operations including vector search"""
+    """Client for Azure AI Search operations including vector search.
+    Construct once and reuse; instances share a pooled keep-alive transport."""
     
     def __init__(self, endpoint: str, api_key: str, index_name: str = "a2a-documents"):
         self.endpoint = endpoint
@@ -21,11 +28,13 @@ class AzureAISearchClient:
         self.search_client = SearchClient(
             endpoint=endpoint,
             index_name=index_name,
-            credential=self.credential
+            credential=self.credential,
+            **client_kwargs()
         )
         self.index_client = SearchIndexClient(
             endpoint=endpoint,
-            credential=self.credential
+            credential=self.credential,
+            **client_kwargs()
         )
     
     def create_index_if_not_exists(self) -> bool:
@@ -65,20 +74,40 @@ class AzureAISearchClient:
                         vector_search_profile_name="my-vector-config"
                     )
                 ],
-                vector_search_profiles=[
-                    VectorSearchProfile(
-                        name="my-vector-config",
-                        algorithm_configuration=HnswAlgorithmConfiguration(
+                vector_search=VectorSearch(
+                    algorithms=[
+                        HnswAlgorithmConfiguration(
                             name="my-hnsw-config",
-                            parameters={
-                                "m": 4,
-                                "efConstruction": 400,
-                                "efSearch": 500,
-                                "metric": "cosine"
-                            }
+                            parameters=HnswParameters(
+                                # Graph build parameters; they only take effect when the index is created
+                                m=16,
+                                ef_construction=200,
+                                # Candidate list size per vector query; exhaustive=True bypasses HNSW
+                                ef_search=100,
+                                metric="cosine"
+                            )
                         )
-                    )
-                ]
+                    ],
+                    profiles=[
+                        VectorSearchProfile(
+                            name="my-vector-config",
+                            algorithm_configuration_name="my-hnsw-config",
+                            compression_name="sq8"
+                        )
+                    ],
+                    compressions=[
+                        # int8 vectors for candidate retrieval (4x smaller than float32);
+                        # the top hits are rescored against the preserved originals
+                        ScalarQuantizationCompression(
+                            compression_name="sq8",
+                            parameters=ScalarQuantizationParameters(quantized_data_type="int8"),
+                            rescoring_options=RescoringOptions(
+                                enable_rescoring=True,
+                                rescore_storage_method="preserveOriginals"
+                            )
+                        )
+                    ]
+                )
             )
             
             # Create the index
@@ -92,24 +121,36 @@ class AzureAISearchClient:
     
     def index_document(self, document: Dict[str, Any]) -> bool:
         """Index a document with vector embeddings"""
-        try:
-            # Ensure required fields
-            if "id" not in document:
-                logger.error("Document must have an 'id' field")
-                return False
-            
-            # Index the document
-            result = self.search_client.upload_documents([document])
-            if result[0].succeeded:
-                logger.info(f"Successfully indexed document {document['id']}")
-                return True
-            else:
-                logger.error(f"Failed to index document {document['id']}: {result[0].errors}")
-                return False
-                
-        except Exception as e:
-            logger.error(f"Error indexing document: {e}")
-            return False
+        result = self.index_documents([document])
+        return result["succeeded"] == 1
+    
+    def index_documents(self, documents: List[Dict[str, Any]], batch_size: int = 1000) -> Dict[str, int]:
+        """Index documents in bulk, up to batch_size (service max 1000) per request"""
+        succeeded = 0
+        failed = 0
+        
+        valid = [doc for doc in documents if "id" in doc]
+        if len(valid) != len(documents):
+            failed += len(documents) - len(valid)
+            logger.error(f"{len(documents) - len(valid)} documents have no 'id' field")
+        
+        it = iter(valid)
+        while batch := list(islice(it, batch_size)):
+            try:
+                results = self.search_client.upload_documents(batch)
+            except Exception as e:
+                logger.error(f"Error indexing batch of {len(batch)} documents: {e}")
+                failed += len(batch)
+                continue
+            for result in results:
+                if result.succeeded:
+                    succeeded += 1
+                else:
+                    failed += 1
+                    logger.error(f"Failed to index document {result.key}: {result.error_message}")
+        
+        logger.info(f"Indexed {succeeded} documents ({failed} failed)")
+        return {"succeeded": succeeded, "failed": failed}
     
     def search_documents(
         self,
@@ -117,9 +158,11 @@ class AzureAISearchClient:
         vector_embedding: Optional[List[float]] = None,
         filters: Optional[str] = None,
         top: int = 10,
-        include_total_count: bool = True
+        include_total_count: bool = True,
+        exhaustive: bool = False
     ) -> Dict[str, Any]:
-        """Search documents using text and optional vector similarity"""
+        """Search documents using text and optional vector similarity.
+        Pass exhaustive=True for a brute-force vector scan when recall matters more than cost."""
         try:
             search_options = {
                 "top": top,
@@ -135,7 +178,8 @@ class AzureAISearchClient:
                 search_options["vector_queries"] = [{
                     "vector": vector_embedding,
                     "fields": "content_vector",
-                    "k": top
+                    "k": top,
+                    "exhaustive": exhaustive
                 }]
                 search_options["select"] = "id,title,content,summary,document_type,agent_name,created_at,score"
             
@@ -178,6 +222,34 @@ class AzureAISearchClient:
                 "error": str(e)
             }
     
+    def document_exists(self, document_id: str) -> bool:
+        """Check whether a document with this key is already indexed"""
+        try:
+            self.search_client.get_document(key=document_id, selected_fields=["id"])
+            return True
+        except ResourceNotFoundError:
+            return False
+        except Exception as e:
+            logger.error(f"Error checking document {document_id}: {e}")
+            return False
+
+    def existing_document_ids(self, document_ids: List[str]) -> Set[str]:
+        """Return which of these keys are already indexed, using one filtered query"""
+        if not document_ids:
+            return set()
+        try:
+            keys = ",".join(document_id.replace("'", "''") for document_id in document_ids)
+            results = self.search_client.search(
+                search_text="*",
+                filter=f"search.in(id, '{keys}', ',')",
+                select=["id"],
+                top=len(document_ids)
+            )
+            return {result["id"] for result in results}
+        except Exception as e:
+            logger.error(f"Error checking {len(document_ids)} documents: {e}")
+            return set()
+
     def delete_document(self, document_id: str) -> bool:
         """Delete a document from the index"""
         try:
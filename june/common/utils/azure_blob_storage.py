@@ -1,22 +1,57 @@
-from typing import Optional, List, Dict, Any, BinaryIO
+from typing import Optional, List, Dict, Any, BinaryIO, Iterator
+import asyncio
 import logging
 import os
+import threading
+from collections import OrderedDict
+from functools import lru_cache
 from datetime import datetime, timedelta
 from azure.storage.blob import BlobServiceClient, BlobClient, ContainerClient
 from azure.storage.blob import generate_blob_sas, BlobSasPermissions
 from azure.core.exceptions import ResourceExistsError, ResourceNotFoundError
+from .azure_http import client_kwargs
 
 logger = logging.getLogger(__name__)
 
+BLOB_CLIENT_CACHE_SIZE = 1024
+# Parallel range GETs for large downloads
+DOWNLOAD_CONCURRENCY = 4
+
+@lru_cache(maxsize=None)
+def _sas_permissions(permission: str) -> BlobSasPermissions:
+    """Parse a permission string like "rw" once per distinct value"""
+    return BlobSasPermissions(
+        read="r" in permission,
+        write="w" in permission,
+        delete="d" in permission
+    )
+
 class AzureBlobStorageClient:
-    """Client for Azure Blob Storage operations"""
+    """Client for Azure Blob Storage operations.
+    Construct once and reuse; instances share a pooled keep-alive transport."""
     
-    def __init__(self, connection_string: str, container_name: str = "a2a-artifacts"):
+    def __init__(self, connection_string: str, container_name: str = "a2a-artifacts", upload_concurrency: int = 8):
         self.connection_string = connection_string
         self.container_name = container_name
-        self.blob_service_client = BlobServiceClient.from_connection_string(connection_string)
+        self.upload_concurrency = upload_concurrency
+        self.blob_service_client = BlobServiceClient.from_connection_string(connection_string, **client_kwargs())
         self.container_client = self.blob_service_client.get_container_client(container_name)
         
+        # SAS signing inputs don't change for the life of the client
+        self._account_name = self.blob_service_client.account_name
+        self._account_key = getattr(self.blob_service_client.credential, "account_key", None)
+        
+        # BlobClients are reused per blob name; building one parses the URL and
+        # sets up a pipeline
+        self._blob_clients: "OrderedDict[str, BlobClient]" = OrderedDict()
+        self._blob_clients_lock = threading.Lock()
+        
+        # Async clients are created per event loop on first use; an aio client's
+        # connections belong to the loop that opened them
+        self._aio_service_client = None
+        self._aio_container_client = None
+        self._aio_loop = None
+        
         # Ensure container exists
         self._ensure_container_exists()
     
@@ -35,6 +70,20 @@ class AzureBlobStorageClient:
                 logger.error(f"Failed to create container {self.container_name}: {e}")
                 return False
     
+    def _blob_client(self, blob_name: str) -> BlobClient:
+        """Get a cached BlobClient for blob_name"""
+        with self._blob_clients_lock:
+            blob_client = self._blob_clients.get(blob_name)
+            if blob_client is not None:
+                self._blob_clients.move_to_end(blob_name)
+                return blob_client
+        blob_client = self.container_client.get_blob_client(blob_name)
+        with self._blob_clients_lock:
+            self._blob_clients[blob_name] = blob_client
+            while len(self._blob_clients) > BLOB_CLIENT_CACHE_SIZE:
+                self._blob_clients.popitem(last=False)
+        return blob_client
+    
     def upload_file(
         self,
         file_path: str,
@@ -53,15 +102,18 @@ class AzureBlobStorageClient:
                 blob_name = os.path.basename(file_path)
             
             # Get blob client
-            blob_client = self.container_client.get_blob_client(blob_name)
+            blob_client = self._blob_client(blob_name)
             
-            # Upload the file
+            # Upload the file; with a known length the SDK sends small files as a
+            # single PUT and splits large ones into blocks uploaded in parallel
             with open(file_path, "rb") as data:
                 blob_client.upload_blob(
                     data,
+                    length=os.path.getsize(file_path),
                     overwrite=True,
                     metadata=metadata,
-                    content_type=content_type
+                    content_type=content_type,
+                    max_concurrency=self.upload_concurrency
                 )
             
             logger.info(f"Successfully uploaded {file_path} to {blob_name}")
@@ -80,7 +132,7 @@ class AzureBlobStorageClient:
     ) -> bool:
         """Upload data bytes to blob storage"""
         try:
-            blob_client = self.container_client.get_blob_client(blob_name)
+            blob_client = self._blob_client(blob_name)
             
             blob_client.upload_blob(
                 data,
@@ -99,15 +151,15 @@ class AzureBlobStorageClient:
     def download_file(self, blob_name: str, destination_path: str) -> bool:
         """Download a blob to a local file"""
         try:
-            blob_client = self.container_client.get_blob_client(blob_name)
+            blob_client = self._blob_client(blob_name)
             
             # Ensure directory exists
             os.makedirs(os.path.dirname(destination_path), exist_ok=True)
             
-            # Download the blob
+            # Stream straight to disk; memory stays at chunk size
             with open(destination_path, "wb") as download_file:
-                download_stream = blob_client.download_blob()
-                download_file.write(download_stream.readall())
+                download_stream = blob_client.download_blob(max_concurrency=DOWNLOAD_CONCURRENCY)
+                download_stream.readinto(download_file)
             
             logger.info(f"Successfully downloaded {blob_name} to {destination_path}")
             return True
@@ -119,7 +171,7 @@ class AzureBlobStorageClient:
     def download_data(self, blob_name: str) -> Optional[bytes]:
         """Download a blob as bytes"""
         try:
-            blob_client = self.container_client.get_blob_client(blob_name)
+            blob_client = self._blob_client(blob_name)
             download_stream = blob_client.download_blob()
             return download_stream.readall()
             
@@ -127,11 +179,18 @@ class AzureBlobStorageClient:
             logger.error(f"Error downloading {blob_name}: {e}")
             return None
     
+    def download_stream(self, blob_name: str) -> Iterator[bytes]:
+        """Yield a blob's content chunk by chunk without buffering all of it"""
+        download_stream = self._blob_client(blob_name).download_blob()
+        yield from download_stream.chunks()
+    
     def delete_blob(self, blob_name: str) -> bool:
         """Delete a blob from storage"""
         try:
-            blob_client = self.container_client.get_blob_client(blob_name)
+            blob_client = self._blob_client(blob_name)
             blob_client.delete_blob()
+            with self._blob_clients_lock:
+                self._blob_clients.pop(blob_name, None)
             
             logger.info(f"Successfully deleted {blob_name}")
             return True
@@ -179,7 +238,7 @@ class AzureBlobStorageClient:
     def get_blob_properties(self, blob_name: str) -> Optional[Dict[str, Any]]:
         """Get properties of a specific blob"""
         try:
-            blob_client = self.container_client.get_blob_client(blob_name)
+            blob_client = self._blob_client(blob_name)
             properties = blob_client.get_blob_properties()
             
             return {
@@ -204,24 +263,15 @@ class AzureBlobStorageClient:
     ) -> Optional[str]:
         """Generate a SAS URL for a blob"""
         try:
-            blob_client = self.container_client.get_blob_client(blob_name)
-            
-            # Set permissions
-            permissions = BlobSasPermissions()
-            if "r" in permission:
-                permissions.read = True
-            if "w" in permission:
-                permissions.write = True
-            if "d" in permission:
-                permissions.delete = True
+            blob_client = self._blob_client(blob_name)
             
             # Generate SAS token
             sas_token = generate_blob_sas(
-                account_name=blob_client.account_name,
-                container_name=blob_client.container_name,
-                blob_name=blob_client.blob_name,
-                account_key=blob_client.credential.account_key,
-                permission=permissions,
+                account_name=self._account_name,
+                container_name=self.container_name,
+                blob_name=blob_name,
+                account_key=self._account_key,
+                permission=_sas_permissions(permission),
                 expiry=datetime.utcnow() + timedelta(hours=expiry_hours)
             )
             
@@ -240,8 +290,8 @@ class AzureBlobStorageClient:
     ) -> bool:
         """Copy a blob within the same container"""
         try:
-            source_blob = self.container_client.get_blob_client(source_blob_name)
-            destination_blob = self.container_client.get_blob_client(destination_blob_name)
+            source_blob = self._blob_client(source_blob_name)
+            destination_blob = self._blob_client(destination_blob_name)
             
             # Start copy operation
             destination_blob.start_copy_from_url(source_blob.url)
@@ -260,15 +310,13 @@ class AzureBlobStorageClient:
     def get_container_stats(self) -> Dict[str, Any]:
         """Get container statistics"""
         try:
-            # List all blobs to calculate stats
-            blobs = list(self.container_client.list_blobs())
-            
-            total_size = sum(blob.size for blob in blobs)
-            total_count = len(blobs)
-            
-            # Group by content type
-            content_types = {}
-            for blob in blobs:
+            # Aggregate while paging through the listing; blobs are never held in memory
+            total_size = 0
+            total_count = 0
+            content_types: Dict[str, int] = {}
+            for blob in self.container_client.list_blobs():
+                total_size += blob.size
+                total_count += 1
                 content_type = blob.content_settings.content_type or "unknown"
                 content_types[content_type] = content_types.get(content_type, 0) + 1
             
@@ -283,3 +331,202 @@ class AzureBlobStorageClient:
         except Exception as e:
             logger.error(f"Error getting container stats: {e}")
             return {}
+    
+    # Async variants: operations on the aio client can overlap instead of
+    # blocking the event loop for a full round trip each
+    
+    def _aio_container(self):
+        """Get the async container client for the running loop, creating it on first use"""
+        loop = asyncio.get_running_loop()
+        if self._aio_container_client is None or self._aio_loop is not loop:
+            from azure.storage.blob.aio import BlobServiceClient as AsyncBlobServiceClient
+            
+            # A client left by an earlier loop cannot be awaited from this one;
+            # that loop's shutdown already tore down its connections
+            self._aio_service_client = AsyncBlobServiceClient.from_connection_string(self.connection_string)
+            self._aio_container_client = self._aio_service_client.get_container_client(self.container_name)
+            self._aio_loop = loop
+        return self._aio_container_client
+    
+    async def aclose(self) -> None:
+        """Close the async client and its connection pool"""
+        if self._aio_service_client is not None and self._aio_loop is asyncio.get_running_loop():
+            await self._aio_service_client.close()
+        self._aio_service_client = None
+        self._aio_container_client = None
+        self._aio_loop = None
+    
+    async def upload_file_async(
+        self,
+        file_path: str,
+        blob_name: Optional[str] = None,
+        metadata: Optional[Dict[str, str]] = None,
+        content_type: Optional[str] = None
+    ) -> Optional[str]:
+        """Upload a file to blob storage without blocking the event loop"""
+        try:
+            if not os.path.exists(file_path):
+                logger.error(f"File {file_path} does not exist")
+                return None
+            
+            if not blob_name:
+                blob_name = os.path.basename(file_path)
+            
+            blob_client = self._aio_container().get_blob_client(blob_name)
+            with open(file_path, "rb") as data:
+                await blob_client.upload_blob(
+                    data,
+                    length=os.path.getsize(file_path),
+                    overwrite=True,
+                    metadata=metadata,
+                    content_type=content_type,
+                    max_concurrency=self.upload_concurrency
+                )
+            
+            logger.info(f"Successfully uploaded {file_path} to {blob_name}")
+            return blob_name
+            
+        except Exception as e:
+            logger.error(f"Error uploading file {file_path}: {e}")
+            return None
+    
+    async def upload_many(self, file_paths: List[str]) -> List[Optional[str]]:
+        """Upload several files concurrently"""
+        return await asyncio.gather(*(self.upload_file_async(path) for path in file_paths))
+    
+    async def upload_data_async(
+        self,
+        data: bytes,
+        blob_name: str,
+        metadata: Optional[Dict[str, str]] = None,
+        content_type: Optional[str] = None
+    ) -> bool:
+        """Upload data bytes to blob storage without blocking the event loop"""
+        try:
+            blob_client = self._aio_container().get_blob_client(blob_name)
+            await blob_client.upload_blob(
+                data,
+                overwrite=True,
+                metadata=metadata,
+                content_type=content_type
+            )
+            
+            logger.info(f"Successfully uploaded data to {blob_name}")
+            return True
+            
+        except Exception as e:
+            logger.error(f"Error uploading data to {blob_name}: {e}")
+            return False
+    
+    async def download_file_async(self, blob_name: str, destination_path: str) -> bool:
+        """Download a blob to a local file without blocking the event loop"""
+        try:
+            blob_client = self._aio_container().get_blob_client(blob_name)
+            os.makedirs(os.path.dirname(destination_path), exist_ok=True)
+            
+            download_stream = await blob_client.download_blob()
+            with open(destination_path, "wb") as download_file:
+                async for chunk in download_stream.chunks():
+                    download_file.write(chunk)
+            
+            logger.info(f"Successfully downloaded {blob_name} to {destination_path}")
+            return True
+            
+        except Exception as e:
+            logger.error(f"Error downloading {blob_name}: {e}")
+            return False
+    
+    async def download_data_async(self, blob_name: str) -> Optional[bytes]:
+        """Download a blob as bytes without blocking the event loop"""
+        try:
+            blob_client = self._aio_container().get_blob_client(blob_name)
+            download_stream = await blob_client.download_blob()
+            return await download_stream.readall()
+            
+        except Exception as e:
+            logger.error(f"Error downloading {blob_name}: {e}")
+            return None
+    
+    async def delete_blob_async(self, blob_name: str) -> bool:
+        """Delete a blob without blocking the event loop"""
+        try:
+            await self._aio_container().get_blob_client(blob_name).delete_blob()
+            
+            logger.info(f"Successfully deleted {blob_name}")
+            return True
+            
+        except Exception as e:
+            logger.error(f"Error deleting {blob_name}: {e}")
+            return False
+    
+    async def get_blob_properties_async(self, blob_name: str) -> Optional[Dict[str, Any]]:
+        """Get properties of a specific blob without blocking the event loop"""
+        try:
+            properties = await self._aio_container().get_blob_client(blob_name).get_blob_properties()
+            
+            return {
+                "name": properties.name,
+                "size": properties.size,
+                "created": properties.creation_time,
+                "last_modified": properties.last_modified,
+                "content_type": properties.content_settings.content_type,
+                "etag": properties.etag,
+                "metadata": properties.metadata
+            }
+            
+        except Exception as e:
+            logger.error(f"Error getting properties for {blob_name}: {e}")
+            return None
+    
+    async def list_blobs_async(
+        self,
+        name_starts_with: Optional[str] = None,
+        include_metadata: bool = True
+    ) -> List[Dict[str, Any]]:
+        """List blobs in the container without blocking the event loop"""
+        try:
+            blobs = []
+            async for blob in self._aio_container().list_blobs(name_starts_with=name_starts_with):
+                blob_info = {
+                    "name": blob.name,
+                    "size": blob.size,
+                    "created": blob.creation_time,
+                    "last_modified": blob.last_modified,
+                    "content_type": blob.content_settings.content_type,
+                    "etag": blob.etag
+                }
+                
+                if include_metadata and blob.metadata:
+                    blob_info["metadata"] = blob.metadata
+                
+                blobs.append(blob_info)
+            
+            return blobs
+            
+        except Exception as e:
+            logger.error(f"Error listing blobs: {e}")
+            return []
+    
+    async def copy_blob_async(
+        self,
+        source_blob_name: str,
+        destination_blob_name: str,
+        metadata: Optional[Dict[str, str]] = None
+    ) -> bool:
+        """Copy a blob within the same container without blocking the event loop"""
+        try:
+            container = self._aio_container()
+            source_blob = container.get_blob_client(source_blob_name)
+            destination_blob = container.get_blob_client(destination_blob_name)
+            
+            await destination_blob.start_copy_from_url(source_blob.url)
+            
+            if metadata:
+                await destination_blob.set_blob_metadata(metadata)
+            
+            logger.info(f"Successfully copied {source_blob_name} to {destination_blob_name}")
+            return True
+            
+        except Exception as e:
+            logger.error(f"Error copying blob {source_blob_name}: {e}")
+            return False
@@ -0,0 +1,44 @@
+"""
+Shared HTTP transport for the sync Azure SDK clients.
+Every client built with these kwargs draws from one keep-alive connection pool,
+so repeated calls (and additional client instances) skip the TCP/TLS handshake.
+"""
+
+import threading
+from typing import Any, Dict
+
+import requests
+from requests.adapters import HTTPAdapter
+from azure.core.pipeline.transport import RequestsTransport
+
+POOL_CONNECTIONS = 32
+POOL_MAXSIZE = 64
+RETRY_TOTAL = 3
+RETRY_BACKOFF_FACTOR = 0.3
+
+_transport = None
+_transport_lock = threading.Lock()
+
+
+def shared_transport() -> RequestsTransport:
+    """Return the process-wide transport, creating its session on first use"""
+    global _transport
+    if _transport is None:
+        with _transport_lock:
+            if _transport is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                # session_owner=False: closing one client must not close the pool for the rest
+                _transport = RequestsTransport(session=session, session_owner=False)
+    return _transport
+
+
+def client_kwargs() -> Dict[str, Any]:
+    """Keyword arguments for sync Azure client constructors"""
+    return {
+        "transport": shared_transport(),
+        "retry_total": RETRY_TOTAL,
+        "retry_backoff_factor": RETRY_BACKOFF_FACTOR,
+    }
@@ -1,27 +1,282 @@
-from typing import Optional, Dict, Any, List, Callable
+from typing import Optional, Dict, Any, List, Callable, Iterator, AsyncIterator, Mapping, Tuple, Union
+import atexit
 import logging
 import json
 import asyncio
+import queue
+import threading
+from contextlib import asynccontextmanager, contextmanager
+from dataclasses import dataclass
 from datetime import datetime, timedelta
-from azure.servicebus import ServiceBusClient, ServiceBusMessage, ServiceBusReceiver
+from types import MappingProxyType
+from azure.servicebus import ServiceBusClient, ServiceBusMessage, ServiceBusReceiver, ServiceBusSender, ServiceBusReceiveMode
+from azure.servicebus.aio import ServiceBusClient as AioServiceBusClient
+from azure.servicebus.amqp import AmqpMessageBodyType
 from azure.servicebus.management import ServiceBusAdministrationClient
 from azure.servicebus.management import QueueProperties, TopicProperties, SubscriptionProperties
 from azure.servicebus.exceptions import ServiceBusError, ServiceBusConnectionError
 
 logger = logging.getLogger(__name__)
 
+# Shared read-only metadata for messages sent without application properties
+_NO_PROPERTIES: Mapping[Any, Any] = MappingProxyType({})
+
+@dataclass(slots=True)
+class ReceivedMsg:
+    """A received message, copied out of the SDK object before it is settled.
+    metadata is the SDK's application-properties mapping itself, not a copy;
+    copy it before mutating."""
+    body_bytes: bytes
+    message_id: Optional[str]
+    session_id: Optional[str]
+    metadata: Mapping[Any, Any]
+    enqueued_time: Optional[datetime]
+    expires_at: Optional[datetime]
+    
+    @property
+    def body(self) -> str:
+        """Body decoded as UTF-8; binary payloads should read body_bytes"""
+        return self.body_bytes.decode("utf-8")
+
+def _body_bytes(msg) -> bytes:
+    """Raw message body. Data bodies arrive as a generator of byte sections;
+    value bodies (sent by other AMQP clients) are stringified."""
+    body = msg.body
+    if isinstance(body, bytes):
+        return body
+    if isinstance(body, str):
+        return body.encode("utf-8")
+    if msg.body_type == AmqpMessageBodyType.DATA:
+        return b"".join(body)
+    return str(body).encode("utf-8")
+
+def _received(msg) -> ReceivedMsg:
+    """Copy the fields callers use out of an SDK message"""
+    return ReceivedMsg(
+        _body_bytes(msg),
+        msg.message_id,
+        msg.session_id,
+        msg.application_properties or _NO_PROPERTIES,
+        msg.enqueued_time_utc,
+        msg.expires_at_utc
+    )
+
+# Sync SDK clients shared per (class, connection string): every
+# AzureServiceBusClient for a namespace rides one AMQP connection / HTTP pool
+_shared_clients: Dict[Tuple[type, str], Any] = {}
+_shared_clients_lock = threading.Lock()
+
+def _shared_client(client_cls: type, connection_string: str) -> Any:
+    """Process-wide client_cls instance for connection_string, created on first use"""
+    key = (client_cls, connection_string)
+    client = _shared_clients.get(key)
+    if client is None:
+        with _shared_clients_lock:
+            client = _shared_clients.get(key)
+            if client is None:
+                client = client_cls.from_connection_string(connection_string)
+                _shared_clients[key] = client
+    return client
+
+def _close_shared_clients() -> None:
+    """Close the shared clients; registered at import, so it runs after instances close"""
+    with _shared_clients_lock:
+        clients = list(_shared_clients.values())
+        _shared_clients.clear()
+    for client in clients:
+        try:
+            client.close()
+        except Exception as e:
+            logger.warning(f"Error closing Service Bus client: {e}")
+
+atexit.register(_close_shared_clients)
+
+def _sender_spec(client, queue_or_topic_name: str, is_topic: bool) -> Tuple[tuple, Callable[[], Any]]:
+    """Cache key and factory for a sender; works for the sync and aio clients"""
+    if is_topic:
+        return (queue_or_topic_name, True), lambda: client.get_topic_sender(topic_name=queue_or_topic_name)
+    return (queue_or_topic_name, False), lambda: client.get_queue_sender(queue_name=queue_or_topic_name)
+
+def _receiver_spec(
+    client,
+    queue_or_topic_name: str,
+    subscription_name: Optional[str],
+    is_topic: bool,
+    prefetch_count: int,
+    receive_and_delete: bool = False
+) -> Tuple[tuple, Callable[[], Any]]:
+    """Cache key and factory for a queue or subscription receiver.
+    Receive mode is fixed when the link opens, so it is part of the key. Prefetch is
+    too, but each client uses one prefetch_count for every link, so it is left out:
+    one receiver per entity and mode, never a second link competing for messages."""
+    receive_mode = ServiceBusReceiveMode.RECEIVE_AND_DELETE if receive_and_delete else ServiceBusReceiveMode.PEEK_LOCK
+    if is_topic and subscription_name:
+        key = (queue_or_topic_name, subscription_name, receive_and_delete)
+        return key, lambda: client.get_subscription_receiver(
+            topic_name=queue_or_topic_name,
+            subscription_name=subscription_name,
+            prefetch_count=prefetch_count,
+            receive_mode=receive_mode
+        )
+    key = (queue_or_topic_name, None, receive_and_delete)
+    return key, lambda: client.get_queue_receiver(
+        queue_name=queue_or_topic_name,
+        prefetch_count=prefetch_count,
+        receive_mode=receive_mode
+    )
+
+def _to_service_bus_message(msg: Dict[str, Any]) -> ServiceBusMessage:
+    """Build a ServiceBusMessage from a send_batch_messages entry"""
+    return ServiceBusMessage(
+        body=msg.get("body", ""),
+        application_properties=msg.get("metadata", {}),
+        session_id=msg.get("session_id"),
+        scheduled_enqueue_time=msg.get("scheduled_time")
+    )
+
 class AzureServiceBusClient:
-    """Client for Azure Service Bus operations"""
+    """Client for Azure Service Bus operations.
+    Senders and receivers are opened once per entity and reused, so each AMQP
+    link is set up once rather than per call. Call close() (or use the client
+    as a context manager) to release them; they are also closed at exit. The
+    underlying connection is shared by every client for the same connection
+    string and stays open until the process exits.
     
-    def __init__(self, connection_string: str):
+    Receivers prefetch up to prefetch_count messages into a local buffer, so
+    later receives are served without a broker round trip. prefetch_count is
+    fixed per client: receive_message and receive_messages share one link per
+    entity and receive mode. Prefetched messages are already locked: ones that
+    sit in the buffer past the queue's lock duration are redelivered (delivery
+    stays at-least-once), so keep prefetch_count near what a caller drains
+    within that window.
+    
+    receive_and_delete=True trades at-least-once for at-most-once delivery:
+    the broker removes messages as it hands them out, so there is no
+    settlement round trip per message, but a crash (or a close with messages
+    still prefetched) loses them.
+    
+    In peek-lock mode receive_messages hands settlement to a background
+    thread and returns as soon as the messages are copied out. At most
+    prefetch_count completions are queued; beyond that receive_messages waits,
+    which bounds how long a received message's lock can go unsettled."""
+    
+    def __init__(self, connection_string: str, prefetch_count: int = 50):
         self.connection_string = connection_string
-        self.client = ServiceBusClient.from_connection_string(connection_string)
-        self.admin_client = ServiceBusAdministrationClient.from_connection_string(connection_string)
+        self.prefetch_count = prefetch_count
+        self.client = _shared_client(ServiceBusClient, connection_string)
+        self.admin_client = _shared_client(ServiceBusAdministrationClient, connection_string)
+        
+        # Cached handlers with a lock each; a handler is not safe for
+        # concurrent use from several threads
+        self._senders: Dict[tuple, Tuple[ServiceBusSender, threading.Lock]] = {}
+        self._receivers: Dict[tuple, Tuple[ServiceBusReceiver, threading.Lock]] = {}
+        self._handlers_lock = threading.Lock()
+        
+        # (receiver key, receiver, message) awaiting complete_message; None stops the worker
+        self._completions: "queue.Queue[Optional[tuple]]" = queue.Queue(maxsize=max(prefetch_count, 1))
+        self._completion_thread: Optional[threading.Thread] = None
+        atexit.register(self.close)
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+    
+    def close(self) -> None:
+        """Settle pending completions, then close cached senders/receivers"""
+        with self._handlers_lock:
+            worker, self._completion_thread = self._completion_thread, None
+        if worker is not None:
+            self._completions.put(None)
+            worker.join()
+        with self._handlers_lock:
+            handlers = list(self._senders.values()) + list(self._receivers.values())
+            self._senders.clear()
+            self._receivers.clear()
+        for handler, _ in handlers:
+            try:
+                handler.close()
+            except Exception as e:
+                logger.warning(f"Error closing Service Bus handler: {e}")
+    
+    @contextmanager
+    def _handler(self, cache: Dict[tuple, tuple], key: tuple, factory: Callable[[], Any]) -> Iterator[Any]:
+        """Hold the cached handler for key, opening it on first use.
+        A handler that raised is closed and dropped so the next call reopens the link."""
+        entry = cache.get(key)
+        if entry is None:
+            with self._handlers_lock:
+                entry = cache.get(key)
+                if entry is None:
+                    entry = (factory(), threading.Lock())
+                    cache[key] = entry
+        handler, lock = entry
+        with lock:
+            try:
+                yield handler
+            except Exception:
+                with self._handlers_lock:
+                    if cache.get(key) is entry:
+                        del cache[key]
+                try:
+                    handler.close()
+                except Exception:
+                    pass
+                raise
+    
+    def _complete_later(self, key: tuple, receiver: ServiceBusReceiver, messages: List[Any]) -> None:
+        """Queue messages for completion on the background thread"""
+        if self._completion_thread is None:
+            with self._handlers_lock:
+                if self._completion_thread is None:
+                    self._completion_thread = threading.Thread(
+                        target=self._complete_messages, name="servicebus-complete", daemon=True
+                    )
+                    self._completion_thread.start()
+        for msg in messages:
+            self._completions.put((key, receiver, msg))
+    
+    def _complete_messages(self) -> None:
+        """Completion worker: settles queued messages under their receiver's lock"""
+        while True:
+            item = self._completions.get()
+            if item is None:
+                return
+            key, receiver, msg = item
+            entry = self._receivers.get(key)
+            if entry is None or entry[0] is not receiver:
+                # The link was closed; the lock lapses and the message is redelivered
+                logger.warning(f"Receiver for {key[0]} closed before message {msg.message_id} was completed")
+                continue
+            try:
+                with entry[1]:
+                    receiver.complete_message(msg)
+            except Exception as e:
+                logger.error(f"Error completing message {msg.message_id} from {key[0]}: {e}")
+    
+    def _sender(self, queue_or_topic_name: str, is_topic: bool):
+        """Cached sender for a queue or topic"""
+        key, factory = _sender_spec(self.client, queue_or_topic_name, is_topic)
+        return self._handler(self._senders, key, factory)
+    
+    def _receiver(
+        self,
+        queue_or_topic_name: str,
+        subscription_name: Optional[str],
+        is_topic: bool,
+        receive_and_delete: bool = False
+    ):
+        """Cached receiver for a queue or topic subscription"""
+        key, factory = _receiver_spec(
+            self.client, queue_or_topic_name, subscription_name, is_topic, self.prefetch_count, receive_and_delete
+        )
+        return self._handler(self._receivers, key, factory)
     
     def send_message(
         self,
         queue_or_topic_name: str,
-        message_body: str,
+        message_body: Union[str, bytes],
         message_metadata: Optional[Dict[str, str]] = None,
         session_id: Optional[str] = None,
         scheduled_enqueue_time: Optional[datetime] = None,
@@ -29,26 +284,14 @@ class AzureServiceBusClient:
     ) -> bool:
         """Send a message to a queue or topic"""
         try:
-            if is_topic:
-                # Send to topic
-                with self.client.get_topic_sender(topic_name=queue_or_topic_name) as sender:
-                    message = ServiceBusMessage(
-                        body=message_body,
-                        application_properties=message_metadata or {},
-                        session_id=session_id,
-                        scheduled_enqueue_time=scheduled_enqueue_time
-                    )
-                    sender.send_messages(message)
-            else:
-                # Send to queue
-                with self.client.get_queue_sender(queue_name=queue_or_topic_name) as sender:
-                    message = ServiceBusMessage(
-                        body=message_body,
-                        application_properties=message_metadata or {},
-                        session_id=session_id,
-                        scheduled_enqueue_time=scheduled_enqueue_time
-                    )
-                    sender.send_messages(message)
+            message = ServiceBusMessage(
+                body=message_body,
+                application_properties=message_metadata or {},
+                session_id=session_id,
+                scheduled_enqueue_time=scheduled_enqueue_time
+            )
+            with self._sender(queue_or_topic_name, is_topic) as sender:
+                sender.send_messages(message)
             
             logger.info(f"Successfully sent message to {'topic' if is_topic else 'queue'} {queue_or_topic_name}")
             return True
@@ -63,82 +306,52 @@ class AzureServiceBusClient:
         messages: List[Dict[str, Any]],
         is_topic: bool = False
     ) -> int:
-        """Send multiple messages in a batch"""
+        """Send multiple messages, packed into as few size-limited batches as possible"""
+        sent = 0
         try:
-            if is_topic:
-                with self.client.get_topic_sender(topic_name=queue_or_topic_name) as sender:
-                    service_bus_messages = []
-                    for msg in messages:
-                        service_bus_messages.append(ServiceBusMessage(
-                            body=msg.get("body", ""),
-                            application_properties=msg.get("metadata", {}),
-                            session_id=msg.get("session_id"),
-                            scheduled_enqueue_time=msg.get("scheduled_time")
-                        ))
-                    sender.send_messages(service_bus_messages)
-            else:
-                with self.client.get_queue_sender(queue_name=queue_or_topic_name) as sender:
-                    service_bus_messages = []
-                    for msg in messages:
-                        service_bus_messages.append(ServiceBusMessage(
-                            body=msg.get("body", ""),
-                            application_properties=msg.get("metadata", {}),
-                            session_id=msg.get("session_id"),
-                            scheduled_enqueue_time=msg.get("scheduled_time")
-                        ))
-                    sender.send_messages(service_bus_messages)
-            
-            logger.info(f"Successfully sent {len(messages)} messages to {'topic' if is_topic else 'queue'} {queue_or_topic_name}")
-            return len(messages)
+            with self._sender(queue_or_topic_name, is_topic) as sender:
+                batch = sender.create_message_batch()
+                for msg in messages:
+                    message = _to_service_bus_message(msg)
+                    try:
+                        batch.add_message(message)
+                    except ValueError:
+                        # Batch is full: flush it and start the next one
+                        if not len(batch):
+                            raise
+                        sender.send_messages(batch)
+                        sent += len(batch)
+                        batch = sender.create_message_batch()
+                        batch.add_message(message)
+                if len(batch):
+                    sender.send_messages(batch)
+                    sent += len(batch)
+            
+            logger.info(f"Successfully sent {sent} messages to {'topic' if is_topic else 'queue'} {queue_or_topic_name}")
+            return sent
             
         except Exception as e:
             logger.error(f"Error sending batch messages to {queue_or_topic_name}: {e}")
-            return 0
+            return sent
     
     def receive_message(
         self,
         queue_or_topic_name: str,
         subscription_name: Optional[str] = None,
         max_wait_time: int = 30,
-        is_topic: bool = False
-    ) -> Optional[Dict[str, Any]]:
+        is_topic: bool = False,
+        receive_and_delete: bool = False
+    ) -> Optional[ReceivedMsg]:
         """Receive a single message from a queue or topic subscription"""
         try:
-            if is_topic and subscription_name:
-                # Receive from topic subscription
-                with self.client.get_subscription_receiver(
-                    topic_name=queue_or_topic_name,
-                    subscription_name=subscription_name
-                ) as receiver:
-                    message = receiver.receive_messages(max_message_count=1, max_wait_time=max_wait_time)
-                    if message:
-                        msg = message[0]
-                        result = {
-                            "body": str(msg.body),
-                            "message_id": msg.message_id,
-                            "session_id": msg.session_id,
-                            "metadata": dict(msg.application_properties),
-                            "enqueued_time": msg.enqueued_time_utc,
-                            "expires_at": msg.expires_at_utc
-                        }
+            with self._receiver(queue_or_topic_name, subscription_name, is_topic, receive_and_delete) as receiver:
+                message = receiver.receive_messages(max_message_count=1, max_wait_time=max_wait_time)
+                if message:
+                    msg = message[0]
+                    result = _received(msg)
+                    if not receive_and_delete:
                         receiver.complete_message(msg)
-                        return result
-            else:
-                # Receive from queue
-                with self.client.get_queue_receiver(queue_name=queue_or_topic_name) as receiver:
-                    message = receiver.receive_messages(max_message_count=1, max_wait_time=max_wait_time)
-                    if message:
-                        msg = message[0]
-                        result = {
-                            "body": str(msg.body),
-                            "message_id": msg.message_id,
-                            "session_id": msg.session_id,
-                            "metadata": dict(msg.application_properties),
-                            "enqueued_time": msg.enqueued_time_utc,
-                            "expires_at": msg.expires_at_utc
-                        }
-                        receiver.complete_message(msg)
-                        return result
+                    return result
             
             return None
             
@@ -152,49 +365,25 @@ class AzureServiceBusClient:
         subscription_name: Optional[str] = None,
         max_messages: int = 10,
         max_wait_time: int = 30,
-        is_topic: bool = False
-    ) -> List[Dict[str, Any]]:
+        is_topic: bool = False,
+        receive_and_delete: bool = False
+    ) -> List[ReceivedMsg]:
         """Receive multiple messages from a queue or topic subscription"""
         try:
             messages = []
             
-            if is_topic and subscription_name:
-                # Receive from topic subscription
-                with self.client.get_subscription_receiver(
-                    topic_name=queue_or_topic_name,
-                    subscription_name=subscription_name
-                ) as receiver:
-                    received_messages = receiver.receive_messages(
-                        max_message_count=max_messages,
-                        max_wait_time=max_wait_time
-                    )
-                    for msg in received_messages:
-                        messages.append({
-                            "body": str(msg.body),
-                            "message_id": msg.message_id,
-                            "session_id": msg.session_id,
-                            "metadata": dict(msg.application_properties),
-                            "enqueued_time": msg.enqueued_time_utc,
-                            "expires_at": msg.expires_at_utc
-                        })
-                        receiver.complete_message(msg)
-            else:
-                # Receive from queue
-                with self.client.get_queue_receiver(queue_name=queue_or_topic_name) as receiver:
-                    received_messages = receiver.receive_messages(
-                        max_message_count=max_messages,
-                        max_wait_time=max_wait_time
-                    )
-                    for msg in received_messages:
-                        messages.append({
-                            "body": str(msg.body),
-                            "message_id": msg.message_id,
-                            "session_id": msg.session_id,
-                            "metadata": dict(msg.application_properties),
-                            "enqueued_time": msg.enqueued_time_utc,
-                            "expires_at": msg.expires_at_utc
-                        })
-                        receiver.complete_message(msg)
+            key, factory = _receiver_spec(
+                self.client, queue_or_topic_name, subscription_name, is_topic, self.prefetch_count, receive_and_delete
+            )
+            with self._handler(self._receivers, key, factory) as receiver:
+                received_messages = receiver.receive_messages(
+                    max_message_count=max_messages,
+                    max_wait_time=max_wait_time
+                )
+                messages = [_received(msg) for msg in received_messages]
+            # Queued outside the receiver lock, which the worker needs to settle
+            if received_messages and not receive_and_delete:
+                self._complete_later(key, receiver, received_messages)
             
             logger.info(f"Received {len(messages)} messages from {'topic' if is_topic else 'queue'} {queue_or_topic_name}")
             return messages
@@ -353,3 +542,194 @@ class AzureServiceBusClient:
         except Exception as e:
             logger.error(f"Error getting queue stats for {queue_name}: {e}")
             return None
+
+
+class AsyncAzureServiceBusClient:
+    """Async Service Bus client on azure.servicebus.aio.
+    Operations on different entities can be awaited concurrently (e.g. with
+    asyncio.gather) over one AMQP connection instead of blocking a thread per
+    round trip. Handler caching, prefetch_count and receive_and_delete work as
+    in AzureServiceBusClient."""
+    
+    def __init__(self, connection_string: str, prefetch_count: int = 50):
+        self.connection_string = connection_string
+        self.prefetch_count = prefetch_count
+        self.client = AioServiceBusClient.from_connection_string(connection_string)
+        
+        # Handlers are not coroutine-safe, so each is guarded by its own lock
+        self._senders: Dict[tuple, Tuple[Any, asyncio.Lock]] = {}
+        self._receivers: Dict[tuple, Tuple[Any, asyncio.Lock]] = {}
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, *exc_info):
+        await self.close()
+    
+    async def close(self) -> None:
+        """Close cached senders/receivers and the underlying connection"""
+        handlers = list(self._senders.values()) + list(self._receivers.values())
+        self._senders.clear()
+        self._receivers.clear()
+        for handler, _ in handlers:
+            try:
+                await handler.close()
+            except Exception as e:
+                logger.warning(f"Error closing Service Bus handler: {e}")
+        try:
+            await self.client.close()
+        except Exception as e:
+            logger.warning(f"Error closing Service Bus client: {e}")
+    
+    @asynccontextmanager
+    async def _handler(self, cache: Dict[tuple, tuple], key: tuple, factory: Callable[[], Any]) -> AsyncIterator[Any]:
+        """Hold the cached handler for key, opening it on first use"""
+        entry = cache.get(key)
+        if entry is None:
+            # No await between the lookup and the insert, so no other task can race it
+            entry = (factory(), asyncio.Lock())
+            cache[key] = entry
+        handler, lock = entry
+        async with lock:
+            try:
+                yield handler
+            except Exception:
+                if cache.get(key) is entry:
+                    del cache[key]
+                try:
+                    await handler.close()
+                except Exception:
+                    pass
+                raise
+    
+    def _sender(self, queue_or_topic_name: str, is_topic: bool):
+        key, factory = _sender_spec(self.client, queue_or_topic_name, is_topic)
+        return self._handler(self._senders, key, factory)
+    
+    def _receiver(
+        self,
+        queue_or_topic_name: str,
+        subscription_name: Optional[str],
+        is_topic: bool,
+        receive_and_delete: bool = False
+    ):
+        key, factory = _receiver_spec(
+            self.client, queue_or_topic_name, subscription_name, is_topic, self.prefetch_count, receive_and_delete
+        )
+        return self._handler(self._receivers, key, factory)
+    
+    async def send_message(
+        self,
+        queue_or_topic_name: str,
+        message_body: Union[str, bytes],
+        message_metadata: Optional[Dict[str, str]] = None,
+        session_id: Optional[str] = None,
+        scheduled_enqueue_time: Optional[datetime] = None,
+        is_topic: bool = False
+    ) -> bool:
+        """Send a message to a queue or topic"""
+        try:
+            message = ServiceBusMessage(
+                body=message_body,
+                application_properties=message_metadata or {},
+                session_id=session_id,
+                scheduled_enqueue_time=scheduled_enqueue_time
+            )
+            async with self._sender(queue_or_topic_name, is_topic) as sender:
+                await sender.send_messages(message)
+            
+            logger.info(f"Successfully sent message to {'topic' if is_topic else 'queue'} {queue_or_topic_name}")
+            return True
+            
+        except Exception as e:
+            logger.error(f"Error sending message to {queue_or_topic_name}: {e}")
+            return False
+    
+    async def send_batch_messages(
+        self,
+        queue_or_topic_name: str,
+        messages: List[Dict[str, Any]],
+        is_topic: bool = False
+    ) -> int:
+        """Send multiple messages, packed into as few size-limited batches as possible"""
+        sent = 0
+        try:
+            async with self._sender(queue_or_topic_name, is_topic) as sender:
+                batch = await sender.create_message_batch()
+                for msg in messages:
+                    message = _to_service_bus_message(msg)
+                    try:
+                        batch.add_message(message)
+                    except ValueError:
+                        # Batch is full: flush it and start the next one
+                        if not len(batch):
+                            raise
+                        await sender.send_messages(batch)
+                        sent += len(batch)
+                        batch = await sender.create_message_batch()
+                        batch.add_message(message)
+                if len(batch):
+                    await sender.send_messages(batch)
+                    sent += len(batch)
+            
+            logger.info(f"Successfully sent {sent} messages to {'topic' if is_topic else 'queue'} {queue_or_topic_name}")
+            return sent
+            
+        except Exception as e:
+            logger.error(f"Error sending batch messages to {queue_or_topic_name}: {e}")
+            return sent
+    
+    async def receive_message(
+        self,
+        queue_or_topic_name: str,
+        subscription_name: Optional[str] = None,
+        max_wait_time: int = 30,
+        is_topic: bool = False,
+        receive_and_delete: bool = False
+    ) -> Optional[ReceivedMsg]:
+        """Receive a single message from a queue or topic subscription"""
+        try:
+            async with self._receiver(queue_or_topic_name, subscription_name, is_topic, receive_and_delete) as receiver:
+                message = await receiver.receive_messages(max_message_count=1, max_wait_time=max_wait_time)
+                if message:
+                    msg = message[0]
+                    result = _received(msg)
+                    if not receive_and_delete:
+                        await receiver.complete_message(msg)
+                    return result
+            
+            return None
+            
+        except Exception as e:
+            logger.error(f"Error receiving message from {queue_or_topic_name}: {e}")
+            return None
+    
+    async def receive_messages(
+        self,
+        queue_or_topic_name: str,
+        subscription_name: Optional[str] = None,
+        max_messages: int = 10,
+        max_wait_time: int = 30,
+        is_topic: bool = False,
+        receive_and_delete: bool = False
+    ) -> List[ReceivedMsg]:
+        """Receive multiple messages from a queue or topic subscription"""
+        try:
+            messages = []
+            
+            async with self._receiver(queue_or_topic_name, subscription_name, is_topic, receive_and_delete) as receiver:
+                received_messages = await receiver.receive_messages(
+                    max_message_count=max_messages,
+                    max_wait_time=max_wait_time
+                )
+                messages = [_received(msg) for msg in received_messages]
+                if not receive_and_delete:
+                    # Settlements overlap instead of costing a round trip each
+                    await asyncio.gather(*(receiver.complete_message(msg) for msg in received_messages))
+            
+            logger.info(f"Received {len(messages)} messages from {'topic' if is_topic else 'queue'} {queue_or_topic_name}")
+            return messages
+            
+        except Exception as e:
+            logger.error(f"Error receiving messages from {queue_or_topic_name}: {e}")
+            return []
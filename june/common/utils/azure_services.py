@@ -1,13 +1,41 @@
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Tuple
+import atexit
+import copy
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from .config import AppConfig
 from .azure_ai_search import AzureAISearchClient
 from .azure_blob_storage import AzureBlobStorageClient
-from .azure_service_bus import AzureServiceBusClient
-from datetime import datetime
+from .azure_service_bus import AzureServiceBusClient, AsyncAzureServiceBusClient
+from . import serialization
+import time
+from datetime import datetime, timezone
 
 logger = logging.getLogger(__name__)
 
+SYSTEM_EVENTS_TOPIC = "system-events"
+# queue_system_event sends when this many events are buffered...
+SYSTEM_EVENT_BATCH_SIZE = 100
+# ...or this many seconds after the first one was queued
+SYSTEM_EVENT_FLUSH_INTERVAL = 0.05
+
+# Seconds a get_system_health snapshot is served before it is rebuilt
+HEALTH_CACHE_TTL = 5.0
+
+# (epoch second, its ISO 8601 form) for the last timestamp formatted
+_iso_second = (-1, "")
+
+def _now_iso() -> str:
+    """Current UTC time as ISO 8601 with milliseconds; the per-second prefix is formatted once"""
+    global _iso_second
+    second, nanos = divmod(time.time_ns(), 1_000_000_000)
+    cached_second, prefix = _iso_second
+    if second != cached_second:
+        prefix = datetime.fromtimestamp(second, timezone.utc).replace(tzinfo=None).isoformat()
+        _iso_second = (second, prefix)
+    return f"{prefix}.{nanos // 1_000_000:03d}"
+
 class AzureServicesManager:
     """Unified manager for all Azure services"""
     
@@ -16,71 +44,117 @@ class AzureServicesManager:
         self._ai_search_client: Optional[AzureAISearchClient] = None
         self._blob_storage_client: Optional[AzureBlobStorageClient] = None
         self._service_bus_client: Optional[AzureServiceBusClient] = None
+        self._async_service_bus_client: Optional[AsyncAzureServiceBusClient] = None
+        # Serializes client construction; reads of a built client never take it
+        self._init_lock = threading.Lock()
+        self._health_cache: Optional[Tuple[float, Dict[str, Any]]] = None
+        
+        # System events buffered by queue_system_event
+        self._event_buf: List[Dict[str, Any]] = []
+        self._event_lock = threading.Lock()
+        self._event_timer: Optional[threading.Timer] = None
+        # One exit hook flushes and then closes, rather than relying on atexit's
+        # LIFO order relative to the Service Bus client's own hook
+        atexit.register(self.close)
+    
+    def close(self) -> None:
+        """Send any buffered system events, then close the Service Bus client"""
+        self.flush_system_events()
+        if self._service_bus_client is not None:
+            self._service_bus_client.close()
     
     @property
     def ai_search(self) -> Optional[AzureAISearchClient]:
         """Get Azure AI Search client"""
-        if not self._ai_search_client and self.config.azure_ai_search.endpoint and self.config.azure_ai_search.api_key:
-            try:
-                self._ai_search_client = AzureAISearchClient(
-                    endpoint=self.config.azure_ai_search.endpoint,
-                    api_key=self.config.azure_ai_search.api_key,
-                    index_name=self.config.azure_ai_search.index_name or "a2a-documents"
-                )
-                # Ensure index exists
-                self._ai_search_client.create_index_if_not_exists()
-                logger.info("Azure AI Search client initialized successfully")
-            except Exception as e:
-                logger.error(f"Failed to initialize Azure AI Search client: {e}")
-                self._ai_search_client = None
-        
-        return self._ai_search_client
+        client = self._ai_search_client
+        if client is not None or not (self.config.azure_ai_search.endpoint and self.config.azure_ai_search.api_key):
+            return client
+        with self._init_lock:
+            if self._ai_search_client is None:
+                try:
+                    client = AzureAISearchClient(
+                        endpoint=self.config.azure_ai_search.endpoint,
+                        api_key=self.config.azure_ai_search.api_key,
+                        index_name=self.config.azure_ai_search.index_name or "a2a-documents"
+                    )
+                    # Ensure index exists
+                    client.create_index_if_not_exists()
+                    self._ai_search_client = client
+                    logger.info("Azure AI Search client initialized successfully")
+                except Exception as e:
+                    logger.error(f"Failed to initialize Azure AI Search client: {e}")
+            return self._ai_search_client
     
     @property
     def blob_storage(self) -> Optional[AzureBlobStorageClient]:
         """Get Azure Blob Storage client"""
-        if not self._blob_storage_client and self.config.azure_blob_storage.connection_string:
-            try:
-                self._blob_storage_client = AzureBlobStorageClient(
-                    connection_string=self.config.azure_blob_storage.connection_string,
-                    container_name=self.config.azure_blob_storage.container_name or "a2a-artifacts"
-                )
-                logger.info("Azure Blob Storage client initialized successfully")
-            except Exception as e:
-                logger.error(f"Failed to initialize Azure Blob Storage client: {e}")
-                self._blob_storage_client = None
-        
-        return self._blob_storage_client
+        client = self._blob_storage_client
+        if client is not None or not self.config.azure_blob_storage.connection_string:
+            return client
+        with self._init_lock:
+            if self._blob_storage_client is None:
+                try:
+                    self._blob_storage_client = AzureBlobStorageClient(
+                        connection_string=self.config.azure_blob_storage.connection_string,
+                        container_name=self.config.azure_blob_storage.container_name or "a2a-artifacts"
+                    )
+                    logger.info("Azure Blob Storage client initialized successfully")
+                except Exception as e:
+                    logger.error(f"Failed to initialize Azure Blob Storage client: {e}")
+            return self._blob_storage_client
     
     @property
     def service_bus(self) -> Optional[AzureServiceBusClient]:
         """Get Azure Service Bus client"""
-        if not self._service_bus_client and self.config.azure_service_bus.connection_string:
-            try:
-                self._service_bus_client = AzureServiceBusClient(
-                    connection_string=self.config.azure_service_bus.connection_string
-                )
-                logger.info("Azure Service Bus client initialized successfully")
-            except Exception as e:
-                logger.error(f"Failed to initialize Azure Service Bus client: {e}")
-                self._service_bus_client = None
-        
-        return self._service_bus_client
+        client = self._service_bus_client
+        if client is not None or not self.config.azure_service_bus.connection_string:
+            return client
+        with self._init_lock:
+            if self._service_bus_client is None:
+                try:
+                    self._service_bus_client = AzureServiceBusClient(
+                        connection_string=self.config.azure_service_bus.connection_string
+                    )
+                    logger.info("Azure Service Bus client initialized successfully")
+                except Exception as e:
+                    logger.error(f"Failed to initialize Azure Service Bus client: {e}")
+            return self._service_bus_client
+    
+    @property
+    def service_bus_async(self) -> Optional[AsyncAzureServiceBusClient]:
+        """Get the async Azure Service Bus client"""
+        client = self._async_service_bus_client
+        if client is not None or not self.config.azure_service_bus.connection_string:
+            return client
+        with self._init_lock:
+            if self._async_service_bus_client is None:
+                try:
+                    self._async_service_bus_client = AsyncAzureServiceBusClient(
+                        connection_string=self.config.azure_service_bus.connection_string
+                    )
+                    logger.info("Async Azure Service Bus client initialized successfully")
+                except Exception as e:
+                    logger.error(f"Failed to initialize async Azure Service Bus client: {e}")
+            return self._async_service_bus_client
+    
+    # The is_*_available checks read configuration only; building a client
+    # costs network round trips (AI Search also checks its index), which is
+    # left to first real use and to get_system_health
     
     def is_ai_search_available(self) -> bool:
-        """Check if Azure AI Search is available"""
-        return self.ai_search is not None
+        """Check if Azure AI Search is configured"""
+        return bool(self.config.azure_ai_search.endpoint and self.config.azure_ai_search.api_key)
     
     def is_blob_storage_available(self) -> bool:
-        """Check if Azure Blob Storage is available"""
-        return self.blob_storage is not None
+        """Check if Azure Blob Storage is configured"""
+        return bool(self.config.azure_blob_storage.connection_string)
     
     def is_service_bus_available(self) -> bool:
-        """Check if Azure Service Bus is available"""
-        return self.service_bus is not None
+        """Check if Azure Service Bus is configured"""
+        return bool(self.config.azure_service_bus.connection_string)
     
     def get_service_status(self) -> Dict[str, bool]:
-        """Get status of all Azure services"""
+        """Get configuration status of all Azure services"""
         return {
             "ai_search": self.is_ai_search_available(),
             "blob_storage": self.is_blob_storage_available(),
@@ -122,7 +196,8 @@ class AzureServicesManager:
     
     def create_default_queues_and_topics(self) -> Dict[str, bool]:
         """Create default Service Bus queues and topics for the system"""
-        if not self.service_bus:
+        service_bus = self.service_bus
+        if not service_bus:
             logger.warning("Service Bus not available, skipping queue/topic creation")
             return {}
         
@@ -136,9 +211,28 @@ class AzureServicesManager:
             "notification"
         ]
         
-        for queue_name in default_queues:
+        # Create default topics
+        default_topics = [
+            "user-events",
+            "system-events",
+            "compliance-events"
+        ]
+        
+        def create_topic_with_subscription(topic_name: str) -> Tuple[bool, Optional[bool]]:
+            if not service_bus.create_topic(topic_name):
+                return False, None
+            # Create default subscription
+            return True, service_bus.create_subscription(topic_name, "default")
+        
+        # Each admin call is an independent HTTPS round trip, so they run side by
+        # side; a topic's subscription follows its own creation
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            queue_futures = {name: executor.submit(service_bus.create_queue, name) for name in default_queues}
+            topic_futures = {name: executor.submit(create_topic_with_subscription, name) for name in default_topics}
+        
+        for queue_name, future in queue_futures.items():
             try:
-                success = self.service_bus.create_queue(queue_name)
+                success = future.result()
                 results[f"queue_{queue_name}"] = success
                 if success:
                     logger.info(f"Created default queue: {queue_name}")
@@ -146,20 +240,11 @@ class AzureServicesManager:
                 logger.error(f"Failed to create queue {queue_name}: {e}")
                 results[f"queue_{queue_name}"] = False
         
-        # Create default topics
-        default_topics = [
-            "user-events",
-            "system-events",
-            "compliance-events"
-        ]
-        
-        for topic_name in default_topics:
+        for topic_name, future in topic_futures.items():
             try:
-                success = self.service_bus.create_topic(topic_name)
+                success, sub_success = future.result()
                 results[f"topic_{topic_name}"] = success
                 if success:
-                    # Create default subscription
-                    sub_success = self.service_bus.create_subscription(topic_name, "default")
                     results[f"subscription_{topic_name}_default"] = sub_success
                     logger.info(f"Created default topic: {topic_name}")
             except Exception as e:
@@ -168,30 +253,62 @@ class AzureServicesManager:
         
         return results
     
+    def _system_event_entry(self, event_type: str, event_data: Dict[str, Any], priority: str) -> Dict[str, Any]:
+        """A system event in send_batch_messages entry form"""
+        message_body = {
+            "event_type": event_type,
+            "event_data": event_data,
+            "timestamp": _now_iso(),
+            "priority": priority
+        }
+        return {
+            # JSON bytes go straight into the AMQP body; default=str covers
+            # values the encoder has no native form for
+            "body": serialization.dumps_bytes(message_body, default=str),
+            "metadata": {
+                "event_type": event_type,
+                "priority": priority,
+                "source": "a2a-career-copilot"
+            }
+        }
+    
+    def _system_event_message(self, event_type: str, event_data: Dict[str, Any], priority: str) -> Dict[str, Any]:
+        """send_message arguments for a system event"""
+        entry = self._system_event_entry(event_type, event_data, priority)
+        return {
+            "queue_or_topic_name": SYSTEM_EVENTS_TOPIC,
+            "message_body": entry["body"],
+            "message_metadata": entry["metadata"],
+            "is_topic": True
+        }
+    
     def send_system_event(self, event_type: str, event_data: Dict[str, Any], priority: str = "normal") -> bool:
         """Send a system event to the Service Bus"""
-        if not self.service_bus:
+        service_bus = self.service_bus
+        if not service_bus:
             logger.warning("Service Bus not available, cannot send system event")
             return False
         
         try:
-            message_body = {
-                "event_type": event_type,
-                "event_data": event_data,
-                "timestamp": str(datetime.utcnow()),
-                "priority": priority
-            }
+            success = service_bus.send_message(**self._system_event_message(event_type, event_data, priority))
             
-            success = self.service_bus.send_message(
-                queue_or_topic_name="system-events",
-                message_body=str(message_body),
-                message_metadata={
-                    "event_type": event_type,
-                    "priority": priority,
-                    "source": "a2a-career-copilot"
-                },
-                is_topic=True
-            )
+            if success:
+                logger.info(f"Sent system event: {event_type}")
+            return success
+            
+        except Exception as e:
+            logger.error(f"Failed to send system event {event_type}: {e}")
+            return False
+    
+    async def send_system_event_async(self, event_type: str, event_data: Dict[str, Any], priority: str = "normal") -> bool:
+        """Send a system event without blocking the event loop; several can be gathered"""
+        service_bus = self.service_bus_async
+        if not service_bus:
+            logger.warning("Service Bus not available, cannot send system event")
+            return False
+        
+        try:
+            success = await service_bus.send_message(**self._system_event_message(event_type, event_data, priority))
             
             if success:
                 logger.info(f"Sent system event: {event_type}")
@@ -201,14 +318,74 @@ class AzureServicesManager:
             logger.error(f"Failed to send system event {event_type}: {e}")
             return False
     
+    def send_system_events(self, events: List[Dict[str, Any]]) -> int:
+        """Send several system events packed into as few AMQP batches as possible.
+        Each event is a dict with event_type, event_data and optionally priority.
+        Returns the number of events sent."""
+        entries = [
+            self._system_event_entry(event["event_type"], event["event_data"], event.get("priority", "normal"))
+            for event in events
+        ]
+        return self._send_event_entries(entries)
+    
+    def queue_system_event(self, event_type: str, event_data: Dict[str, Any], priority: str = "normal") -> None:
+        """Buffer a system event for batched delivery.
+        The buffer is sent once it holds SYSTEM_EVENT_BATCH_SIZE events or
+        SYSTEM_EVENT_FLUSH_INTERVAL seconds after the first queued event,
+        whichever comes first. Use send_system_event when the caller needs
+        to know whether delivery succeeded.
+        Sends always happen on the flush timer's thread, never the caller's, so
+        this is safe to call from async code."""
+        entry = self._system_event_entry(event_type, event_data, priority)
+        with self._event_lock:
+            self._event_buf.append(entry)
+            timer = self._event_timer
+            if len(self._event_buf) >= SYSTEM_EVENT_BATCH_SIZE:
+                # Full: bring the pending flush forward to now
+                if timer is not None and timer.interval > 0:
+                    timer.cancel()
+                    timer = None
+                delay = 0
+            else:
+                delay = SYSTEM_EVENT_FLUSH_INTERVAL
+            if timer is None:
+                self._event_timer = threading.Timer(delay, self.flush_system_events)
+                self._event_timer.daemon = True
+                self._event_timer.start()
+    
+    def flush_system_events(self) -> int:
+        """Send any buffered system events now"""
+        with self._event_lock:
+            batch = self._take_event_buf()
+        return self._send_event_entries(batch) if batch else 0
+    
+    def _take_event_buf(self) -> List[Dict[str, Any]]:
+        """Detach the event buffer and cancel its flush timer; caller holds _event_lock"""
+        batch, self._event_buf = self._event_buf, []
+        if self._event_timer is not None:
+            self._event_timer.cancel()
+            self._event_timer = None
+        return batch
+    
+    def _send_event_entries(self, entries: List[Dict[str, Any]]) -> int:
+        service_bus = self.service_bus
+        if not service_bus:
+            logger.warning(f"Service Bus not available, dropping {len(entries)} system events")
+            return 0
+        sent = service_bus.send_batch_messages(SYSTEM_EVENTS_TOPIC, entries, is_topic=True)
+        if sent < len(entries):
+            logger.error(f"Sent {sent} of {len(entries)} system events")
+        return sent
+    
     def store_artifact(self, artifact_data: bytes, artifact_name: str, metadata: Dict[str, str]) -> Optional[str]:
         """Store an artifact in Blob Storage"""
-        if not self.blob_storage:
+        blob_storage = self.blob_storage
+        if not blob_storage:
             logger.warning("Blob Storage not available, cannot store artifact")
             return None
         
         try:
-            success = self.blob_storage.upload_data(
+            success = blob_storage.upload_data(
                 data=artifact_data,
                 blob_name=artifact_name,
                 metadata=metadata,
@@ -226,7 +403,8 @@ class AzureServicesManager:
     
     def search_documents(self, query: str, filters: Optional[str] = None, top: int = 10) -> Dict[str, Any]:
         """Search documents using Azure AI Search"""
-        if not self.ai_search:
+        ai_search = self.ai_search
+        if not ai_search:
             logger.warning("AI Search not available, returning empty results")
             return {
                 "documents": [],
@@ -236,7 +414,7 @@ class AzureServicesManager:
             }
         
         try:
-            return self.ai_search.search_documents(
+            return ai_search.search_documents(
                 query=query,
                 filters=filters,
                 top=top
@@ -251,39 +429,52 @@ class AzureServicesManager:
             }
     
     def get_system_health(self) -> Dict[str, Any]:
-        """Get comprehensive system health including Azure services"""
+        """Get comprehensive system health including Azure services.
+        The snapshot is reused for HEALTH_CACHE_TTL seconds, since building it
+        costs several management round trips."""
+        cached = self._health_cache
+        if cached is not None and time.monotonic() - cached[0] < HEALTH_CACHE_TTL:
+            return copy.deepcopy(cached[1])
+        
+        # Check each service by actually building its client
+        ai_search = self.ai_search
+        blob_storage = self.blob_storage
+        service_bus = self.service_bus
+        service_status = {
+            "ai_search": ai_search is not None,
+            "blob_storage": blob_storage is not None,
+            "service_bus": service_bus is not None
+        }
         health = {
-            "timestamp": str(datetime.utcnow()),
-            "azure_services": self.get_service_status(),
+            "timestamp": _now_iso(),
+            "azure_services": service_status,
             "overall_status": "healthy"
         }
         
-        # Check each service
-        service_status = self.get_service_status()
         if not any(service_status.values()):
             health["overall_status"] = "unavailable"
         elif not all(service_status.values()):
             health["overall_status"] = "degraded"
         
         # Add service-specific health checks
-        if self.ai_search:
+        if ai_search:
             try:
-                stats = self.ai_search.get_index_stats()
+                stats = ai_search.get_index_stats()
                 health["ai_search_stats"] = stats
             except Exception as e:
                 health["ai_search_stats"] = {"error": str(e)}
         
-        if self.blob_storage:
+        if blob_storage:
             try:
-                stats = self.blob_storage.get_container_stats()
+                stats = blob_storage.get_container_stats()
                 health["blob_storage_stats"] = stats
             except Exception as e:
                 health["blob_storage_stats"] = {"error": str(e)}
         
-        if self.service_bus:
+        if service_bus:
             try:
-                queues = self.service_bus.list_queues()
-                topics = self.service_bus.list_topics()
+                queues = service_bus.list_queues()
+                topics = service_bus.list_topics()
                 health["service_bus_stats"] = {
                     "queues": len(queues),
                     "topics": len(topics)
@@ -291,4 +482,5 @@ class AzureServicesManager:
             except Exception as e:
                 health["service_bus_stats"] = {"error": str(e)}
         
-        return health
+        self._health_cache = (time.monotonic(), health)
+        return copy.deepcopy(health)
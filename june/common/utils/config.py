@@ -1,9 +1,9 @@
 import os
 from dataclasses import dataclass
 from typing import Optional
-from dotenv import load_dotenv
+from .env import ensure_env_loaded
 
-load_dotenv()
+ensure_env_loaded()
 
 @dataclass(frozen=True)
 class MongoConfig:
@@ -6,7 +6,7 @@ Integrates RAG capabilities and hallucination detection to reduce hallucinations
 import logging
 import json
 import asyncio
-from typing import Any, AsyncIterable, Dict, List, Optional, Union
+from typing import Any, AsyncIterable, Dict, List, Optional, Tuple, Union
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
 from datetime import datetime
@@ -19,7 +19,7 @@ from .config import load_config
 
 logger = logging.getLogger(__name__)
 
-@dataclass
+@dataclass(slots=True)
 class EnhancedAgentConfig:
     """Configuration for enhanced agents"""
     enable_rag: bool = True
@@ -32,7 +32,7 @@ class EnhancedAgentConfig:
     context_type: str = "general"
     require_sources: bool = False
 
-@dataclass
+@dataclass(slots=True)
 class EnhancedResponse:
     """Enhanced response with RAG and hallucination detection"""
     content: str
@@ -424,6 +424,24 @@ I want to ensure I provide accurate, helpful information rather than making assu
             logger.error(f"Error ingesting knowledge: {e}")
             return False
     
+    async def batch_ingest_knowledge(
+        self,
+        items: List[Tuple[str, Dict[str, Any]]]
+    ) -> List[bool]:
+        """Ingest several (content, metadata) items into the RAG system in one batch"""
+        try:
+            if not self.config.enable_rag or not self.rag_manager:
+                logger.warning("RAG not enabled or RAG manager not available")
+                return [False] * len(items)
+            
+            results = await self.rag_manager.ingest_documents(items)
+            logger.info(f"Successfully ingested {sum(results)} of {len(items)} knowledge items")
+            return results
+            
+        except Exception as e:
+            logger.error(f"Error ingesting knowledge batch: {e}")
+            return [False] * len(items)
+    
     async def search_knowledge(self, query: str, filters: Optional[str] = None) -> Dict[str, Any]:
         """Search the knowledge base"""
         try:
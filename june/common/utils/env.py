@@ -0,0 +1,22 @@
+"""
+Environment loading for the AI Career Copilot agents.
+Parses the .env file at most once per process, however many entry points or
+config modules ask for it.
+"""
+
+import threading
+from dotenv import load_dotenv
+
+_loaded = False
+_lock = threading.Lock()
+
+
+def ensure_env_loaded() -> None:
+    """Load .env into os.environ the first time this is called"""
+    global _loaded
+    if _loaded:
+        return
+    with _lock:
+        if not _loaded:
+            load_dotenv()
+            _loaded = True
@@ -13,6 +13,66 @@ import hashlib
 
 logger = logging.getLogger(__name__)
 
+# Common hallucination patterns
+HALLUCINATION_PATTERNS = (
+    r'\b(always|never|everyone|nobody|everywhere|nowhere)\b',
+    r'\b(guaranteed|100%|definitely|absolutely)\b',
+    r'\b(proven|scientifically proven|research shows)\b',
+    r'\b(according to studies|studies show|research indicates)\b',
+    r'\b(experts agree|scientists say|doctors recommend)\b'
+)
+
+# Confidence indicators
+CONFIDENCE_INDICATORS = (
+    r'\b(maybe|perhaps|possibly|might|could)\b',
+    r'\b(I think|I believe|in my opinion)\b',
+    r'\b(according to|based on|as mentioned in)\b',
+    r'\b(source:|reference:|cited from)\b'
+)
+
+ATTRIBUTION_PATTERNS = (
+    r'\b(according to|based on|as stated in|as mentioned in)\b',
+    r'\b(source:|reference:|cited from|from)\b',
+    r'\b(study|research|paper|article|report)\b'
+)
+
+# Specific-detail patterns overlap (a year is also a number), so each is counted separately
+_SPECIFIC_RES = tuple(re.compile(pattern) for pattern in (
+    r'\b\d+\b',  # Numbers
+    r'\b[A-Z][a-z]+ [A-Z][a-z]+\b',  # Proper nouns
+    r'\b(https?://|www\.)\S+\b',  # URLs
+    r'\b\d{4}\b',  # Years
+    r'\b[A-Z]{2,}\b'  # Acronyms
+))
+
+# Each pattern family compiled once into a single alternation so a response is scanned in one pass
+_HALLUCINATION_RE = re.compile("|".join(HALLUCINATION_PATTERNS), re.IGNORECASE)
+_CONFIDENCE_RE = re.compile("|".join(CONFIDENCE_INDICATORS), re.IGNORECASE)
+_ATTRIBUTION_RE = re.compile("|".join(ATTRIBUTION_PATTERNS), re.IGNORECASE)
+_ABSOLUTES_RE = re.compile(r'\b(?:always|never|everyone|nobody|definitely|absolutely)\b', re.IGNORECASE)
+_SENTENCE_SPLIT_RE = re.compile(r'[.!?]+')
+_WORD_RE = re.compile(r'\b\w+\b')
+_TERM_RE = re.compile(r'\b\w{4,}\b')
+
+
+def find_absolutes(text: str) -> List[str]:
+    """Return the absolute statements ('always', 'never', ...) found in text"""
+    return _ABSOLUTES_RE.findall(text)
+
+
+def _tokenize_sources(sources: Optional[List[Dict[str, Any]]]) -> List[Tuple[str, set]]:
+    """Word sets of each non-empty source, built once per analysis"""
+    return [
+        (source.get('id', 'unknown'), set(_WORD_RE.findall(content.lower())))
+        for source in sources or []
+        if (content := source.get('content', ''))
+    ]
+
+
+def _overlap_ratio(claim_words: set, source_words: set) -> float:
+    """Share of the claim's words that also appear in the source"""
+    return len(claim_words & source_words) / max(len(claim_words), 1)
+
 @dataclass
 class HallucinationCheck:
     """Represents a hallucination check result"""
@@ -43,23 +103,8 @@ class HallucinationDetector:
             'medium': 0.6,
             'high': 0.8
         }
-        
-        # Common hallucination patterns
-        self.hallucination_patterns = [
-            r'\b(always|never|everyone|nobody|everywhere|nowhere)\b',
-            r'\b(guaranteed|100%|definitely|absolutely)\b',
-            r'\b(proven|scientifically proven|research shows)\b',
-            r'\b(according to studies|studies show|research indicates)\b',
-            r'\b(experts agree|scientists say|doctors recommend)\b'
-        ]
-        
-        # Confidence indicators
-        self.confidence_indicators = [
-            r'\b(maybe|perhaps|possibly|might|could)\b',
-            r'\b(I think|I believe|in my opinion)\b',
-            r'\b(according to|based on|as mentioned in)\b',
-            r'\b(source:|reference:|cited from)\b'
-        ]
+        self.hallucination_patterns = HALLUCINATION_PATTERNS
+        self.confidence_indicators = CONFIDENCE_INDICATORS
     
     async def analyze_response(
         self, 
@@ -78,6 +123,9 @@ class HallucinationDetector:
             
             checks = []
             
+            # Tokenize sources once; claim verification and attribution both score against them
+            source_words = _tokenize_sources(sources)
+            
             # 1. Pattern-based detection
             pattern_check = self._check_hallucination_patterns(response)
             checks.append(pattern_check)
@@ -91,7 +139,7 @@ class HallucinationDetector:
             checks.append(context_check)
             
             # 4. Claim verification check
-            claim_check = self._check_claim_verification(response, sources)
+            claim_check = self._check_claim_verification(response, sources, source_words)
             checks.append(claim_check)
             
             # 5. Confidence level check
@@ -113,7 +161,7 @@ class HallucinationDetector:
             flagged_claims = self._extract_flagged_claims(response, checks)
             
             # Build source attribution mapping
-            source_attribution = self._build_source_attribution(response, sources)
+            source_attribution = self._build_source_attribution(response, sources, source_words)
             
             return HallucinationReport(
                 overall_risk=overall_risk,
@@ -145,14 +193,8 @@ class HallucinationDetector:
                 recommendations=['Provide a response for analysis']
             )
             
-        flagged_patterns = []
-        pattern_count = 0
-        
-        for pattern in self.hallucination_patterns:
-            matches = re.findall(pattern, response, re.IGNORECASE)
-            if matches:
-                flagged_patterns.extend(matches)
-                pattern_count += len(matches)
+        flagged_patterns = [match.group(0) for match in _HALLUCINATION_RE.finditer(response)]
+        pattern_count = len(flagged_patterns)
         
         # Calculate confidence based on pattern density
         confidence = max(0.0, 1.0 - (pattern_count * 0.1))
@@ -200,15 +242,7 @@ class HallucinationDetector:
             )
         
         # Look for attribution patterns
-        attribution_patterns = [
-            r'\b(according to|based on|as stated in|as mentioned in)\b',
-            r'\b(source:|reference:|cited from|from)\b',
-            r'\b(study|research|paper|article|report)\b'
-        ]
-        
-        attribution_count = 0
-        for pattern in attribution_patterns:
-            attribution_count += len(re.findall(pattern, response, re.IGNORECASE))
+        attribution_count = sum(1 for _ in _ATTRIBUTION_RE.finditer(response))
         
         # Check if sources are actually referenced
         source_references = []
@@ -268,8 +302,8 @@ class HallucinationDetector:
             )
         
         # Extract key terms from context and response
-        context_terms = set(re.findall(r'\b\w{4,}\b', context.lower()))
-        response_terms = set(re.findall(r'\b\w{4,}\b', response.lower()))
+        context_terms = set(_TERM_RE.findall(context.lower()))
+        response_terms = set(_TERM_RE.findall(response.lower()))
         
         # Calculate overlap
         overlap = len(context_terms.intersection(response_terms))
@@ -305,7 +339,12 @@ class HallucinationDetector:
             recommendations=recommendations
         )
     
-    def _check_claim_verification(self, response: str, sources: List[Dict[str, Any]] = None) -> HallucinationCheck:
+    def _check_claim_verification(
+        self,
+        response: str,
+        sources: List[Dict[str, Any]] = None,
+        source_words: Optional[List[Tuple[str, set]]] = None
+    ) -> HallucinationCheck:
         """Check if claims can be verified against sources"""
         if not response:
             return HallucinationCheck(
@@ -327,12 +366,14 @@ class HallucinationDetector:
         
         # Extract factual claims
         claims = self._extract_factual_claims(response)
+        if source_words is None:
+            source_words = _tokenize_sources(sources)
         
         verified_claims = 0
         unverified_claims = []
         
         for claim in claims:
-            if self._can_verify_claim(claim, sources):
+            if self._can_verify_claim(claim, sources, source_words):
                 verified_claims += 1
             else:
                 unverified_claims.append(claim)
@@ -374,12 +415,10 @@ class HallucinationDetector:
             )
             
         # Count confidence indicators
-        confidence_indicators = 0
-        for pattern in self.confidence_indicators:
-            confidence_indicators += len(re.findall(pattern, response, re.IGNORECASE))
+        confidence_indicators = sum(1 for _ in _CONFIDENCE_RE.finditer(response))
         
         # Count absolute statements
-        absolute_statements = len(re.findall(r'\b(always|never|everyone|nobody|definitely|absolutely)\b', response, re.IGNORECASE))
+        absolute_statements = len(find_absolutes(response))
         
         # Calculate confidence score
         if confidence_indicators == 0 and absolute_statements == 0:
@@ -426,17 +465,7 @@ class HallucinationDetector:
             )
             
         # Count specific details
-        specific_patterns = [
-            r'\b\d+\b',  # Numbers
-            r'\b[A-Z][a-z]+ [A-Z][a-z]+\b',  # Proper nouns
-            r'\b(https?://|www\.)\S+\b',  # URLs
-            r'\b\d{4}\b',  # Years
-            r'\b[A-Z]{2,}\b'  # Acronyms
-        ]
-        
-        specificity_score = 0
-        for pattern in specific_patterns:
-            specificity_score += len(re.findall(pattern, response))
+        specificity_score = sum(len(pattern.findall(response)) for pattern in _SPECIFIC_RES)
         
         # Normalize score
         normalized_score = min(1.0, specificity_score / 10)
@@ -470,7 +499,7 @@ class HallucinationDetector:
             return []
             
         # Split into sentences
-        sentences = re.split(r'[.!?]+', text)
+        sentences = _SENTENCE_SPLIT_RE.split(text)
         claims = []
         
         for sentence in sentences:
@@ -486,28 +515,22 @@ class HallucinationDetector:
         
         return claims[:10]  # Limit to 10 claims
     
-    def _can_verify_claim(self, claim: str, sources: List[Dict[str, Any]]) -> bool:
+    def _can_verify_claim(
+        self,
+        claim: str,
+        sources: List[Dict[str, Any]],
+        source_words: Optional[List[Tuple[str, set]]] = None
+    ) -> bool:
         """Check if a claim can be verified against sources"""
         if not claim or not sources:
             return False
             
-        claim_words = set(re.findall(r'\b\w+\b', claim.lower()))
-        
-        for source in sources:
-            source_content = source.get('content', '')
-            if not source_content:
-                continue
-            
-            source_words = set(re.findall(r'\b\w+\b', source_content.lower()))
-            
-            # Calculate word overlap
-            overlap = len(claim_words.intersection(source_words))
-            overlap_ratio = overlap / max(len(claim_words), 1)
-            
-            if overlap_ratio > 0.3:  # 30% overlap threshold
-                return True
+        claim_words = set(_WORD_RE.findall(claim.lower()))
+        if source_words is None:
+            source_words = _tokenize_sources(sources)
         
-        return False
+        # 30% word overlap threshold
+        return any(_overlap_ratio(claim_words, words) > 0.3 for _, words in source_words)
     
     def _calculate_risk_score(self, checks: List[HallucinationCheck]) -> float:
         """Calculate overall hallucination risk score"""
@@ -590,18 +613,21 @@ class HallucinationDetector:
             if not check.passed:
                 if check.check_type == 'pattern_detection':
                     # Extract sentences with flagged patterns
-                    for pattern in self.hallucination_patterns:
-                        matches = re.findall(pattern, response, re.IGNORECASE)
-                        if matches:
-                            # Find sentences containing these patterns
-                            sentences = re.split(r'[.!?]+', response)
-                            for sentence in sentences:
-                                if any(match.lower() in sentence.lower() for match in matches):
-                                    flagged_claims.append(sentence.strip())
+                    matches = {match.group(0).lower() for match in _HALLUCINATION_RE.finditer(response)}
+                    if matches:
+                        for sentence in _SENTENCE_SPLIT_RE.split(response):
+                            lowered = sentence.lower()
+                            if any(match in lowered for match in matches):
+                                flagged_claims.append(sentence.strip())
         
         return list(set(flagged_claims))
     
-    def _build_source_attribution(self, response: str, sources: List[Dict[str, Any]]) -> Dict[str, List[str]]:
+    def _build_source_attribution(
+        self,
+        response: str,
+        sources: List[Dict[str, Any]],
+        source_words: Optional[List[Tuple[str, set]]] = None
+    ) -> Dict[str, List[str]]:
         """Build mapping of claims to supporting sources"""
         if not response or not sources:
             return {}
@@ -610,22 +636,17 @@ class HallucinationDetector:
         
         # Extract claims
         claims = self._extract_factual_claims(response)
+        if source_words is None:
+            source_words = _tokenize_sources(sources)
         
         for claim in claims:
-            supporting_sources = []
-            claim_words = set(re.findall(r'\b\w+\b', claim.lower()))
+            claim_words = set(_WORD_RE.findall(claim.lower()))
             
-            for source in sources:
-                source_content = source.get('content', '')
-                if not source_content:
-                    continue
-                
-                source_words = set(re.findall(r'\b\w+\b', source_content.lower()))
-                overlap = len(claim_words.intersection(source_words))
-                overlap_ratio = overlap / max(len(claim_words), 1)
-                
-                if overlap_ratio > 0.2:  # 20% overlap threshold
-                    supporting_sources.append(source.get('id', 'unknown'))
+            # 20% overlap threshold
+            supporting_sources = [
+                source_id for source_id, words in source_words
+                if _overlap_ratio(claim_words, words) > 0.2
+            ]
             
             if supporting_sources:
                 attribution[claim] = supporting_sources
@@ -3,10 +3,11 @@ RAG (Retrieval Augmented Generation) Manager for AI Career Copilot
 Implements advanced techniques to reduce hallucinations and improve response accuracy.
 """
 
+import asyncio
 import logging
 import hashlib
 import json
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Optional, Set, Tuple
 from datetime import datetime, timezone
 from dataclasses import dataclass
 import re
@@ -17,6 +18,10 @@ from .azure_services import AzureServicesManager
 
 logger = logging.getLogger(__name__)
 
+# Inputs per embeddings request; Azure OpenAI accepts up to 2048
+EMBEDDING_BATCH_SIZE = 256
+EMBEDDING_DIMENSIONS = 1536
+
 @dataclass
 class DocumentChunk:
     """Represents a chunk of document content"""
@@ -149,38 +154,40 @@ class EmbeddingManager:
         if not text or not text.strip():
             logger.warning("Empty text provided for embedding generation")
             return []
-            
-        try:
-            # This would integrate with Azure OpenAI embedding service
-            # For now, return a placeholder
-            logger.info(f"Generating embeddings for text of length {len(text)}")
-            
-            # TODO: Implement actual embedding generation
-            # response = await self.azure_services.openai_client.embeddings.create(
-            #     model=self.embedding_model,
-            #     input=text
-            # )
-            # return response.data[0].embedding
-            
-            # Placeholder: return random vector for now
-            import random
-            random.seed(hash(text) % 2**32)
-            return [random.uniform(-1, 1) for _ in range(1536)]
-            
-        except Exception as e:
-            logger.error(f"Error generating embeddings: {e}")
-            return []
+        return (await self.batch_generate_embeddings([text]))[0]
     
     async def batch_generate_embeddings(self, texts: List[str]) -> List[List[float]]:
-        """Generate embeddings for multiple texts in batch"""
+        """Generate embeddings for multiple texts, one request per EMBEDDING_BATCH_SIZE inputs"""
         if not texts:
             return []
-            
-        embeddings = []
-        for text in texts:
-            embedding = await self.generate_embeddings(text)
-            embeddings.append(embedding)
+        
+        # Empty inputs keep their slot with an empty vector, as in generate_embeddings
+        embeddings: List[List[float]] = [[] for _ in texts]
+        pending = [i for i, text in enumerate(texts) if text and text.strip()]
+        
+        for start in range(0, len(pending), EMBEDDING_BATCH_SIZE):
+            indices = pending[start:start + EMBEDDING_BATCH_SIZE]
+            try:
+                vectors = await self._embed_batch([texts[i] for i in indices])
+            except Exception as e:
+                logger.error(f"Error generating embeddings: {e}")
+                continue
+            for i, vector in zip(indices, vectors):
+                embeddings[i] = vector
         return embeddings
+    
+    async def _embed_batch(self, texts: List[str]) -> List[List[float]]:
+        """Embed a batch of texts in a single model request"""
+        logger.info(f"Generating embeddings for {len(texts)} texts")
+        
+        # Placeholder until an Azure OpenAI embeddings client is configured:
+        # deterministic random vectors of the model's dimension
+        import random
+        vectors = []
+        for text in texts:
+            rng = random.Random(hash(text) % 2**32)
+            vectors.append([rng.uniform(-1, 1) for _ in range(EMBEDDING_DIMENSIONS)])
+        return vectors
 
 class RAGManager:
     """Main RAG manager that orchestrates retrieval and generation"""
@@ -204,49 +211,101 @@ class RAGManager:
     
     async def ingest_document(self, content: str, metadata: Dict[str, Any]) -> bool:
         """Ingest a document into the RAG system"""
-        if not content or not content.strip():
-            logger.error("Cannot ingest empty document content")
-            return False
-        if not metadata:
-            logger.error("Cannot ingest document without metadata")
-            return False
+        return (await self.ingest_documents([(content, metadata)]))[0]
+    
+    async def ingest_documents(self, documents: List[Tuple[str, Dict[str, Any]]]) -> List[bool]:
+        """Ingest several documents, embedding all of their chunks in one batch"""
+        results = [False] * len(documents)
+        prepared = []
+        
+        for index, (content, metadata) in enumerate(documents):
+            if not content or not content.strip():
+                logger.error("Cannot ingest empty document content")
+                continue
+            if not metadata:
+                logger.error("Cannot ingest document without metadata")
+                continue
             
+            try:
+                # Use a caller-supplied stable ID, otherwise generate one
+                document_id = metadata.get('document_id') or self._generate_document_id(content, metadata)
+                metadata['document_id'] = document_id
+                metadata['ingested_at'] = datetime.now(timezone.utc).isoformat()
+                
+                # Process and chunk document
+                chunks = self.document_processor.chunk_text(content, metadata)
+                prepared.append((index, content, metadata, chunks))
+            except Exception as e:
+                logger.error(f"Error ingesting document: {e}")
+        
+        if not prepared:
+            return results
+        
         try:
-            # Generate document ID
-            document_id = self._generate_document_id(content, metadata)
-            metadata['document_id'] = document_id
-            metadata['ingested_at'] = datetime.now(timezone.utc).isoformat()
-            
-            # Process and chunk document
-            chunks = self.document_processor.chunk_text(content, metadata)
-            
-            # Generate embeddings for chunks
-            for chunk in chunks:
-                chunk.embedding = await self.embedding_manager.generate_embeddings(chunk.content)
-            
-            # Store chunks in Azure AI Search
-            success = await self._store_chunks_in_search(chunks)
-            
-            # Store original document in blob storage
-            if success and self.blob_storage:
-                blob_metadata = {
-                    'document_id': document_id,
-                    'chunk_count': len(chunks),
-                    'ingested_at': metadata['ingested_at']
-                }
-                self.blob_storage.upload_data(
-                    f"documents/{document_id}.json",
-                    json.dumps({'content': content, 'metadata': metadata}),
-                    metadata=blob_metadata
-                )
-            
-            logger.info(f"Successfully ingested document {document_id} with {len(chunks)} chunks")
-            return success
-            
+            # Generate embeddings for every chunk of every document together
+            all_chunks = [chunk for _, _, _, chunks in prepared for chunk in chunks]
+            embeddings = await self.embedding_manager.batch_generate_embeddings(
+                [chunk.content for chunk in all_chunks]
+            )
+            for chunk, embedding in zip(all_chunks, embeddings):
+                chunk.embedding = embedding
         except Exception as e:
-            logger.error(f"Error ingesting document: {e}")
-            return False
+            logger.error(f"Error ingesting documents: {e}")
+            return results
+        
+        uploads = []
+        for index, content, metadata, chunks in prepared:
+            try:
+                document_id = metadata['document_id']
+                
+                # Store chunks in Azure AI Search
+                success = await self._store_chunks_in_search(chunks)
+                
+                # Store original document in blob storage; uploads run concurrently below
+                if success and self.blob_storage:
+                    blob_metadata = {
+                        'document_id': document_id,
+                        'chunk_count': str(len(chunks)),
+                        'ingested_at': metadata['ingested_at']
+                    }
+                    uploads.append((index, document_id, self.blob_storage.upload_data_async(
+                        data=json.dumps({'content': content, 'metadata': metadata}),
+                        blob_name=f"documents/{document_id}.json",
+                        metadata=blob_metadata
+                    )))
+                
+                logger.info(f"Successfully ingested document {document_id} with {len(chunks)} chunks")
+                results[index] = success
+                
+            except Exception as e:
+                logger.error(f"Error ingesting document: {e}")
+        
+        if uploads:
+            # One failed upload must not abandon the others or the documents already indexed
+            outcomes = await asyncio.gather(*(upload for _, _, upload in uploads), return_exceptions=True)
+            for (index, document_id, _), outcome in zip(uploads, outcomes):
+                if isinstance(outcome, BaseException) or not outcome:
+                    logger.error(f"Error storing document {document_id} in blob storage: {outcome}")
+                    results[index] = False
+        
+        return results
+    
+    async def document_exists(self, document_id: str) -> bool:
+        """Check whether a document has already been ingested"""
+        return document_id in await self.existing_documents([document_id])
     
+    async def existing_documents(self, document_ids: List[str]) -> Set[str]:
+        """Return which of these documents have already been ingested, in one search query"""
+        document_ids = [document_id for document_id in document_ids if document_id]
+        if not document_ids or not self.search_client:
+            return set()
+        # Every ingested document has at least its first chunk indexed
+        found = await asyncio.to_thread(
+            self.search_client.existing_document_ids,
+            [f"{document_id}_chunk_0" for document_id in document_ids]
+        )
+        return {document_id for document_id in document_ids if f"{document_id}_chunk_0" in found}
+
     async def retrieve_relevant_context(self, query: str, context_type: str = "general") -> List[SearchResult]:
         """Retrieve relevant context for a query"""
         if not query or not query.strip():
@@ -364,9 +423,9 @@ class RAGManager:
             return True
             
         try:
-            for chunk in chunks:
-                # Prepare document for indexing
-                search_document = {
+            now = datetime.now(timezone.utc).isoformat()
+            search_documents = [
+                {
                     'id': chunk.id,
                     'content': chunk.content,
                     'content_vector': chunk.embedding,
@@ -375,18 +434,20 @@ class RAGManager:
                     'user_id': chunk.metadata.get('user_id', 'unknown'),
                     'title': chunk.metadata.get('title', ''),
                     'summary': chunk.content[:200] + "..." if len(chunk.content) > 200 else chunk.content,
-                    'created_at': chunk.metadata.get('created_at', datetime.now(timezone.utc).isoformat()),
-                    'updated_at': chunk.metadata.get('updated_at', datetime.now(timezone.utc).isoformat()),
+                    'created_at': chunk.metadata.get('created_at', now),
+                    'updated_at': chunk.metadata.get('updated_at', now),
                     'tags': chunk.metadata.get('tags', []),
                     'chunk_index': chunk.chunk_index,
                     'total_chunks': chunk.total_chunks
                 }
-                
-                # Index the document
-                success = self.search_client.index_document(search_document)
-                if not success:
-                    logger.error(f"Failed to index chunk {chunk.id}")
-                    return False
+                for chunk in chunks
+            ]
+            
+            # One bulk upload instead of a request per chunk
+            result = self.search_client.index_documents(search_documents)
+            if result["failed"]:
+                logger.error(f"Failed to index {result['failed']} of {len(chunks)} chunks")
+                return False
             
             return True
             
@@ -0,0 +1,143 @@
+"""
+Response cache utilities for agent LLM calls.
+Lets agents reuse a prior model response for an identical prompt instead of
+paying another round-trip to the model endpoint.
+"""
+
+import asyncio
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+# A cache must never stall a request longer than the model call it saves
+REDIS_SOCKET_TIMEOUT = 0.5
+REDIS_CONNECT_TIMEOUT = 1.0
+
+
+def make_cache_key(model: str, prompt: str) -> str:
+    """Build a stable cache key for a (model, prompt) pair"""
+    return hashlib.blake2b(f"{model}\x00{prompt}".encode("utf-8")).hexdigest()
+
+
+class BaseCache:
+    """Interface for response caches keyed by prompt hash"""
+
+    def lookup(self, key: str) -> Optional[str]:
+        """Return the cached response for key, or None on a miss"""
+        raise NotImplementedError
+
+    def update(self, key: str, value: str) -> None:
+        """Store a response for key"""
+        raise NotImplementedError
+
+    def clear(self) -> None:
+        """Drop every cached response"""
+        raise NotImplementedError
+
+    async def alookup(self, key: str) -> Optional[str]:
+        """lookup for async callers"""
+        return self.lookup(key)
+
+    async def aupdate(self, key: str, value: str) -> None:
+        """update for async callers"""
+        self.update(key, value)
+
+
+class LRUCache(BaseCache):
+    """Thread-safe in-process LRU response cache"""
+
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self._data: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def lookup(self, key: str) -> Optional[str]:
+        with self._lock:
+            value = self._data.get(key)
+            if value is not None:
+                self._data.move_to_end(key)
+            return value
+
+    def update(self, key: str, value: str) -> None:
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+
+class RedisCache(BaseCache):
+    """Redis-backed response cache shared across agent processes.
+
+    Calls are synchronous but bounded by short socket timeouts; any Redis error is
+    treated as a miss (lookup) or a dropped write (update) rather than a failure.
+    The async variants run them on a worker thread so the event loop never waits on Redis.
+    """
+
+    def __init__(self, url: str, ttl: int = 3600, namespace: str = "llm_cache"):
+        import redis
+
+        self.ttl = ttl
+        self.namespace = namespace
+        self._client = redis.from_url(
+            url,
+            socket_timeout=REDIS_SOCKET_TIMEOUT,
+            socket_connect_timeout=REDIS_CONNECT_TIMEOUT,
+        )
+        # from_url connects lazily; fail here so the factory can fall back to the LRU
+        self._client.ping()
+
+    def _key(self, key: str) -> str:
+        return f"{self.namespace}:{key}"
+
+    def lookup(self, key: str) -> Optional[str]:
+        try:
+            value = self._client.get(self._key(key))
+        except Exception as e:
+            logger.warning(f"Redis response cache lookup failed, treating as miss: {e}")
+            return None
+        if value is None:
+            return None
+        return value.decode("utf-8") if isinstance(value, bytes) else value
+
+    def update(self, key: str, value: str) -> None:
+        try:
+            self._client.setex(self._key(key), self.ttl, value)
+        except Exception as e:
+            logger.warning(f"Redis response cache update dropped: {e}")
+
+    async def alookup(self, key: str) -> Optional[str]:
+        return await asyncio.to_thread(self.lookup, key)
+
+    async def aupdate(self, key: str, value: str) -> None:
+        await asyncio.to_thread(self.update, key, value)
+
+    def clear(self) -> None:
+        try:
+            for key in self._client.scan_iter(match=f"{self.namespace}:*"):
+                self._client.delete(key)
+        except Exception as e:
+            logger.warning(f"Redis response cache clear failed: {e}")
+
+
+def create_response_cache(
+    url: Optional[str] = None,
+    namespace: str = "llm_cache",
+    ttl: int = 3600,
+    maxsize: int = 1024,
+) -> BaseCache:
+    """Create a Redis cache when a URL is configured, else an in-process LRU"""
+    if url:
+        try:
+            return RedisCache(url, ttl=ttl, namespace=namespace)
+        except Exception as e:
+            logger.warning(f"Redis response cache unavailable, using in-memory LRU: {e}")
+    return LRUCache(maxsize=maxsize)
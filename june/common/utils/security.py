@@ -8,6 +8,12 @@ import hmac
 import time
 import secrets
 import re
+import threading
+import atexit
+import os
+import queue
+from logging.handlers import QueueHandler, QueueListener
+from collections import OrderedDict
 from typing import Optional, Dict, Any, List
 from dataclasses import dataclass
 from datetime import datetime, timedelta
@@ -44,6 +50,17 @@ class User:
     failed_login_attempts: int
     locked_until: Optional[datetime] = None
 
+# Characters stripped from user strings; str.translate runs in C in a single
+# linear pass with no regex engine involved
+_DANGEROUS_CHARS = str.maketrans("", "", "<>\"'")
+
+def _sanitize_str(value: str, max_length: int = 1000) -> str:
+    """Strip dangerous characters, truncate and trim a string"""
+    sanitized = value.translate(_DANGEROUS_CHARS)
+    if len(sanitized) > max_length:
+        sanitized = sanitized[:max_length]
+    return sanitized.strip()
+
 class SecurityValidator:
     """Input validation and sanitization"""
     
@@ -53,14 +70,7 @@ class SecurityValidator:
         if not isinstance(value, str):
             raise ValueError("Value must be a string")
         
-        # Remove potentially dangerous characters
-        sanitized = re.sub(r'[<>"\']', '', value)
-        
-        # Limit length
-        if len(sanitized) > max_length:
-            sanitized = sanitized[:max_length]
-        
-        return sanitized.strip()
+        return _sanitize_str(value, max_length)
     
     @staticmethod
     def validate_email(email: str) -> bool:
@@ -104,46 +114,47 @@ class SecurityValidator:
         return sanitized
 
 class RateLimiter:
-    """Rate limiting implementation"""
+    """Token-bucket rate limiting: bursts of max_requests, refilled over the window"""
+    
+    MAX_TRACKED_CLIENTS = 10000
     
     def __init__(self):
-        self.requests = {}
         self.window = SECURITY_CONFIG["RATE_LIMIT_WINDOW"]
         self.max_requests = SECURITY_CONFIG["RATE_LIMIT_MAX_REQUESTS"]
+        self._refill_per_ns = self.max_requests / (self.window * 1_000_000_000)
+        # client_id -> [tokens, last_refill_ns]; least recently seen clients are evicted
+        self._buckets: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def _refill(self, client_id: str, now: int) -> List[float]:
+        bucket = self._buckets.get(client_id)
+        if bucket is None:
+            bucket = self._buckets[client_id] = [float(self.max_requests), now]
+            if len(self._buckets) > self.MAX_TRACKED_CLIENTS:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(client_id)
+            bucket[0] = min(self.max_requests, bucket[0] + (now - bucket[1]) * self._refill_per_ns)
+            bucket[1] = now
+        return bucket
     
     def is_allowed(self, client_id: str) -> bool:
         """Check if request is allowed based on rate limiting"""
-        now = time.time()
-        
-        if client_id not in self.requests:
-            self.requests[client_id] = []
-        
-        # Remove old requests outside the window
-        self.requests[client_id] = [
-            req_time for req_time in self.requests[client_id]
-            if now - req_time < self.window
-        ]
-        
-        # Check if under limit
-        if len(self.requests[client_id]) >= self.max_requests:
-            return False
-        
-        # Add current request
-        self.requests[client_id].append(now)
-        return True
+        now = time.monotonic_ns()
+        with self._lock:
+            bucket = self._refill(client_id, now)
+            if bucket[0] < 1:
+                return False
+            bucket[0] -= 1
+            return True
     
     def get_remaining_requests(self, client_id: str) -> int:
         """Get remaining requests for a client"""
-        now = time.time()
-        if client_id not in self.requests:
-            return self.max_requests
-        
-        valid_requests = [
-            req_time for req_time in self.requests[client_id]
-            if now - req_time < self.window
-        ]
-        
-        return max(0, self.max_requests - len(valid_requests))
+        now = time.monotonic_ns()
+        with self._lock:
+            if client_id not in self._buckets:
+                return self.max_requests
+            return int(self._refill(client_id, now)[0])
 
 class JWTManager:
     """JWT token management"""
@@ -242,9 +253,21 @@ class SecurityHeaders:
 class AuditLogger:
     """Security audit logging"""
     
+    @staticmethod
+    def is_enabled(severity: str = "INFO") -> bool:
+        """Whether an event of this severity would be emitted"""
+        if severity in _ALERT_SEVERITIES:
+            return logger.isEnabledFor(logging.ERROR)
+        return logger.isEnabledFor(logging.INFO)
+    
     @staticmethod
     def log_security_event(event_type: str, user_id: str, details: Dict[str, Any], severity: str = "INFO"):
         """Log security-related events"""
+        is_alert = severity in _ALERT_SEVERITIES
+        # Skip building the entry when nothing would be written
+        if not (logger.isEnabledFor(logging.INFO) or (is_alert and logger.isEnabledFor(logging.ERROR))):
+            return
+        
         log_entry = {
             "timestamp": datetime.utcnow().isoformat(),
             "event_type": event_type,
@@ -255,11 +278,44 @@ class AuditLogger:
             "user_agent": "unknown"   # Would be extracted from request
         }
         
-        logger.info(f"SECURITY_EVENT: {log_entry}")
+        logger.info("SECURITY_EVENT: %s", log_entry)
         
         # In production, this would be sent to a security monitoring system
-        if severity in ["WARNING", "ERROR", "CRITICAL"]:
-            logger.error(f"SECURITY_ALERT: {log_entry}")
+        if is_alert:
+            logger.error("SECURITY_ALERT: %s", log_entry)
+
+_ALERT_SEVERITIES = frozenset({"WARNING", "ERROR", "CRITICAL"})
+_audit_queue_handler: Optional[QueueHandler] = None
+_audit_listener: Optional[QueueListener] = None
+_audit_listener_pid: Optional[int] = None
+
+def start_audit_log_queue() -> Optional[QueueListener]:
+    """Hand audit records to a background thread so sink I/O stays off the request path.
+
+    Audit records go through a QueueHandler to a QueueListener that feeds the
+    root handlers. Safe to call repeatedly and again after a fork; the
+    listener thread does not survive fork, so a child starts its own.
+    """
+    global _audit_queue_handler, _audit_listener, _audit_listener_pid
+    if _audit_listener is not None and _audit_listener_pid == os.getpid():
+        return _audit_listener
+    
+    handlers = [h for h in logging.getLogger().handlers if not isinstance(h, QueueHandler)]
+    if not handlers:
+        return None
+    
+    if _audit_queue_handler is not None:
+        logger.removeHandler(_audit_queue_handler)
+    
+    records: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    _audit_queue_handler = QueueHandler(records)
+    _audit_listener = QueueListener(records, *handlers, respect_handler_level=True)
+    _audit_listener_pid = os.getpid()
+    logger.addHandler(_audit_queue_handler)
+    logger.propagate = False
+    _audit_listener.start()
+    atexit.register(_audit_listener.stop)
+    return _audit_listener
 
 # Global instances
 rate_limiter = RateLimiter()
@@ -274,8 +330,12 @@ def get_client_id(request: Request) -> str:
     client_ip = request.client.host if request.client else "unknown"
     return f"{client_ip}:{request.headers.get('user-agent', 'unknown')}"
 
-def validate_request_size(request: Request) -> bool:
-    """Validate request size to prevent large payload attacks"""
+def validate_request_size(request: Request, body_size: Optional[int] = None) -> bool:
+    """Validate request size to prevent large payload attacks.
+    Checks the content-length header without touching the body stream, or
+    body_size when the body has already been read (e.g. chunked uploads)."""
+    if body_size is not None:
+        return body_size <= SECURITY_CONFIG["MAX_REQUEST_SIZE"]
     content_length = request.headers.get("content-length")
     if content_length:
         size = int(content_length)
@@ -286,7 +346,7 @@ def validate_request_size(request: Request) -> bool:
 def sanitize_user_input(data: Any) -> Any:
     """Recursively sanitize user input"""
     if isinstance(data, str):
-        return SecurityValidator.sanitize_string(data)
+        return _sanitize_str(data)
     elif isinstance(data, dict):
         return {k: sanitize_user_input(v) for k, v in data.items()}
     elif isinstance(data, list):
@@ -6,9 +6,9 @@ Centralizes all security-related settings and policies.
 import os
 from typing import List, Dict, Any
 from dataclasses import dataclass
-from dotenv import load_dotenv
+from .env import ensure_env_loaded
 
-load_dotenv()
+ensure_env_loaded()
 
 @dataclass
 class SecurityPolicy: